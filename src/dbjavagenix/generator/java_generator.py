@@ -165,7 +165,7 @@ class JavaCodeGenerator:
         if not self.validate_template_category(category):
             raise ValueError(f"不支持的模板分类: {category}")
         
-        return self.template_config.get_template_files(category)
+        return list(self.template_config.get_template_files(category))
 
 
     # 批量/项目结构生成和 quick_generate 相关便捷接口已移除，
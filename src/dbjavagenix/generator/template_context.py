@@ -3,19 +3,130 @@
 用于构建 Mustache 模板渲染所需的上下文数据
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Mapping, Optional, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime
+from types import MappingProxyType
 import re
 from ..core.models import TableInfo, ColumnInfo, DatabaseType
+from ..utils.pom_analyzer import PomAnalyzer, TechnologyStack
+from ..utils.table_prefix_analyzer import TablePrefixAnalyzer
+
+
+# 去除类型长度/精度，如 VARCHAR(255) -> VARCHAR
+_PAREN_RE = re.compile(r'\([^)]*\)')
+
+# 数据库基础类型信息表
+# 基础类型 -> (Java类型, JDBC类型, 是否字符串, 是否日期, 是否BigDecimal)
+_DB_TYPE_INFO: Dict[str, Tuple[str, str, bool, bool, bool]] = {
+    # 整数类型
+    'TINYINT': ('Byte', 'TINYINT', False, False, False),
+    'SMALLINT': ('Short', 'SMALLINT', False, False, False),
+    'MEDIUMINT': ('Integer', 'INTEGER', False, False, False),
+    'INT': ('Integer', 'INTEGER', False, False, False),
+    'INTEGER': ('Integer', 'INTEGER', False, False, False),
+    'BIGINT': ('Long', 'BIGINT', False, False, False),
+
+    # 浮点类型
+    'FLOAT': ('Float', 'FLOAT', False, False, False),
+    'DOUBLE': ('Double', 'DOUBLE', False, False, False),
+    'DECIMAL': ('BigDecimal', 'DECIMAL', False, False, True),
+    'NUMERIC': ('BigDecimal', 'NUMERIC', False, False, True),
+    'MONEY': ('String', 'VARCHAR', False, False, True),
+
+    # 字符串类型
+    'CHAR': ('String', 'CHAR', True, False, False),
+    'VARCHAR': ('String', 'VARCHAR', True, False, False),
+    'TEXT': ('String', 'LONGVARCHAR', True, False, False),
+    'LONGTEXT': ('String', 'LONGVARCHAR', True, False, False),
+    'MEDIUMTEXT': ('String', 'LONGVARCHAR', True, False, False),
+    'TINYTEXT': ('String', 'VARCHAR', True, False, False),
+    'NCHAR': ('String', 'NCHAR', True, False, False),
+    'NVARCHAR': ('String', 'NVARCHAR', True, False, False),
+
+    # 日期时间类型
+    'DATE': ('LocalDate', 'DATE', False, True, False),
+    'TIME': ('LocalTime', 'TIME', False, True, False),
+    'DATETIME': ('LocalDateTime', 'TIMESTAMP', False, True, False),
+    'TIMESTAMP': ('LocalDateTime', 'TIMESTAMP', False, True, False),
+    'YEAR': ('Integer', 'INTEGER', False, False, False),
+
+    # 布尔类型
+    'BOOLEAN': ('Boolean', 'BOOLEAN', False, False, False),
+    'TINYINT(1)': ('Boolean', 'BOOLEAN', False, False, False),
+
+    # 二进制类型
+    'BINARY': ('byte[]', 'BINARY', False, False, False),
+    'VARBINARY': ('byte[]', 'VARBINARY', False, False, False),
+    'BLOB': ('byte[]', 'BLOB', False, False, False),
+    'LONGBLOB': ('byte[]', 'LONGVARBINARY', False, False, False),
+    'MEDIUMBLOB': ('byte[]', 'LONGVARBINARY', False, False, False),
+    'TINYBLOB': ('byte[]', 'VARBINARY', False, False, False),
+
+    # JSON 类型
+    'JSON': ('String', 'LONGVARCHAR', False, False, False),
+}
+
+# 未知类型的默认信息
+_DEFAULT_TYPE_INFO: Tuple[str, str, bool, bool, bool] = ('String', 'VARCHAR', False, False, False)
+
+# 使用 Lombok / MyBatis 的模板分类
+_MYBATIS_CATEGORIES = frozenset({"Default", "MybatisPlus", "MybatisPlus-Mixed"})
+
+# 需要显式导入的 Java 类型
+_JAVA_TYPE_IMPORTS: Dict[str, str] = {
+    'LocalDateTime': 'java.time.LocalDateTime',
+    'LocalDate': 'java.time.LocalDate',
+    'LocalTime': 'java.time.LocalTime',
+    'BigDecimal': 'java.math.BigDecimal',
+}
+
+
+@dataclass
+class _ColumnsContext:
+    """单次遍历列信息得到的上下文结果"""
+    columns: List[Dict[str, Any]] = field(default_factory=list)
+    non_primary_columns: List[Dict[str, Any]] = field(default_factory=list)
+    primary_key: Optional[Dict[str, Any]] = None
+    imports: List[str] = field(default_factory=list)
+    has_date_field: bool = False
+    has_big_decimal_field: bool = False
 
 
 class TemplateContextBuilder:
     """模板上下文构建器"""
     
+    # 与具体表无关的固定上下文项，每次构建时复制后再填充表相关内容
+    _BASE_CONTEXT: Dict[str, Any] = {
+        "serialVersionUID": "1",
+        "useSwagger": True,
+        "pagination": True,  # 启用分页
+        "generateDto": False,  # 默认不生成DTO
+        "generateVo": False,   # 默认不生成VO
+        "hasDto": False,
+        "hasVo": False,
+        "hasMapStruct": True,
+    }
+    
     def __init__(self, author: str = "ZXP", package_name: str = "com.example"):
         self.author = author
         self.package_name = package_name
         self.date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # 各组件的基础包名，在构建器生命周期内不变
+        self._pkg_bases = {
+            "controller": f"{package_name}.controller",
+            "service": f"{package_name}.service",
+            "service_impl": f"{package_name}.service.impl",
+            "entity": f"{package_name}.entity",
+            "dao": f"{package_name}.dao",
+            "dto": f"{package_name}.dto",
+            "vo": f"{package_name}.vo",
+        }
+        # 同一次生成过程中会为每张表调用 build_context，以下结果在表之间共享
+        self._prefix_analyzer: Optional[TablePrefixAnalyzer] = None
+        self._suffix_cache: Dict[Tuple[str, ...], Dict[str, str]] = {}
+        self._tech_stack_cache: Dict[Tuple[Optional[str], str], TechnologyStack] = {}
+        self._default_stacks: Dict[str, TechnologyStack] = {}
     
     def build_context(self, table_info: TableInfo, template_category: str = "Default",
                      all_table_names: Optional[List[str]] = None, project_root: Optional[str] = None) -> Dict[str, Any]:
@@ -34,45 +145,43 @@ class TemplateContextBuilder:
         # 基础上下文 - 修复变量名映射
         class_name = self._to_pascal_case(table_info.name)
         entity_name_lower = self._to_camel_case(table_info.name)
-        primary_key_info = self._build_primary_key_context(table_info.columns)
-        columns_context = self._build_columns_context(table_info.columns)
+        columns_info = self._build_all_column_contexts(table_info.columns)
+        primary_key_info = columns_info.primary_key
+        non_primary_columns = columns_info.non_primary_columns
         
         # 前缀分析 - 新增功能
         package_suffix = ""
         if all_table_names:
-            from ..utils.table_prefix_analyzer import TablePrefixAnalyzer
-            analyzer = TablePrefixAnalyzer()
-            package_suffix = analyzer.get_table_package_suffix(table_info.name, all_table_names)
+            package_suffix = self._get_package_suffix(table_info.name, all_table_names)
         
         # 构建包名 (支持前缀子包)
         base_package = self.package_name
+        pkg_bases = self._pkg_bases
         if package_suffix:
             # 为不同的组件类型构建包名
-            controller_package = f"{base_package}.controller.{package_suffix}"
-            service_package = f"{base_package}.service.{package_suffix}"
-            entity_package = f"{base_package}.entity.{package_suffix}"
-            dao_package = f"{base_package}.dao.{package_suffix}"
-            dto_package = f"{base_package}.dto.{package_suffix}"
-            vo_package = f"{base_package}.vo.{package_suffix}"
+            suffix = "." + package_suffix
+            controller_package = pkg_bases["controller"] + suffix
+            service_package = pkg_bases["service"] + suffix
+            service_impl_package = pkg_bases["service_impl"] + suffix
+            entity_package = pkg_bases["entity"] + suffix
+            dao_package = pkg_bases["dao"] + suffix
+            dto_package = pkg_bases["dto"] + suffix
+            vo_package = pkg_bases["vo"] + suffix
         else:
             # 无前缀时使用基础包
-            controller_package = f"{base_package}.controller"
-            service_package = f"{base_package}.service"
-            entity_package = f"{base_package}.entity"
-            dao_package = f"{base_package}.dao"
-            dto_package = f"{base_package}.dto"
-            vo_package = f"{base_package}.vo"
-        
-        # 修复serviceImpl包路径问题
-        if package_suffix:
-            service_impl_package = f"{base_package}.service.impl.{package_suffix}"
-        else:
-            service_impl_package = f"{base_package}.service.impl"
+            controller_package = pkg_bases["controller"]
+            service_package = pkg_bases["service"]
+            service_impl_package = pkg_bases["service_impl"]
+            entity_package = pkg_bases["entity"]
+            dao_package = pkg_bases["dao"]
+            dto_package = pkg_bases["dto"]
+            vo_package = pkg_bases["vo"]
         
         # 检测技术栈信息
         tech_stack = self._detect_technology_stack(project_root, template_category)
         
-        context = {
+        context = self._BASE_CONTEXT.copy()
+        context.update({
             # 类和包相关
             "className": class_name,
             "name": class_name,  # 添加 name 别名
@@ -99,18 +208,16 @@ class TemplateContextBuilder:
             # 表相关
             "tableName": table_info.name,
             "comment": table_info.comment or table_info.name,
-            "entityNameLowerCase": entity_name_lower,
             
             # 作者和日期
             "author": self.author,
             "date": self.date,
-            "serialVersionUID": "1",
             
             # 列相关
-            "columns": columns_context,
+            "columns": columns_info.columns,
             "primaryKey": primary_key_info,
-            "nonPrimaryColumns": self._build_non_primary_columns_context(table_info.columns),
-            "otherColumns": self._build_non_primary_columns_context(table_info.columns),  # 别名
+            "nonPrimaryColumns": non_primary_columns,
+            "otherColumns": non_primary_columns,  # 别名
             
             # 主键相关 - 添加缺失的主键字段
             "primaryKeyName": primary_key_info["name"] if primary_key_info else "id",
@@ -119,19 +226,12 @@ class TemplateContextBuilder:
             "capitalizedPrimaryKeyName": primary_key_info["javaName"].capitalize() if primary_key_info else "Id",
             
             # 导入相关
-            "imports": self._build_imports(table_info.columns, template_category),
+            "imports": columns_info.imports,
             
             # 特性标志
-            "hasDateField": self._has_date_field(table_info.columns),
-            "hasBigDecimalField": self._has_big_decimal_field(table_info.columns),
-            "useLombok": template_category in ["Default", "MybatisPlus", "MybatisPlus-Mixed"],
-            "useSwagger": True,
-            "pagination": True,  # 启用分页
-            "generateDto": False,  # 默认不生成DTO
-            "generateVo": False,   # 默认不生成VO
-            "hasDto": False,
-            "hasVo": False,
-            "hasMapStruct": True,
+            "hasDateField": columns_info.has_date_field,
+            "hasBigDecimalField": columns_info.has_big_decimal_field,
+            "useLombok": template_category in _MYBATIS_CATEGORIES,
             
             # 技术栈相关标志
             "hasJavax": tech_stack.has_javax,
@@ -150,13 +250,38 @@ class TemplateContextBuilder:
             
             # 自定义映射规则
             "customMappings": self._build_custom_mappings(table_info.columns),
-        }
+        })
         
         return context
     
-    def _detect_technology_stack(self, project_root: Optional[str], template_category: str) -> Any:
+    def _get_package_suffix(self, table_name: str, all_table_names: List[str]) -> str:
         """
-        检测项目使用的技术栈类型
+        获取表的前缀子包名，同一表名列表只做一次前缀分析
+        
+        Args:
+            table_name: 表名
+            all_table_names: 所有表名列表
+            
+        Returns:
+            包后缀
+        """
+        if self._prefix_analyzer is None:
+            self._prefix_analyzer = TablePrefixAnalyzer()
+        
+        key = tuple(all_table_names)
+        suffixes = self._suffix_cache.get(key)
+        if suffixes is None:
+            suffixes = self._prefix_analyzer.get_table_package_suffixes(all_table_names)
+            self._suffix_cache[key] = suffixes
+        
+        if table_name in suffixes:
+            return suffixes[table_name]
+        # 表不在列表中时按原逻辑单独计算
+        return self._prefix_analyzer.get_table_package_suffix(table_name, all_table_names)
+    
+    def _detect_technology_stack(self, project_root: Optional[str], template_category: str) -> TechnologyStack:
+        """
+        检测项目使用的技术栈类型，结果按 (project_root, template_category) 缓存
         
         Args:
             project_root: 项目根目录
@@ -165,43 +290,67 @@ class TemplateContextBuilder:
         Returns:
             TechnologyStack对象
         """
+        key = (project_root, template_category)
+        tech_stack = self._tech_stack_cache.get(key)
+        if tech_stack is None:
+            tech_stack = self._analyze_technology_stack(project_root, template_category)
+            self._tech_stack_cache[key] = tech_stack
+        return tech_stack
+    
+    def _analyze_technology_stack(self, project_root: Optional[str], template_category: str) -> TechnologyStack:
+        """分析项目技术栈 (未缓存)"""
         # 如果没有提供项目根目录，使用默认的现代化技术栈
         if not project_root:
-            from ..utils.pom_analyzer import TechnologyStack
-            tech_stack = TechnologyStack()
-            tech_stack.has_jakarta = True
-            tech_stack.has_mybatis = template_category in ["Default", "MybatisPlus", "MybatisPlus-Mixed"]
-            tech_stack.has_springdoc = True
-            tech_stack.is_modern_stack = True
-            return tech_stack
+            return self._default_tech_stack(template_category)
         
         # 使用PomAnalyzer检测技术栈
         try:
-            from ..utils.pom_analyzer import PomAnalyzer
             analyzer = PomAnalyzer()
             analysis_result = analyzer.analyze_project_dependencies(
                 project_root=project_root,
                 template_category=template_category,
                 database_type="mysql"  # 默认数据库类型
             )
-            return analysis_result.get("technology_stack", TechnologyStack())
+            return analysis_result.get("technology_stack") or self._default_tech_stack(template_category)
         except Exception as e:
             # 如果检测失败，使用默认的现代化技术栈
-            from ..utils.pom_analyzer import TechnologyStack
+            return self._default_tech_stack(template_category)
+    
+    def _default_tech_stack(self, template_category: str) -> TechnologyStack:
+        """获取默认的现代化技术栈，每个模板分类只构建一次"""
+        tech_stack = self._default_stacks.get(template_category)
+        if tech_stack is None:
             tech_stack = TechnologyStack()
             tech_stack.has_jakarta = True
-            tech_stack.has_mybatis = template_category in ["Default", "MybatisPlus", "MybatisPlus-Mixed"]
+            tech_stack.has_mybatis = template_category in _MYBATIS_CATEGORIES
             tech_stack.has_springdoc = True
             tech_stack.is_modern_stack = True
-            return tech_stack
+            self._default_stacks[template_category] = tech_stack
+        return tech_stack
     
-    def _build_columns_context(self, columns: List[ColumnInfo]) -> List[Dict[str, Any]]:
-        """构建列上下文"""
-        column_contexts = []
+    def _build_all_column_contexts(self, columns: List[ColumnInfo]) -> _ColumnsContext:
+        """
+        单次遍历构建全部列相关上下文
+        
+        同时得到所有列上下文、非主键列上下文、主键上下文、导入列表以及日期/BigDecimal字段标志
+        """
+        result = _ColumnsContext()
+        column_contexts = result.columns
+        non_pk_contexts = result.non_primary_columns
+        imports = set()
+        has_date = has_decimal = False
+        last_index = len(columns) - 1
         
         for i, column in enumerate(columns):
             java_name = self._to_camel_case(column.name)
-            java_type = self._map_java_type(column.data_type)
+            java_type, jdbc_type, is_string, is_date, is_decimal = self._lookup_type_info(column.data_type)
+            auto_increment = getattr(column, 'auto_increment', False)
+            comment = column.comment or column.name
+            is_last = i == last_index
+            has_date |= is_date
+            has_decimal |= is_decimal
+            if java_type in _JAVA_TYPE_IMPORTS:
+                imports.add(_JAVA_TYPE_IMPORTS[java_type])
             column_context = {
                 # 基础字段信息
                 "name": column.name,  # 数据库字段名
@@ -209,96 +358,61 @@ class TemplateContextBuilder:
                 "capitalizedJavaName": java_name.capitalize(),  # 首字母大写的Java字段名
                 "dbName": column.name,
                 "javaType": java_type,
-                "jdbcType": self._map_jdbc_type(column.data_type),
-                "comment": column.comment or column.name,
+                "jdbcType": jdbc_type,
+                "comment": comment,
                 
                 # 字段属性
                 "isPrimaryKey": column.primary_key,
                 "primaryKey": column.primary_key,  # 兼容两种写法
                 "isNullable": column.nullable,
                 "nullable": column.nullable,
-                "isAutoIncrement": getattr(column, 'auto_increment', False),
-                "autoIncrement": getattr(column, 'auto_increment', False),
+                "isAutoIncrement": auto_increment,
+                "autoIncrement": auto_increment,
                 "defaultValue": column.default_value,
                 "maxLength": getattr(column, 'max_length', None),
                 
                 # 验证相关
                 "required": not column.nullable and not column.primary_key,
-                "isString": self._is_string_type(column.data_type),
-                "stringType": self._is_string_type(column.data_type),  # 别名
-                "isStringType": self._is_string_type(column.data_type),  # 另一个别名
+                "isString": is_string,
+                "stringType": is_string,  # 别名
+                "isStringType": is_string,  # 另一个别名
                 
                 # 循环标志
-                "hasNext": i < len(columns) - 1,
+                "hasNext": not is_last,
                 "isFirst": i == 0,
-                "isLast": i == len(columns) - 1,
-                "last": i == len(columns) - 1,  # 添加 last 别名
+                "isLast": is_last,
+                "last": is_last,  # 添加 last 别名
             }
             column_contexts.append(column_context)
+            
+            if column.primary_key:
+                # 主键取第一个主键列
+                if result.primary_key is None:
+                    result.primary_key = {
+                        "name": java_name,  # Java字段名
+                        "dbName": column.name,  # 数据库字段名
+                        "javaName": java_name,
+                        "javaType": java_type,
+                        "jdbcType": jdbc_type,
+                        "comment": comment,
+                    }
+            else:
+                # 非主键列的循环标志相对于非主键列表，末尾元素在循环结束后修正
+                non_pk_context = column_context.copy()
+                non_pk_context["isFirst"] = not non_pk_contexts
+                non_pk_context["hasNext"] = True
+                non_pk_context["isLast"] = non_pk_context["last"] = False
+                non_pk_contexts.append(non_pk_context)
         
-        return column_contexts
-    
-    def _build_primary_key_context(self, columns: List[ColumnInfo]) -> Optional[Dict[str, Any]]:
-        """构建主键上下文"""
-        pk_column = next((col for col in columns if col.primary_key), None)
-        
-        if pk_column:
-            java_name = self._to_camel_case(pk_column.name)
-            return {
-                "name": java_name,  # Java字段名
-                "dbName": pk_column.name,  # 数据库字段名
-                "javaName": java_name,
-                "javaType": self._map_java_type(pk_column.data_type),
-                "jdbcType": self._map_jdbc_type(pk_column.data_type),
-                "comment": pk_column.comment or pk_column.name,
-            }
+        if non_pk_contexts:
+            last_context = non_pk_contexts[-1]
+            last_context["hasNext"] = False
+            last_context["isLast"] = last_context["last"] = True
         
-        return None
-    
-    def _build_non_primary_columns_context(self, columns: List[ColumnInfo]) -> List[Dict[str, Any]]:
-        """构建非主键列上下文"""
-        non_pk_columns = [col for col in columns if not col.primary_key]
-        column_contexts = []
-        
-        for i, column in enumerate(non_pk_columns):
-            java_name = self._to_camel_case(column.name)
-            java_type = self._map_java_type(column.data_type)
-            column_context = {
-                # 基础字段信息
-                "name": column.name,  # 数据库字段名
-                "javaName": java_name,  # Java字段名
-                "capitalizedJavaName": java_name.capitalize(),  # 首字母大写的Java字段名
-                "dbName": column.name,
-                "javaType": java_type,
-                "jdbcType": self._map_jdbc_type(column.data_type),
-                "comment": column.comment or column.name,
-                
-                # 字段属性
-                "isPrimaryKey": column.primary_key,
-                "primaryKey": column.primary_key,  # 兼容两种写法
-                "isNullable": column.nullable,
-                "nullable": column.nullable,
-                "isAutoIncrement": getattr(column, 'auto_increment', False),
-                "autoIncrement": getattr(column, 'auto_increment', False),
-                "defaultValue": column.default_value,
-                "maxLength": getattr(column, 'max_length', None),
-                
-                # 验证相关
-                "required": not column.nullable and not column.primary_key,
-                "isString": self._is_string_type(column.data_type),
-                "stringType": self._is_string_type(column.data_type),  # 别名
-                "isStringType": self._is_string_type(column.data_type),  # 另一个别名
-                "isStringType": self._is_string_type(column.data_type),  # 别名
-                
-                # 循环标志
-                "hasNext": i < len(non_pk_columns) - 1,
-                "isFirst": i == 0,
-                "isLast": i == len(non_pk_columns) - 1,
-                "last": i == len(non_pk_columns) - 1,  # 添加 last 别名
-            }
-            column_contexts.append(column_context)
-        
-        return column_contexts
+        result.imports = sorted(imports)
+        result.has_date_field = has_date
+        result.has_big_decimal_field = has_decimal
+        return result
     
     def _build_custom_mappings(self, columns: List[ColumnInfo]) -> Dict[str, bool]:
         """构建自定义映射规则"""
@@ -310,43 +424,28 @@ class TemplateContextBuilder:
             "hasIdMapping": "id" in column_names,
         }
     
-    def _build_imports(self, columns: List[ColumnInfo], template_category: str) -> List[str]:
-        """构建导入列表"""
-        imports = []
-        java_types = {self._map_java_type(col.data_type) for col in columns}
-        
-        # 时间类型导入
-        if "LocalDateTime" in java_types:
-            imports.append("java.time.LocalDateTime")
-        if "LocalDate" in java_types:
-            imports.append("java.time.LocalDate")
-        if "LocalTime" in java_types:
-            imports.append("java.time.LocalTime")
-        if "BigDecimal" in java_types:
-            imports.append("java.math.BigDecimal")
-        
-        return sorted(imports)
-    
-    def _has_date_field(self, columns: List[ColumnInfo]) -> bool:
-        """检查是否包含日期字段"""
-        date_types = ['DATETIME', 'TIMESTAMP', 'DATE', 'TIME']
-        return any(col.data_type.upper() in date_types for col in columns)
-    
-    def _has_big_decimal_field(self, columns: List[ColumnInfo]) -> bool:
-        """检查是否包含 BigDecimal 字段"""
-        decimal_types = ['DECIMAL', 'NUMERIC', 'MONEY']
-        return any(col.data_type.upper() in decimal_types for col in columns)
+    def _lookup_type_info(self, db_type: str) -> Tuple[str, str, bool, bool, bool]:
+        """查询数据库类型信息: (Java类型, JDBC类型, 是否字符串, 是否日期, 是否BigDecimal)"""
+        upper_type = db_type.upper()
+        # 处理带长度的类型，如 VARCHAR(255)
+        base_type = _PAREN_RE.sub('', upper_type)
+        info = _DB_TYPE_INFO.get(base_type, _DEFAULT_TYPE_INFO)
+        if base_type != upper_type:
+            # 字符串/日期/BigDecimal标志保持按原始类型判断，VARCHAR(255)、DECIMAL(10,2) 等带长度/精度的类型不置位
+            return info[0], info[1], False, False, False
+        return info
     
     def _is_string_type(self, db_type: str) -> bool:
         """检查是否为字符串类型"""
-        string_types = ['VARCHAR', 'CHAR', 'TEXT', 'LONGTEXT', 'MEDIUMTEXT', 'TINYTEXT', 'NVARCHAR', 'NCHAR']
-        return db_type.upper() in string_types
+        return self._lookup_type_info(db_type)[2]
     
     def _to_pascal_case(self, name: str) -> str:
         """转换为 PascalCase"""
-        # 移除下划线并转换为 PascalCase
-        words = name.split('_')
-        return ''.join(word.capitalize() for word in words)
+        # 仅含字母和下划线时 title() 与逐词 capitalize() 结果一致，可一次完成
+        if name.replace('_', '').isalpha():
+            return name.title().replace('_', '')
+        # 含数字等字符时 title() 会在其后大写，回退到逐词处理
+        return ''.join([word.capitalize() for word in name.split('_')])
     
     def _to_camel_case(self, name: str) -> str:
         """转换为 camelCase"""
@@ -355,171 +454,77 @@ class TemplateContextBuilder:
     
     def _map_java_type(self, db_type: str) -> str:
         """映射数据库类型到 Java 类型"""
-        type_mapping = {
-            # 整数类型
-            'TINYINT': 'Byte',
-            'SMALLINT': 'Short', 
-            'MEDIUMINT': 'Integer',
-            'INT': 'Integer',
-            'INTEGER': 'Integer',
-            'BIGINT': 'Long',
-            
-            # 浮点类型
-            'FLOAT': 'Float',
-            'DOUBLE': 'Double',
-            'DECIMAL': 'BigDecimal',
-            'NUMERIC': 'BigDecimal',
-            
-            # 字符串类型
-            'CHAR': 'String',
-            'VARCHAR': 'String',
-            'TEXT': 'String',
-            'LONGTEXT': 'String',
-            'MEDIUMTEXT': 'String',
-            'TINYTEXT': 'String',
-            'NCHAR': 'String',
-            'NVARCHAR': 'String',
-            
-            # 日期时间类型
-            'DATE': 'LocalDate',
-            'TIME': 'LocalTime',
-            'DATETIME': 'LocalDateTime',
-            'TIMESTAMP': 'LocalDateTime',
-            'YEAR': 'Integer',
-            
-            # 布尔类型
-            'BOOLEAN': 'Boolean',
-            'TINYINT(1)': 'Boolean',
-            
-            # 二进制类型
-            'BINARY': 'byte[]',
-            'VARBINARY': 'byte[]',
-            'BLOB': 'byte[]',
-            'LONGBLOB': 'byte[]',
-            'MEDIUMBLOB': 'byte[]',
-            'TINYBLOB': 'byte[]',
-            
-            # JSON 类型
-            'JSON': 'String',
-        }
-        
-        # 处理带长度的类型，如 VARCHAR(255)
-        base_type = re.sub(r'\([^)]*\)', '', db_type.upper())
-        
-        return type_mapping.get(base_type, 'String')
+        return self._lookup_type_info(db_type)[0]
     
     def _map_jdbc_type(self, db_type: str) -> str:
         """映射数据库类型到 JDBC 类型"""
-        jdbc_mapping = {
-            # 整数类型
-            'TINYINT': 'TINYINT',
-            'SMALLINT': 'SMALLINT',
-            'MEDIUMINT': 'INTEGER',
-            'INT': 'INTEGER',
-            'INTEGER': 'INTEGER',
-            'BIGINT': 'BIGINT',
-            
-            # 浮点类型
-            'FLOAT': 'FLOAT',
-            'DOUBLE': 'DOUBLE',
-            'DECIMAL': 'DECIMAL',
-            'NUMERIC': 'NUMERIC',
-            
-            # 字符串类型
-            'CHAR': 'CHAR',
-            'VARCHAR': 'VARCHAR',
-            'TEXT': 'LONGVARCHAR',
-            'LONGTEXT': 'LONGVARCHAR',
-            'MEDIUMTEXT': 'LONGVARCHAR',
-            'TINYTEXT': 'VARCHAR',
-            'NCHAR': 'NCHAR',
-            'NVARCHAR': 'NVARCHAR',
-            
-            # 日期时间类型
-            'DATE': 'DATE',
-            'TIME': 'TIME',
-            'DATETIME': 'TIMESTAMP',
-            'TIMESTAMP': 'TIMESTAMP',
-            'YEAR': 'INTEGER',
-            
-            # 布尔类型
-            'BOOLEAN': 'BOOLEAN',
-            'TINYINT(1)': 'BOOLEAN',
-            
-            # 二进制类型
-            'BINARY': 'BINARY',
-            'VARBINARY': 'VARBINARY',
-            'BLOB': 'BLOB',
-            'LONGBLOB': 'LONGVARBINARY',
-            'MEDIUMBLOB': 'LONGVARBINARY',
-            'TINYBLOB': 'VARBINARY',
-            
-            # JSON 类型
-            'JSON': 'LONGVARCHAR',
-        }
-        
-        # 处理带长度的类型
-        base_type = re.sub(r'\([^)]*\)', '', db_type.upper())
-        
-        return jdbc_mapping.get(base_type, 'VARCHAR')
+        return self._lookup_type_info(db_type)[1]
+
+
+# 各分类的模板文件列表 (只读，供所有调用共享)
+_TEMPLATE_FILES: Dict[str, Tuple[str, ...]] = {
+    "Default": (
+        "entity.mustache",
+        "dao.mustache", 
+        "service.mustache",
+        "serviceImpl.mustache",
+        "controller.mustache",
+        "mapper.xml.mustache"  # 使用 mapper.xml.mustache
+    ),
+    "MybatisPlus": (
+        "entity.mustache",
+        "dao.mustache",
+        "service.mustache", 
+        "serviceImpl.mustache",
+        "controller.mustache"
+    ),
+    "MybatisPlus-Mixed": (
+        "entity.mustache",
+        "dao.mustache",
+        "service.mustache",
+        "serviceImpl.mustache", 
+        "controller.mustache",
+        "mapper.mustache"
+    ),
+}
+
+# 通用附加模板列表
+_ADDITIONAL_TEMPLATES: Tuple[str, ...] = (
+    "dto.mustache",
+    "vo.mustache", 
+    "mapstruct_mapper.mustache"
+)
+
+# 输出路径映射 - 支持前缀子包在组件类型之后
+_OUTPUT_PATH_MAPPING: Mapping[str, str] = MappingProxyType({
+    "entity.mustache": "entity/{packageSuffix}/{className}.java",
+    "dao.mustache": "dao/{packageSuffix}/{className}Dao.java", 
+    "service.mustache": "service/{packageSuffix}/{className}Service.java",
+    "serviceImpl.mustache": "service/impl/{packageSuffix}/{className}ServiceImpl.java",
+    "controller.mustache": "controller/{packageSuffix}/{className}Controller.java",
+    "mapper.xml.mustache": "mapper/{className}Dao.xml",  # XML文件不需要子包
+    "mapper.mustache": "mapper/{className}Dao.xml",
+    "dto.mustache": "dto/{packageSuffix}/{className}DTO.java",
+    "vo.mustache": "vo/{packageSuffix}/{className}VO.java",
+    "mapstruct_mapper.mustache": "mapper/{packageSuffix}/{className}Mapper.java",
+    "mybatis_plus_config.mustache": "config/MybatisPlusConfig.java",
+})
 
 
 class TemplateConfigManager:
     """模板配置管理器"""
     
     @staticmethod
-    def get_template_files(category: str) -> List[str]:
+    def get_template_files(category: str) -> Tuple[str, ...]:
         """获取指定分类的模板文件列表"""
-        template_files = {
-            "Default": [
-                "entity.mustache",
-                "dao.mustache", 
-                "service.mustache",
-                "serviceImpl.mustache",
-                "controller.mustache",
-                "mapper.xml.mustache"  # 使用 mapper.xml.mustache
-            ],
-            "MybatisPlus": [
-                "entity.mustache",
-                "dao.mustache",
-                "service.mustache", 
-                "serviceImpl.mustache",
-                "controller.mustache"
-            ],
-            "MybatisPlus-Mixed": [
-                "entity.mustache",
-                "dao.mustache",
-                "service.mustache",
-                "serviceImpl.mustache", 
-                "controller.mustache",
-                "mapper.mustache"
-            ]
-        }
-        
-        return template_files.get(category, [])
+        return _TEMPLATE_FILES.get(category, ())
     
     @staticmethod
-    def get_additional_templates() -> List[str]:
+    def get_additional_templates() -> Tuple[str, ...]:
         """获取通用附加模板列表"""
-        return [
-            "dto.mustache",
-            "vo.mustache", 
-            "mapstruct_mapper.mustache"
-        ]
+        return _ADDITIONAL_TEMPLATES
     
     @staticmethod
-    def get_output_path_mapping() -> Dict[str, str]:
+    def get_output_path_mapping() -> Mapping[str, str]:
         """获取输出路径映射 - 支持前缀子包在组件类型之后"""
-        return {
-            "entity.mustache": "entity/{packageSuffix}/{className}.java",
-            "dao.mustache": "dao/{packageSuffix}/{className}Dao.java", 
-            "service.mustache": "service/{packageSuffix}/{className}Service.java",
-            "serviceImpl.mustache": "service/impl/{packageSuffix}/{className}ServiceImpl.java",
-            "controller.mustache": "controller/{packageSuffix}/{className}Controller.java",
-            "mapper.xml.mustache": "mapper/{className}Dao.xml",  # XML文件不需要子包
-            "mapper.mustache": "mapper/{className}Dao.xml",
-            "dto.mustache": "dto/{packageSuffix}/{className}DTO.java",
-            "vo.mustache": "vo/{packageSuffix}/{className}VO.java",
-            "mapstruct_mapper.mustache": "mapper/{packageSuffix}/{className}Mapper.java"
-            ,"mybatis_plus_config.mustache": "config/MybatisPlusConfig.java"
-        }
+        return _OUTPUT_PATH_MAPPING
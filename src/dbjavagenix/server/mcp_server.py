@@ -4,12 +4,11 @@ Provides database analysis and Java code generation capabilities through MCP too
 """
 import asyncio
 import logging
-from typing import Any, Sequence
+from typing import Any, Awaitable, Callable, Sequence
 
 from mcp.server import Server
 from mcp.server.models import InitializationOptions
 from mcp.types import Resource, Tool, TextContent, ImageContent, EmbeddedResource
-import mcp.server.stdio
 
 from ..database.mcp_tools import (
     get_connection_tools,
@@ -40,6 +39,41 @@ logger = logging.getLogger(__name__)
 # Create MCP server instance
 server = Server("dbjavagenix")
 
+ToolResult = list[TextContent | ImageContent | EmbeddedResource]
+
+# Tool name -> handler dispatch table
+_TOOL_HANDLERS: dict[str, Callable[[dict[str, Any]], Awaitable[ToolResult]]] = {
+    # Database connection and query tools
+    "db_connect_test": handle_db_connect_test,
+    "db_query_databases": handle_db_query_databases,
+    "db_query_tables": handle_db_query_tables,
+    "db_query_table_exists": handle_db_query_table_exists,
+    "db_query_execute": handle_db_query_execute,
+    
+    # Table structure analysis tools
+    "db_table_describe": handle_db_table_describe,
+    "db_table_columns": handle_db_table_columns,
+    "db_table_primary_keys": handle_db_table_primary_keys,
+    "db_table_foreign_keys": handle_db_table_foreign_keys,
+    "db_table_indexes": handle_db_table_indexes,
+    
+    # Code generation tools
+    "db_codegen_analyze": handle_db_codegen_analyze,
+    "db_codegen_generate": handle_db_codegen_generate,
+    
+    # (deprecated/removed) java_check_dependencies was never implemented here;
+    # dependency analysis is covered by springboot_* tools.
+    
+    # SpringBoot project validation tools
+    "springboot_validate_project": handle_springboot_validate_project,
+    "springboot_analyze_dependencies": handle_springboot_analyze_dependencies,
+    "springboot_read_config": handle_springboot_read_config,
+}
+
+
+# Tool catalog is static for the server lifetime, built on first list_tools call
+_TOOLS_CACHE: list[Tool] | None = None
+
 
 @server.list_tools()
 async def handle_list_tools() -> list[Tool]:
@@ -49,26 +83,25 @@ async def handle_list_tools() -> list[Tool]:
     Returns:
         List of available tools
     """
-    tools = []
-    
-    # Add database connection and query tools
-    tools.extend(get_connection_tools())
+    global _TOOLS_CACHE
+    if _TOOLS_CACHE is None:
+        _TOOLS_CACHE = [
+            # Database connection and query tools
+            *get_connection_tools(),
+            # Table structure analysis tools
+            *get_table_analysis_tools(),
+            # Code generation tools
+            *get_codegen_tools(),
+            # SpringBoot project validation tools
+            *get_springboot_project_tools(),
+        ]
     
-    # Add table structure analysis tools
-    tools.extend(get_table_analysis_tools())
-    
-    # Add code generation tools
-    tools.extend(get_codegen_tools())
-    
-    # Add SpringBoot project validation tools  
-    tools.extend(get_springboot_project_tools())
-    
-    logger.info(f"Listed {len(tools)} available tools")
-    return tools
+    logger.info(f"Listed {len(_TOOLS_CACHE)} available tools")
+    return list(_TOOLS_CACHE)
 
 
 @server.call_tool()
-async def handle_call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent | ImageContent | EmbeddedResource]:
+async def handle_call_tool(name: str, arguments: dict[str, Any]) -> ToolResult:
     """
     Handle tool execution
     
@@ -82,48 +115,10 @@ async def handle_call_tool(name: str, arguments: dict[str, Any]) -> list[TextCon
     logger.info(f"Calling tool: {name} with arguments: {arguments}")
     
     try:
-        # Database connection and query tools
-        if name == "db_connect_test":
-            return await handle_db_connect_test(arguments)
-        elif name == "db_query_databases":
-            return await handle_db_query_databases(arguments)
-        elif name == "db_query_tables":
-            return await handle_db_query_tables(arguments)
-        elif name == "db_query_table_exists":
-            return await handle_db_query_table_exists(arguments)
-        elif name == "db_query_execute":
-            return await handle_db_query_execute(arguments)
-        
-        # Table structure analysis tools
-        elif name == "db_table_describe":
-            return await handle_db_table_describe(arguments)
-        elif name == "db_table_columns":
-            return await handle_db_table_columns(arguments)
-        elif name == "db_table_primary_keys":
-            return await handle_db_table_primary_keys(arguments)
-        elif name == "db_table_foreign_keys":
-            return await handle_db_table_foreign_keys(arguments)
-        elif name == "db_table_indexes":
-            return await handle_db_table_indexes(arguments)
-        
-        # Code generation tools
-        elif name == "db_codegen_analyze":
-            return await handle_db_codegen_analyze(arguments)
-        elif name == "db_codegen_generate":
-            return await handle_db_codegen_generate(arguments)
-        
-        # (deprecated/removed) java_check_dependencies was never implemented here;
-        # dependency analysis is covered by springboot_* tools.
-            
-        # SpringBoot project validation tools
-        elif name == "springboot_validate_project":
-            return await handle_springboot_validate_project(arguments)
-        elif name == "springboot_analyze_dependencies":
-            return await handle_springboot_analyze_dependencies(arguments)
-        elif name == "springboot_read_config":
-            return await handle_springboot_read_config(arguments)
-        else:
+        handler = _TOOL_HANDLERS.get(name)
+        if handler is None:
             raise ValueError(f"Unknown tool: {name}")
+        return await handler(arguments)
             
     except Exception as e:
         logger.error(f"Tool execution failed: {e}")
@@ -139,6 +134,9 @@ async def run_server():
     """
     logger.info("Starting DBJavaGenix MCP Server...")
     
+    # stdio transport is only needed once the server actually runs
+    import mcp.server.stdio
+    
     try:
         # Run the server using stdio transport
         async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
@@ -6,13 +6,137 @@
 自动添加缺失的Maven/Gradle依赖到构建文件中
 """
 
+import atexit
 import os
 import re
-import xml.etree.ElementTree as ET
-from typing import Dict, List, Optional, Tuple, Set
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import BinaryIO, Dict, List, Optional, Tuple, Set, Union
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from .dependency_requirements import DependencyInfo
+from .build_files import write_text_atomic
+
+# 优先使用 lxml (基于 libxml2，解析大型 pom.xml 更快)，未安装时回退到标准库
+try:
+    from lxml import etree as ET
+    _HAS_LXML = True
+    _XML_PARSE_ERRORS: Tuple[type, ...] = (ET.XMLSyntaxError,)
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _HAS_LXML = False
+    _XML_PARSE_ERRORS = (ET.ParseError,)
+
+# 可选使用 pyahocorasick 做多模式匹配，未安装时回退到预编译的分支正则
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+def _whitespace_start(content: str, pos: int) -> int:
+    r"""返回 pos 之前连续空白的起始位置，等价于正则 (\s*)<tag> 的匹配起点"""
+    while pos > 0 and content[pos - 1].isspace():
+        pos -= 1
+    return pos
+
+
+def _find_outside_comments(content: str, tag: str) -> int:
+    """查找第一处不在 <!-- --> 注释中的 tag，未找到时返回 -1"""
+    pos = content.find(tag)
+    while pos != -1:
+        comment_start = content.rfind('<!--', 0, pos)
+        if comment_start == -1 or content.find('-->', comment_start + 4, pos) != -1:
+            return pos
+        # 位于注释中，从注释结束处继续查找
+        comment_end = content.find('-->', pos)
+        if comment_end == -1:
+            return -1
+        pos = content.find(tag, comment_end + 3)
+    return -1
+
+
+# ==================== 预编译的正则表达式 ====================
+
+# Maven dependencies 块 (开始标签, 内容, 结束标签)
+_DEPS_BLOCK_RE = re.compile(r'(<dependencies>)(.*?)(</dependencies>)', re.DOTALL)
+# 依赖声明: groupId, artifactId, 可选的 version
+_DEP_RE = re.compile(
+    r'<dependency>\s*\n?\s*<groupId>([^<]+)</groupId>\s*\n?\s*<artifactId>([^<]+)</artifactId>(?:\s*\n?\s*<version>([^<]+)</version>)?',
+    re.MULTILINE | re.DOTALL
+)
+
+# 常见的XML语法错误
+_XML_ERROR_RES = [
+    re.compile(r'<\s*$', re.MULTILINE),           # 断开的开始标签，如 '<'
+    re.compile(r'</\s*$', re.MULTILINE),          # 断开的结束标签，如 '</'
+    re.compile(r'<\s+[^>]*$', re.MULTILINE),      # 不完整的标签
+    re.compile(r'</\s+$', re.MULTILINE),          # 断开的结束标签，如 '</ '
+]
+
+# 常见XML语法错误的修复规则 (按顺序执行)
+_XML_FIX_RULES = [
+    # 修复孤立的 "</  " 或 "</" 行，通常这应该是 "</dependencies>"
+    (re.compile(r'^\s*</\s*$', re.MULTILINE), ''),  # 直接删除孤立的 "</" 行
+    (re.compile(r'^\s*</\s*\n', re.MULTILINE), ''),  # 删除 "</" 后跟换行的情况
+    
+    # 修复在dependencies上下文中的断开标签
+    (re.compile(r'(\s+)</\s*(?=\s*<!--.*依赖)', re.MULTILINE),
+     r'\1</dependencies>\n\1<!-- 修复断开的dependencies标签 -->\n\1'),
+    
+    # 修复 "    < " 等断开的开始标签
+    (re.compile(r'^\s*<\s*$', re.MULTILINE), ''),
+    (re.compile(r'^\s*<\s*\n', re.MULTILINE), ''),
+    
+    # 清理重复的注释
+    (re.compile(r'(<!-- 下方是我们添加的依赖 -->\s*){2,}', re.MULTILINE), r'\1'),
+    (re.compile(r'(<!-- DBJavaGenix 自动添加的依赖 -->\s*){2,}', re.MULTILINE), r'\1'),
+]
+# 上述规则的快速预检：断开的标签必然是 "<" 或 "</" 后面不跟合法的名称起始字符，
+# 重复注释则至少出现两次。两者都不满足时所有规则都不会匹配
+_BROKEN_TAG_RE = re.compile(r'<(?![A-Za-z_!?/])|</(?![A-Za-z_:])')
+_DUPLICATE_COMMENTS = ('<!-- 下方是我们添加的依赖 -->', '<!-- DBJavaGenix 自动添加的依赖 -->')
+
+# 重复依赖块清理
+_MAIN_DEPS_RE = re.compile(r'(<dependencies>.*?</dependencies>)', re.DOTALL)
+_ORPHAN_DEP_RE = re.compile(r'<!-- [^>]+ -->\s*<dependency>.*?</dependency>', re.DOTALL)
+
+# Gradle 依赖声明与 dependencies 块
+_GRADLE_DEP_RE = re.compile(
+    r"(implementation|api|compileOnly|runtimeOnly|testImplementation)\s+['\"]([^:]+):([^:]+):?([^'\"]*)['\"]",
+    re.MULTILINE
+)
+_GRADLE_DEPS_BLOCK_RE = re.compile(r'(dependencies\s*\{[^}]*\})', re.DOTALL)
+
+# 过时依赖的 groupId 片段
+_DEPRECATED_GROUP_PATTERNS = ("javax.annotation", "javax.validation", "io.swagger")
+if ahocorasick is not None:
+    _DEPRECATED_GROUP_AUTOMATON = ahocorasick.Automaton()
+    for _pattern in _DEPRECATED_GROUP_PATTERNS:
+        _DEPRECATED_GROUP_AUTOMATON.add_word(_pattern, _pattern)
+    _DEPRECATED_GROUP_AUTOMATON.make_automaton()
+    del _pattern
+else:
+    _DEPRECATED_GROUP_AUTOMATON = None
+_DEPRECATED_GROUP_RE = re.compile('|'.join(map(re.escape, _DEPRECATED_GROUP_PATTERNS)))
+
+
+def _is_deprecated_group(group_id: str) -> bool:
+    """groupId 中是否包含任一过时依赖片段，只扫描一遍 groupId"""
+    if _DEPRECATED_GROUP_AUTOMATON is not None:
+        return next(_DEPRECATED_GROUP_AUTOMATON.iter(group_id), None) is not None
+    return _DEPRECATED_GROUP_RE.search(group_id) is not None
+
+
+# Maven scope 到 Gradle 配置的映射
+_GRADLE_SCOPE_MAP = {
+    "compile": "implementation",
+    "provided": "compileOnly",
+    "test": "testImplementation",
+    "runtime": "runtimeOnly",
+}
 
 
 @dataclass
@@ -25,13 +149,38 @@ class DependencyAddResult:
     backup_file: Optional[str] = None  # 备份文件路径
 
 
+@dataclass
+class _PomAnalysis:
+    """一次解析pom.xml得到的结果"""
+    existing_deps: Dict[str, str] = field(default_factory=dict)  # groupId:artifactId -> version
+    well_formed: bool = True  # XML是否能被完整解析
+
+
 class AutoDependencyManager:
     """自动依赖管理器"""
     
-    def __init__(self):
+    def __init__(self, defer_writes: bool = False):
+        """
+        Args:
+            defer_writes: 是否延迟写入构建文件。开启后修改只保存在内存中，
+                          调用 flush() (或进程退出) 时每个文件只写一次
+        """
         self.maven_namespaces = {
             'maven': 'http://maven.apache.org/POM/4.0.0'
         }
+        self.defer_writes = defer_writes
+        # 尚未写盘的构建文件内容，多线程添加依赖时由 _pending_lock 保护
+        self._pending: Dict[Path, str] = {}
+        self._dirty: Set[Path] = set()
+        self._pending_lock = threading.Lock()
+        # 每个项目的构建工具检测结果，以及每个构建文件本次会话的备份
+        self._build_tool_cache: Dict[Path, str] = {}
+        self._backed_up: Dict[Path, Path] = {}
+        if defer_writes:
+            atexit.register(self.flush)
+        # lxml 解析器可重复使用，避免每次校验都重新创建解析器状态；
+        # 解析器不能跨线程共享，按线程各保存一个
+        self._parser_local = threading.local()
     
     def add_dependencies_to_project(self, 
                                    project_path: str,
@@ -84,13 +233,104 @@ class AutoDependencyManager:
                 errors=[f"不支持的构建工具: {build_tool}"]
             )
     
+    def add_dependencies_to_projects(self,
+                                    project_paths: List[str],
+                                    dependencies: List[DependencyInfo],
+                                    create_backup: bool = True,
+                                    dry_run: bool = False,
+                                    max_workers: Optional[int] = None) -> List[DependencyAddResult]:
+        """
+        并发地向多个项目添加依赖
+        
+        各项目的读写互不相关且以I/O为主，使用线程池并行处理。
+        项目路径应互不相同，同一构建文件不要在一次调用中出现多次。
+        
+        Args:
+            project_paths: 项目路径列表
+            dependencies: 要添加的依赖列表
+            create_backup: 是否创建备份
+            dry_run: 是否只是预演（不实际修改文件）
+            max_workers: 最大线程数，默认 min(32, CPU数*4)
+            
+        Returns:
+            与 project_paths 顺序一致的依赖添加结果列表
+        """
+        if not project_paths:
+            return []
+        if max_workers is None:
+            max_workers = min(32, (os.cpu_count() or 1) * 4)
+        max_workers = min(max_workers, len(project_paths))
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(
+                lambda path: self.add_dependencies_to_project(path, dependencies, create_backup, dry_run),
+                project_paths
+            ))
+    
+    def flush(self) -> List[str]:
+        """
+        将所有待写入的构建文件写盘
+        
+        Returns:
+            已写入的文件路径列表
+        """
+        with self._pending_lock:
+            dirty = list(self._dirty)
+        return [str(file_path) for file_path in dirty if self._flush_file(file_path)]
+    
+    def _flush_file(self, file_path: Path) -> bool:
+        """
+        将单个构建文件的待写入内容写盘
+        
+        Returns:
+            是否实际写入（已被其他调用写盘时返回False）
+        """
+        with self._pending_lock:
+            if file_path not in self._dirty:
+                return False
+            self._dirty.discard(file_path)
+            content = self._pending.pop(file_path)
+        # 先写临时文件再 os.replace，原文件的硬链接备份保持不变
+        write_text_atomic(file_path, content)
+        return True
+    
+    def _read_build_file(self, file_path: Path) -> str:
+        """读取构建文件，优先返回尚未写盘的最新内容"""
+        with self._pending_lock:
+            pending = self._pending.get(file_path)
+        if pending is not None:
+            return pending
+        with open(file_path, 'rb') as f:
+            content = f.read().decode('utf-8')
+        # 与文本模式读取一致：统一换行符为 \n
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content
+    
+    def _write_build_file(self, file_path: Path, content: str):
+        """写入构建文件，延迟写入模式下只记录到内存"""
+        with self._pending_lock:
+            self._pending[file_path] = content
+            self._dirty.add(file_path)
+        if not self.defer_writes:
+            # 只写调用方自己的文件，不替其他线程写盘
+            self._flush_file(file_path)
+    
     def _detect_build_tool(self, project_path: Path) -> Optional[str]:
-        """检测构建工具类型"""
+        """检测构建工具类型（结果按项目缓存，未检测到时不缓存）"""
+        key = project_path.resolve()
+        cached = self._build_tool_cache.get(key)
+        if cached is not None:
+            return cached
+        
         if (project_path / "pom.xml").exists():
-            return "maven"
+            build_tool = "maven"
         elif (project_path / "build.gradle").exists() or (project_path / "build.gradle.kts").exists():
-            return "gradle"
-        return None
+            build_tool = "gradle"
+        else:
+            return None
+        self._build_tool_cache[key] = build_tool
+        return build_tool
     
     def _add_maven_dependencies(self, project_path: Path, dependencies: List[DependencyInfo]) -> int:
         """添加Maven依赖 - 修复版"""
@@ -99,12 +339,10 @@ class AutoDependencyManager:
             raise Exception("pom.xml文件不存在")
         
         # 读取pom.xml内容
-        with open(pom_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = self._read_build_file(pom_file)
         
         # 查找dependencies标签
-        dependencies_pattern = r'(<dependencies>)(.*?)(</dependencies>)'
-        dependencies_match = re.search(dependencies_pattern, content, re.DOTALL)
+        dependencies_match = _DEPS_BLOCK_RE.search(content)
         
         added_count = 0
         
@@ -146,7 +384,8 @@ class AutoDependencyManager:
             updated_deps_block += end_tag
             
             # 替换原来的dependencies块
-            content = content.replace(dependencies_match.group(0), updated_deps_block)
+            content = (content[:dependencies_match.start()] + updated_deps_block
+                       + content[dependencies_match.end():])
         else:
             # 创建新的dependencies标签
             new_deps_section = ["<dependencies>"]
@@ -175,8 +414,7 @@ class AutoDependencyManager:
                 content = content.rstrip() + "\n\n" + "\n".join(new_deps_section) + "\n"
         
         # 写回文件
-        with open(pom_file, 'w', encoding='utf-8') as f:
-            f.write(content)
+        self._write_build_file(pom_file, content)
         
         return added_count
     
@@ -191,11 +429,11 @@ class AutoDependencyManager:
         
         try:
             # 1. 读取现有pom.xml内容
-            with open(pom_file, 'r', encoding='utf-8') as f:
-                pom_content = f.read()
+            pom_content = self._read_build_file(pom_file)
             
-            # 2. 解析现有依赖（用于检查重复）
-            existing_deps = self._parse_existing_dependencies_from_content(pom_content)
+            # 2. 解析现有依赖（用于检查重复），同时得到XML是否完整
+            analysis = self._analyze_pom(pom_content)
+            existing_deps = analysis.existing_deps
             added_dependencies = []
             skipped_dependencies = []
             
@@ -236,11 +474,12 @@ class AutoDependencyManager:
                 backup_file = self._create_backup(pom_file)
             
             # 7. 使用字符串操作添加依赖
-            new_pom_content = self._insert_dependencies_string_based(pom_content, added_dependencies)
+            new_pom_content = self._insert_dependencies_string_based(
+                pom_content, added_dependencies, well_formed=analysis.well_formed
+            )
             
             # 8. 保存文件
-            with open(pom_file, 'w', encoding='utf-8') as f:
-                f.write(new_pom_content)
+            self._write_build_file(pom_file, new_pom_content)
             
             return DependencyAddResult(
                 success=True,
@@ -287,8 +526,7 @@ class AutoDependencyManager:
         
         try:
             # 1. 读取现有build.gradle
-            with open(gradle_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = self._read_build_file(gradle_file)
             
             # 2. 检查现有依赖
             existing_deps = self._get_existing_gradle_dependencies(content)
@@ -335,8 +573,7 @@ class AutoDependencyManager:
             new_content = self._insert_gradle_dependencies(content, added_dependencies)
             
             # 8. 保存文件
-            with open(gradle_file, 'w', encoding='utf-8') as f:
-                f.write(new_content)
+            self._write_build_file(gradle_file, new_content)
             
             return DependencyAddResult(
                 success=True,
@@ -355,14 +592,69 @@ class AutoDependencyManager:
                 backup_file=str(backup_file) if backup_file else None
             )
     
+    def _analyze_pom(self, pom_content: str) -> _PomAnalysis:
+        """
+        解析一次POM内容，同时得到现有依赖和XML是否完整
+        
+        XML无法解析时回退到正则匹配现有依赖
+        """
+        try:
+            existing_deps = self._parse_existing_dependencies_iter(BytesIO(pom_content.encode('utf-8')))
+            return _PomAnalysis(existing_deps=existing_deps, well_formed=True)
+        except _XML_PARSE_ERRORS:
+            return _PomAnalysis(
+                existing_deps=self._parse_existing_dependencies_from_content(pom_content),
+                well_formed=False
+            )
+    
+    def _parse_existing_dependencies_iter(self, source: Union[str, Path, BinaryIO]) -> Dict[str, str]:
+        """流式解析pom.xml中的现有依赖，处理完的元素立即释放以控制内存"""
+        existing_deps = {}
+        
+        if isinstance(source, Path):
+            source = str(source)
+        if _HAS_LXML:
+            context = ET.iterparse(source, events=('end',), tag='{*}dependency',
+                                   resolve_entities=False)
+        else:
+            context = ET.iterparse(source, events=('end',))
+        
+        for _, elem in context:
+            if not _HAS_LXML and elem.tag.rpartition('}')[2] != 'dependency':
+                continue
+            
+            group_id = None
+            artifact_id = None
+            version = None
+            for child in elem:
+                if not isinstance(child.tag, str):
+                    continue  # 跳过注释
+                name = child.tag.rpartition('}')[2]
+                if name == 'groupId':
+                    group_id = child.text
+                elif name == 'artifactId':
+                    artifact_id = child.text
+                elif name == 'version':
+                    version = child.text
+            
+            if group_id and artifact_id:
+                key = f"{group_id.strip()}:{artifact_id.strip()}"
+                existing_deps[key] = version.strip() if version else "未指定"
+            
+            # 释放已处理的元素及其之前的兄弟节点
+            elem.clear()
+            if _HAS_LXML:
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+        
+        return existing_deps
+    
     def _parse_existing_dependencies_from_content(self, pom_content: str) -> Dict[str, str]:
         """从POM内容字符串中解析现有依赖"""
         existing_deps = {}
         
         # 使用正则表达式匹配依赖块
-        dependency_pattern = r'<dependency>\s*\n?\s*<groupId>([^<]+)</groupId>\s*\n?\s*<artifactId>([^<]+)</artifactId>(?:\s*\n?\s*<version>([^<]+)</version>)?'
-        
-        matches = re.findall(dependency_pattern, pom_content, re.MULTILINE | re.DOTALL)
+        matches = _DEP_RE.findall(pom_content)
         
         for group_id, artifact_id, version in matches:
             key = f"{group_id.strip()}:{artifact_id.strip()}"
@@ -370,61 +662,78 @@ class AutoDependencyManager:
         
         return existing_deps
     
-    def _has_xml_syntax_errors(self, content: str) -> bool:
-        """检查XML内容是否有语法错误"""
+    def _has_xml_syntax_errors(self, content: str, well_formed: Optional[bool] = None,
+                               strict: bool = True) -> bool:
+        """
+        检查XML内容是否有语法错误
         
-        # 检查常见的XML语法错误
-        error_patterns = [
-            r'<\s*$',           # 断开的开始标签，如 '<'
-            r'</\s*$',          # 断开的结束标签，如 '</'
-            r'<\s+[^>]*$',      # 不完整的标签
-            r'</\s+$',          # 断开的结束标签，如 '</ '
-        ]
+        Args:
+            content: XML内容
+            well_formed: 已知的完整解析结果，提供时不再重复解析
+            strict: 结果未知时是否做完整解析；为False时只做正则快速检查
+        """
         
-        for pattern in error_patterns:
-            if re.search(pattern, content, re.MULTILINE):
+        # 检查常见的XML语法错误
+        for pattern in _XML_ERROR_RES:
+            if pattern.search(content):
                 return True
         
-        # 尝试用ElementTree验证（更严格的检查）
+        if well_formed is not None:
+            return not well_formed
+        if not strict:
+            return False
+        
+        # 尝试完整解析验证（更严格的检查）
         try:
-            import xml.etree.ElementTree as ET
-            ET.fromstring(content)
+            self._parse_xml(content)
             return False
-        except ET.ParseError:
+        except _XML_PARSE_ERRORS:
             return True
         except Exception:
             # 如果有其他异常，也认为是有问题的
             return True
     
-    def _fix_common_xml_errors(self, content: str) -> str:
-        """自动修复常见的XML语法错误"""
+    def _parse_xml(self, content: str):
+        """解析XML字符串，返回根元素"""
+        # lxml 不接受带 encoding 声明的 str，统一按 UTF-8 字节解析
+        data = content.encode('utf-8')
+        parser = self._get_xml_parser()
+        if parser is not None:
+            return ET.fromstring(data, parser)
+        return ET.fromstring(data)
+    
+    def _get_xml_parser(self):
+        """获取当前线程的 lxml 解析器，未安装 lxml 时返回 None"""
+        if not _HAS_LXML:
+            return None
+        parser = getattr(self._parser_local, 'parser', None)
+        if parser is None:
+            parser = ET.XMLParser(huge_tree=False, remove_blank_text=False, resolve_entities=False)
+            self._parser_local.parser = parser
+        return parser
+    
+    def _fix_common_xml_errors(self, content: str) -> Tuple[str, bool]:
+        """
+        自动修复常见的XML语法错误
         
-        # 修复断开的标签，如 "</"
-        # 更精确地查找这种情况并尝试修复
-        patterns_fixes = [
-            # 修复孤立的 "</  " 或 "</" 行，通常这应该是 "</dependencies>"
-            (r'^\s*</\s*$', ''),  # 直接删除孤立的 "</" 行
-            (r'^\s*</\s*\n', ''),  # 删除 "</" 后跟换行的情况
-            
-            # 修复在dependencies上下文中的断开标签
-            (r'(\s+)</\s*(?=\s*<!--.*依赖)', r'\1</dependencies>\n\1<!-- 修复断开的dependencies标签 -->\n\1'),
-            
-            # 修复 "    < " 等断开的开始标签
-            (r'^\s*<\s*$', ''),
-            (r'^\s*<\s*\n', ''),
-            
-            # 清理重复的注释
-            (r'(<!-- 下方是我们添加的依赖 -->\s*){2,}', r'\1'),
-            (r'(<!-- DBJavaGenix 自动添加的依赖 -->\s*){2,}', r'\1'),
-        ]
+        Returns:
+            (修复后的内容, 是否有修改)
+        """
+        modified = False
         
-        for pattern, replacement in patterns_fixes:
-            content = re.sub(pattern, replacement, content, flags=re.MULTILINE)
+        # 修复断开的标签，如 "</"
+        # 更精确地查找这种情况并尝试修复；正常的POM通过预检后直接跳过逐条替换
+        if (_BROKEN_TAG_RE.search(content)
+                or any(content.count(comment) > 1 for comment in _DUPLICATE_COMMENTS)):
+            for pattern, replacement in _XML_FIX_RULES:
+                content, count = pattern.subn(replacement, content)
+                modified = modified or count > 0
         
         # 清理重复的依赖块
-        content = self._remove_duplicate_dependency_sections(content)
+        deduped = self._remove_duplicate_dependency_sections(content)
+        modified = modified or deduped is not content
         
-        return content
+        return deduped, modified
     
     def _remove_duplicate_dependency_sections(self, content: str) -> str:
         """移除重复的依赖块"""
@@ -433,8 +742,7 @@ class AutoDependencyManager:
         # 这种情况下，我们需要将这些依赖合并到主要的dependencies块中
         
         # 首先找到主要的dependencies块
-        main_deps_pattern = r'(<dependencies>.*?</dependencies>)'
-        main_deps_match = re.search(main_deps_pattern, content, re.DOTALL)
+        main_deps_match = _MAIN_DEPS_RE.search(content)
         
         if not main_deps_match:
             return content
@@ -444,101 +752,135 @@ class AutoDependencyManager:
         
         # 查找main dependencies块之后的依赖
         remaining_content = content[main_deps_end:]
-        orphan_deps_pattern = r'<!-- [^>]+ -->\s*<dependency>.*?</dependency>'
-        orphan_matches = re.findall(orphan_deps_pattern, remaining_content, re.DOTALL)
+        orphan_matches = list(_ORPHAN_DEP_RE.finditer(remaining_content))
         
         if orphan_matches:
             # 将孤立的依赖合并到主要的dependencies块中
-            orphan_deps_text = '\n        '.join(orphan_matches)
+            orphan_deps_text = '\n        '.join(m.group(0) for m in orphan_matches)
             
-            # 在主要dependencies块的</dependencies>前插入孤立的依赖
-            new_main_block = main_deps_block.replace(
-                '</dependencies>',
-                f'\n        {orphan_deps_text}\n    </dependencies>'
-            )
+            # 在主要dependencies块的</dependencies>前插入孤立的依赖（非贪婪匹配，结束标签只在块尾出现一次）
+            new_main_block = (main_deps_block[:-len('</dependencies>')]
+                              + f'\n        {orphan_deps_text}\n    </dependencies>')
             
-            # 移除孤立的依赖
-            for orphan in orphan_matches:
-                remaining_content = remaining_content.replace(orphan, '', 1)
+            # 按匹配位置切片移除孤立的依赖，避免逐个replace反复扫描和复制
+            parts = [content[:main_deps_match.start()], new_main_block]
+            pos = 0
+            for m in orphan_matches:
+                parts.append(remaining_content[pos:m.start()])
+                pos = m.end()
+            parts.append(remaining_content[pos:])
             
             # 重新组装内容
-            content = content[:main_deps_match.start()] + new_main_block + remaining_content
+            content = ''.join(parts)
         
         return content
     
-    def _insert_dependencies_string_based(self, pom_content: str, dependencies: List[DependencyInfo]) -> str:
-        """使用字符串操作插入依赖到POM内容中 - 修复版"""
+    def _insert_dependencies_string_based(self, pom_content: str, dependencies: List[DependencyInfo],
+                                          well_formed: Optional[bool] = None) -> str:
+        """
+        使用字符串操作插入依赖到POM内容中 - 修复版
+        
+        Args:
+            pom_content: POM内容
+            dependencies: 要插入的依赖
+            well_formed: 原始内容的完整解析结果 (来自 _analyze_pom)，内容未被修复时复用
+        """
         
         # 首先尝试修复常见的XML语法错误
-        pom_content = self._fix_common_xml_errors(pom_content)
+        pom_content, modified = self._fix_common_xml_errors(pom_content)
+        if modified:
+            # 内容被修改过，需要重新完整解析
+            well_formed = None
         
-        # 再次检查是否还有语法错误
-        if self._has_xml_syntax_errors(pom_content):
+        # 再次检查是否还有语法错误（未修改的内容只在解析结果未知时跳过完整解析）
+        if self._has_xml_syntax_errors(pom_content, well_formed, strict=modified):
             raise Exception("POM文件存在复杂的XML语法错误，无法自动修复，请手动修复后再添加依赖")
         
-        # 查找完整的 </dependencies> 标签
-        dependencies_end_pattern = r'(\s*)</dependencies>\s*'
-        dependencies_end_match = re.search(dependencies_end_pattern, pom_content, re.MULTILINE)
+        # 查找完整的 </dependencies> 标签。
+        # 标签都是固定字符串，str.find 比正则搜索快得多；保持取第一处出现的语义
+        dependencies_end = self._locate_dependencies_end(pom_content)
         
-        if not dependencies_end_match:
+        if dependencies_end is None:
             # 如果没有找到完整的 </dependencies>，这可能意味着：
             # 1. dependencies块没有正确关闭
             # 2. 完全没有dependencies块
             
-            dependencies_start_pattern = r'<dependencies>\s*'
-            dependencies_start_match = re.search(dependencies_start_pattern, pom_content)
+            dependencies_start = pom_content.find('<dependencies>')
             
-            if dependencies_start_match:
+            if dependencies_start != -1:
                 # 存在<dependencies>开始标签但没有</dependencies>结束标签
                 # 我们需要在合适的位置插入依赖并添加结束标签
                 
                 # 查找最后一个</dependency>的位置
-                last_dependency_pattern = r'</dependency>(\s*?)(?!.*</dependency>)'
-                last_dependency_match = re.search(last_dependency_pattern, pom_content, re.DOTALL)
+                last_dependency = pom_content.rfind('</dependency>')
                 
-                if last_dependency_match:
+                if last_dependency != -1:
                     # 在最后一个</dependency>后插入新依赖和</dependencies>
-                    insert_pos = last_dependency_match.end()
+                    insert_pos = last_dependency + len('</dependency>')
                     new_dependencies_xml = self._generate_dependencies_xml(dependencies)
                     
-                    return (pom_content[:insert_pos] + 
-                            "\n\n        <!-- DBJavaGenix 自动添加的依赖 -->\n" +
-                            new_dependencies_xml +
-                            "\n    </dependencies>" +
-                            pom_content[insert_pos:])
+                    return "".join([
+                        pom_content[:insert_pos],
+                        "\n\n        <!-- DBJavaGenix 自动添加的依赖 -->\n",
+                        new_dependencies_xml,
+                        "\n    </dependencies>",
+                        pom_content[insert_pos:],
+                    ])
                 else:
-                    # <dependencies>后面没有任何dependency，直接在其后插入
-                    insert_pos = dependencies_start_match.end()
+                    # <dependencies>后面没有任何dependency，直接在其后（跳过空白）插入
+                    insert_pos = dependencies_start + len('<dependencies>')
+                    while insert_pos < len(pom_content) and pom_content[insert_pos].isspace():
+                        insert_pos += 1
                     new_dependencies_xml = self._generate_dependencies_xml(dependencies)
                     
-                    return (pom_content[:insert_pos] + 
-                            "\n        <!-- DBJavaGenix 自动添加的依赖 -->\n" +
-                            new_dependencies_xml +
-                            "\n    </dependencies>\n" +
-                            pom_content[insert_pos:])
+                    return "".join([
+                        pom_content[:insert_pos],
+                        "\n        <!-- DBJavaGenix 自动添加的依赖 -->\n",
+                        new_dependencies_xml,
+                        "\n    </dependencies>\n",
+                        pom_content[insert_pos:],
+                    ])
             else:
                 # 完全没有dependencies块，创建新的
-                project_end_pattern = r'(\s*)</project>'
-                project_end_match = re.search(project_end_pattern, pom_content)
+                project_end = pom_content.find('</project>')
                 
-                if project_end_match:
+                if project_end != -1:
                     dependencies_block = self._generate_dependencies_block(dependencies)
-                    insert_pos = project_end_match.start()
-                    return pom_content[:insert_pos] + dependencies_block + "\n\n" + pom_content[insert_pos:]
+                    insert_pos = _whitespace_start(pom_content, project_end)
+                    return "".join([pom_content[:insert_pos], dependencies_block, "\n\n",
+                                    pom_content[insert_pos:]])
                 else:
                     raise Exception("无法找到合适的位置插入依赖")
         
         # 在现有正确的dependencies块中添加新依赖
         new_dependencies_xml = self._generate_dependencies_xml(dependencies)
         
-        # 在 </dependencies> 前插入新依赖
-        insert_pos = dependencies_end_match.start()
-        indent = dependencies_end_match.group(1)  # 保持相同的缩进
+        # 在 </dependencies> 前插入新依赖，一次性拼接避免多次复制整个POM
+        insert_pos, indent = dependencies_end  # 保持相同的缩进
+        
+        return "".join([
+            pom_content[:insert_pos],
+            "\n",
+            indent,
+            "<!-- DBJavaGenix 自动添加的依赖 -->\n",
+            new_dependencies_xml,
+            pom_content[insert_pos:],
+        ])
+    
+    def _locate_dependencies_end(self, pom_content: str) -> Optional[Tuple[int, str]]:
+        """
+        定位第一个不在注释中的 </dependencies> 结束标签
+        
+        Returns:
+            (插入位置, 结束标签前的空白)，未找到时返回 None
+        """
+        tag_pos = _find_outside_comments(pom_content, '</dependencies>')
+        if tag_pos == -1:
+            return None
         
-        return (pom_content[:insert_pos] + 
-                "\n" + indent + "<!-- DBJavaGenix 自动添加的依赖 -->\n" +
-                new_dependencies_xml +
-                pom_content[insert_pos:])
+        # 向前跳过空白，与正则 (\s*)</dependencies> 的匹配起点一致
+        insert_pos = _whitespace_start(pom_content, tag_pos)
+        return insert_pos, pom_content[insert_pos:tag_pos]
     
     def _generate_dependencies_block(self, dependencies: List[DependencyInfo]) -> str:
         """生成完整的dependencies块"""
@@ -585,6 +927,8 @@ class AutoDependencyManager:
         # 查找dependencies节点 - 修复命名空间问题
         deps_elem = None
         for elem in root.iter():
+            if not isinstance(elem.tag, str):
+                continue  # 跳过注释等非元素节点
             if elem.tag.endswith('dependencies') or elem.tag == 'dependencies':
                 deps_elem = elem
                 break
@@ -592,6 +936,8 @@ class AutoDependencyManager:
         if deps_elem is not None:
             # 查找所有dependency子元素
             for dep_elem in deps_elem:
+                if not isinstance(dep_elem.tag, str):
+                    continue
                 if dep_elem.tag.endswith('dependency') or dep_elem.tag == 'dependency':
                     group_id = None
                     artifact_id = None
@@ -599,6 +945,8 @@ class AutoDependencyManager:
                     
                     # 查找groupId, artifactId, version子元素
                     for child in dep_elem:
+                        if not isinstance(child.tag, str):
+                            continue
                         if child.tag.endswith('groupId') or child.tag == 'groupId':
                             group_id = child.text
                         elif child.tag.endswith('artifactId') or child.tag == 'artifactId':
@@ -617,8 +965,7 @@ class AutoDependencyManager:
         existing_deps = {}
         
         # 匹配Gradle依赖声明
-        dependency_pattern = r"(implementation|api|compileOnly|runtimeOnly|testImplementation)\s+['\"]([^:]+):([^:]+):?([^'\"]*)['\"]"
-        matches = re.findall(dependency_pattern, content, re.MULTILINE)
+        matches = _GRADLE_DEP_RE.findall(content)
         
         for scope, group_id, artifact_id, version in matches:
             key = f"{group_id.strip()}:{artifact_id.strip()}"
@@ -634,6 +981,8 @@ class AutoDependencyManager:
         
         # 尝试不同的方式查找dependencies节点
         for elem in root.iter():
+            if not isinstance(elem.tag, str):
+                continue  # 跳过注释等非元素节点
             if elem.tag.endswith('dependencies') or elem.tag == 'dependencies':
                 deps_elem = elem
                 break
@@ -683,8 +1032,7 @@ class AutoDependencyManager:
         """插入Gradle依赖到build.gradle"""
         
         # 找到dependencies块
-        deps_pattern = r'(dependencies\s*\{[^}]*\})'
-        deps_match = re.search(deps_pattern, content, re.DOTALL)
+        deps_match = _GRADLE_DEPS_BLOCK_RE.search(content)
         
         if deps_match:
             # 在现有dependencies块中添加
@@ -693,14 +1041,7 @@ class AutoDependencyManager:
             # 生成新依赖文本
             new_deps_lines = []
             for dep in dependencies:
-                scope_mapping = {
-                    "compile": "implementation",
-                    "provided": "compileOnly",
-                    "test": "testImplementation", 
-                    "runtime": "runtimeOnly"
-                }
-                
-                gradle_scope = scope_mapping.get(dep.scope, "implementation")
+                gradle_scope = _GRADLE_SCOPE_MAP.get(dep.scope, "implementation")
                 new_deps_lines.extend([
                     f"    // {dep.description}",
                     f"    {gradle_scope} '{dep.group_id}:{dep.artifact_id}:{dep.version}'"
@@ -710,19 +1051,12 @@ class AutoDependencyManager:
             new_deps_text = "\n" + "\n".join(new_deps_lines)
             new_deps_block = deps_block[:-1] + new_deps_text + "\n}"
             
-            content = content.replace(deps_block, new_deps_block)
+            content = content[:deps_match.start(1)] + new_deps_block + content[deps_match.end(1):]
         else:
             # 创建新的dependencies块
             new_deps_lines = ["dependencies {"]
             for dep in dependencies:
-                scope_mapping = {
-                    "compile": "implementation",
-                    "provided": "compileOnly",
-                    "test": "testImplementation",
-                    "runtime": "runtimeOnly"
-                }
-                
-                gradle_scope = scope_mapping.get(dep.scope, "implementation")
+                gradle_scope = _GRADLE_SCOPE_MAP.get(dep.scope, "implementation")
                 new_deps_lines.extend([
                     f"    // {dep.description}",
                     f"    {gradle_scope} '{dep.group_id}:{dep.artifact_id}:{dep.version}'"
@@ -735,15 +1069,22 @@ class AutoDependencyManager:
         return content
     
     def _create_backup(self, file_path: Path) -> Path:
-        """创建备份文件"""
+        """创建备份文件（同一文件在本管理器生命周期内只备份一次）"""
+        if file_path in self._backed_up:
+            return self._backed_up[file_path]
+        
         from datetime import datetime
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_file = file_path.parent / f"{file_path.stem}_backup_{timestamp}{file_path.suffix}"
         
-        import shutil
-        shutil.copy2(file_path, backup_file)
+        # 写入采用原子替换，硬链接即可保留原始内容；不支持硬链接（或跨设备）时回退为复制
+        try:
+            os.link(file_path, backup_file)
+        except OSError:
+            shutil.copy2(file_path, backup_file)
         
+        self._backed_up[file_path] = backup_file
         return backup_file
     
     def _save_xml_with_formatting(self, tree: ET.ElementTree, file_path: Path):
@@ -793,9 +1134,8 @@ class AutoDependencyManager:
                         })
         
         # 检查过时依赖
-        deprecated_patterns = ["javax.annotation", "javax.validation", "io.swagger"]
         for dep in dependencies:
-            if any(pattern in dep.group_id for pattern in deprecated_patterns):
+            if _is_deprecated_group(dep.group_id):
                 warnings.append({
                     "type": "deprecated_dependency",
                     "dependency": f"{dep.group_id}:{dep.artifact_id}",
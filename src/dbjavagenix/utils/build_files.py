@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+构建文件原文处理工具
+在 pom.xml 原文中定位元素（供只修改局部文本、保留其余格式的场景使用），以及原子地写回构建文件
+"""
+
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Tuple, Union
+
+
+# XML记号：注释、CDATA、处理指令、DOCTYPE、结束标签、开始标签（可自闭合）
+_XML_TOKEN_RE = re.compile(
+    r'<!--.*?-->|<!\[CDATA\[.*?\]\]>|<\?.*?\?>|<!DOCTYPE(?:[^\[>]|\[.*?\])*>'
+    r'|</(?P<end>[^\s>]+)\s*>'
+    r'|<(?P<start>[^\s/>!?]+)(?:\s+[^\s=/>]+\s*=\s*(?:"[^"]*"|\'[^\']*\'))*\s*(?P<empty>/?)>',
+    re.DOTALL
+)
+
+
+class ElementLocation(NamedTuple):
+    """元素在原文中的位置（均为字符偏移）"""
+    name: str                              # 原文中的标签名（含命名空间前缀）
+    start_tag: Tuple[int, int]             # 开始标签的 (起, 止)
+    end_tag: Optional[Tuple[int, int]]     # 结束标签的 (起, 止)，自闭合标签为None
+    text_end: int                          # 开始标签之后第一个记号的位置，原文[start_tag[1]:text_end]即元素的text
+
+
+def locate_elements(content: str) -> List[ElementLocation]:
+    """
+    按文档顺序返回原文中所有元素的位置
+
+    顺序与 lxml 的 root.iter(etree.Element) 一致，可按序号对应到解析得到的元素；
+    注释、CDATA 中的标签不会被当成元素。只用于已确认格式正确的文档。
+    """
+    locations: List[ElementLocation] = []
+    stack: List[int] = []  # 尚未关闭的元素在 locations 中的序号
+    pending = None         # 等待确定 text_end 的元素序号
+    for match in _XML_TOKEN_RE.finditer(content):
+        if pending is not None:
+            locations[pending] = locations[pending]._replace(text_end=match.start())
+            pending = None
+
+        start = match.group('start')
+        if start is not None:
+            tag_span = (match.start(), match.end())
+            if match.group('empty'):
+                locations.append(ElementLocation(start, tag_span, None, match.end()))
+            else:
+                stack.append(len(locations))
+                pending = len(locations)
+                locations.append(ElementLocation(start, tag_span, None, match.end()))
+        elif match.group('end') is not None and stack:
+            index = stack.pop()
+            locations[index] = locations[index]._replace(end_tag=(match.start(), match.end()))
+    return locations
+
+
+def write_text_atomic(file_path: Union[str, Path], content: str) -> None:
+    """
+    原子地写入文本文件：一次编码后写入同目录下的唯一临时文件，再 os.replace 替换
+
+    中途失败不会留下半截文件；替换会生成新的inode，原文件的硬链接备份因此保持不变。
+    文件是符号链接时写入链接指向的真实文件，链接本身保持不变。
+    """
+    # 与文本模式写入一致：按平台换行符输出
+    if os.linesep != '\n':
+        content = content.replace('\n', os.linesep)
+    data = content.encode('utf-8')
+
+    target = os.path.realpath(file_path)
+    # 临时文件名唯一，并发写入同一目录时互不干扰
+    fd, tmp_file = tempfile.mkstemp(prefix=os.path.basename(target) + '.', suffix='.tmp',
+                                    dir=os.path.dirname(target))
+    try:
+        with open(fd, 'wb') as f:
+            f.write(data)
+        if os.path.exists(target):
+            shutil.copymode(target, tmp_file)
+        os.replace(tmp_file, target)
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.unlink(tmp_file)
+        raise
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+dataclass 的 __slots__ 支持
+Python 3.10 起可用 dataclass(slots=True)，项目仍支持3.9，因此统一使用 with_slots
+"""
+
+from dataclasses import fields
+
+
+def _frozen_getstate(self):
+    return [getattr(self, f.name) for f in fields(self)]
+
+
+def _frozen_setstate(self, state):
+    # frozen 的 __setattr__ 会拒绝 copy/pickle 按slot逐个回填
+    for f, value in zip(fields(self), state):
+        object.__setattr__(self, f.name, value)
+
+
+def with_slots(cls):
+    """
+    为dataclass补充__slots__，去掉实例__dict__（等价于3.10+的 dataclass(slots=True)）
+
+    用法为 @with_slots 放在 @dataclass 之上。与 dataclass(slots=True) 一样会重新创建类，
+    因此类体中不能使用无参数的 super() 或 __class__（它们仍指向重建前的类）。
+    """
+    field_names = tuple(f.name for f in fields(cls))
+    cls_dict = dict(cls.__dict__)
+    cls_dict['__slots__'] = field_names
+    # 默认值已保存在生成的__init__中，类属性会与同名slot冲突
+    for name in field_names:
+        cls_dict.pop(name, None)
+    cls_dict.pop('__dict__', None)
+    cls_dict.pop('__weakref__', None)
+    if cls.__dataclass_params__.frozen:
+        cls_dict.setdefault('__getstate__', _frozen_getstate)
+        cls_dict.setdefault('__setstate__', _frozen_setstate)
+    slotted = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    slotted.__qualname__ = cls.__qualname__
+    return slotted
@@ -6,15 +6,91 @@
 统一管理依赖检查、分析、自动添加和修复功能
 """
 
-from typing import Dict, List, Optional, Any
+import copy
+import os
+import re
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Any, Tuple
 from pathlib import Path
 import xml.etree.ElementTree as ET
 
+# 优先使用 lxml 按元素修复过时依赖，未安装时回退到正则替换
+try:
+    from lxml import etree as _lxml_etree
+except ImportError:
+    _lxml_etree = None
+
 # 移除对dependency_checker的引用，因为我们已经删除了这个文件
 # from .dependency_checker import JavaDependencyChecker
-from .pom_analyzer import PomAnalyzer
+from .pom_analyzer import PomAnalyzer, ExistingDependency
 from .auto_dependency_manager import AutoDependencyManager
 from .dependency_requirements import DependencyRequirements
+from .build_files import locate_elements, write_text_atomic
+
+
+# 过时依赖映射 (只读)
+_DEPRECATED_MAPPINGS: Mapping[str, str] = MappingProxyType({
+    "javax.annotation:javax.annotation-api": "jakarta.annotation:jakarta.annotation-api",
+    "javax.validation:validation-api": "jakarta.validation:jakarta.validation-api",
+    "io.swagger:swagger-annotations": "org.springdoc:springdoc-openapi-starter-webmvc-ui"
+})
+# 预先拆分的映射: ((旧groupId, 旧artifactId), (新groupId, 新artifactId))
+_DEPRECATED_SPLIT: Tuple[Tuple[Tuple[str, str], Tuple[str, str]], ...] = tuple(
+    (tuple(old_dep.split(":")), tuple(new_dep.split(":")))
+    for old_dep, new_dep in _DEPRECATED_MAPPINGS.items()
+)
+# 旧 (groupId, artifactId) -> 新 (groupId, artifactId)
+_DEPRECATED_PAIRS: Mapping[Tuple[str, str], Tuple[str, str]] = MappingProxyType(dict(_DEPRECATED_SPLIT))
+# 按groupId整体过时的依赖 (javax到jakarta、Swagger 2.x到OpenAPI 3.0的迁移)
+_DEPRECATED_BY_GROUP: Mapping[str, str] = MappingProxyType({
+    "javax.annotation": "jakarta.annotation:jakarta.annotation-api",
+    "javax.validation": "jakarta.validation:jakarta.validation-api",
+    "io.swagger": "org.springdoc:springdoc-openapi-starter-webmvc-ui"
+})
+
+
+def _build_fix_patterns():
+    """
+    根据过时依赖映射预编译Maven/Gradle的替换规则
+    
+    所有映射合并为一个分支正则，每个映射对应一个捕获组，
+    替换时按 lastindex 取对应的新依赖，整个文件只扫描一遍。
+    """
+    maven_alternatives = []
+    maven_replacements = []
+    gradle_alternatives = []
+    gradle_replacements = []
+    for (old_group, old_artifact), (new_group, new_artifact) in _DEPRECATED_SPLIT:
+        maven_alternatives.append(
+            rf'(<groupId>{re.escape(old_group)}</groupId>\s*<artifactId>{re.escape(old_artifact)}</artifactId>)'
+        )
+        maven_replacements.append(
+            f'<groupId>{new_group}</groupId>\n            <artifactId>{new_artifact}</artifactId>'
+        )
+        gradle_alternatives.append(rf'({re.escape(old_group)}:{re.escape(old_artifact)})')
+        gradle_replacements.append(f'{new_group}:{new_artifact}')
+    
+    maven_re = re.compile('|'.join(maven_alternatives), re.MULTILINE)
+    # 第1组为引号，保留原引号以免与结尾引号不匹配
+    gradle_re = re.compile(rf"(['\"])(?:{'|'.join(gradle_alternatives)}):")
+    return maven_re, tuple(maven_replacements), gradle_re, tuple(gradle_replacements)
+
+
+# 预编译的过时依赖替换规则：分支正则及按捕获组顺序排列的替换内容
+_MAVEN_FIX_RE, _MAVEN_FIX_REPLACEMENTS, _GRADLE_FIX_RE, _GRADLE_FIX_REPLACEMENTS = _build_fix_patterns()
+
+
+def _file_stamp(stat: os.stat_result) -> Tuple[int, int, int]:
+    """
+    文件状态标识：(修改时间, 大小, inode)
+    
+    构建文件通过临时文件 + os.replace 原子替换，新文件可能与旧文件落在同一个时间戳粒度内，
+    只比较修改时间会把替换后的文件误判为未变化。
+    """
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
 
 
 class DependencyManager:
@@ -26,6 +102,11 @@ class DependencyManager:
         self.analyzer = PomAnalyzer()
         self.auto_manager = AutoDependencyManager()
         self.requirements = DependencyRequirements()
+        # 构建文件解析结果缓存: (路径, 构建工具) -> (文件状态, 依赖列表)，文件变化后自动失效
+        self._parse_cache: Dict[Tuple[str, str], Tuple[Tuple[int, int, int], List[ExistingDependency]]] = {}
+        # check_and_fix_dependencies 结果缓存，键包含构建文件状态
+        self._run_cache: Dict[tuple, Dict[str, Any]] = {}
+        self._run_cache_lock = threading.Lock()
     
     def check_and_fix_dependencies(self, project_root: str, template_category: str, 
                                  database_type: str, **kwargs) -> Dict[str, Any]:
@@ -40,7 +121,32 @@ class DependencyManager:
             
         Returns:
             检查和修复结果
+        
+        构建文件未变化时直接返回上次结果的副本，不再重复分析和修复
         """
+        try:
+            key = (project_root, template_category, database_type,
+                   tuple(sorted(kwargs.items())), self._build_file_stamp(Path(project_root)))
+            hash(key)
+        except TypeError:
+            # 参数不可哈希时不使用缓存
+            return self._check_and_fix_dependencies(project_root, template_category, database_type, **kwargs)
+        
+        with self._run_cache_lock:
+            cached = self._run_cache.get(key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        
+        result = self._check_and_fix_dependencies(project_root, template_category, database_type, **kwargs)
+        # 本次运行修改了构建文件时，旧的修改时间不会再出现，无需缓存
+        if self._build_file_stamp(Path(project_root)) == key[-1]:
+            with self._run_cache_lock:
+                self._run_cache[key] = copy.deepcopy(result)
+        return result
+    
+    def _check_and_fix_dependencies(self, project_root: str, template_category: str,
+                                    database_type: str, **kwargs) -> Dict[str, Any]:
+        """检查并自动修复项目依赖（不使用缓存）"""
         project_path = Path(project_root)
         
         # 1. 分析项目依赖状况
@@ -55,53 +161,33 @@ class DependencyManager:
         
         # 2. 检查用户现有依赖
         build_tool = analysis_result["build_tool"]
-        detected_deps = {}
-        pom_content = None
-        gradle_content = None
+        existing_deps = []
+        # 构建文件内容只在需要修复时才读取
+        build_file = None
         
         if build_tool == "maven":
             pom_file = project_path / "pom.xml"
             if pom_file.exists():
-                with open(pom_file, 'r', encoding='utf-8') as f:
-                    pom_content = f.read()
+                build_file = pom_file
                 # 使用pom_analyzer来检测现有依赖
-                existing_deps = self.analyzer._parse_pom_file(pom_file)
-                # 转换为字典格式
-                for dep in existing_deps:
-                    key = f"{dep.group_id}:{dep.artifact_id}"
-                    detected_deps[key] = {
-                        "group_id": dep.group_id,
-                        "artifact_id": dep.artifact_id,
-                        "version": dep.version or "未指定",
-                        "scope": dep.scope
-                    }
+                existing_deps = self._cached_parse(pom_file, "maven")
             else:
-                detected_deps = {}
+                existing_deps = []
         elif build_tool == "gradle":
             gradle_file = project_path / "build.gradle"
             if not gradle_file.exists():
                 gradle_file = project_path / "build.gradle.kts"
             if gradle_file.exists():
-                with open(gradle_file, 'r', encoding='utf-8') as f:
-                    gradle_content = f.read()
+                build_file = gradle_file
                 # 使用pom_analyzer来检测现有依赖
-                existing_deps = self.analyzer._parse_gradle_file(gradle_file)
-                # 转换为字典格式
-                for dep in existing_deps:
-                    key = f"{dep.group_id}:{dep.artifact_id}"
-                    detected_deps[key] = {
-                        "group_id": dep.group_id,
-                        "artifact_id": dep.artifact_id,
-                        "version": dep.version or "未指定",
-                        "scope": dep.scope
-                    }
+                existing_deps = self._cached_parse(gradle_file, "gradle")
             else:
-                detected_deps = {}
+                existing_deps = []
         else:
-            detected_deps = {}
+            existing_deps = []
         
         # 3. 验证用户依赖是否合适
-        validation_result = self._validate_user_dependencies(detected_deps)
+        validation_result = self._validate_user_dependencies(existing_deps)
         
         # 4. 自动添加缺失的依赖
         auto_add_result = self.analyzer.auto_add_missing_dependencies(
@@ -111,17 +197,13 @@ class DependencyManager:
         
         # 5. 自动修复过时依赖
         fix_result = {"success": True, "message": "无过时依赖需要修复"}
-        if validation_result["deprecated"]:
-            if build_tool == "maven" and pom_content:
-                fix_result = self._auto_fix_deprecated_dependencies(
-                    project_root=project_root,
-                    pom_content=pom_content
-                )
-            elif build_tool == "gradle" and gradle_content:
-                fix_result = self._auto_fix_deprecated_dependencies(
-                    project_root=project_root,
-                    gradle_content=gradle_content
-                )
+        if validation_result["deprecated"] and build_file is not None:
+            # 在自动添加之后读取，修复时不会覆盖刚添加的依赖
+            fix_result = self._auto_fix_deprecated_dependencies(
+                project_root=project_root,
+                build_tool=build_tool,
+                build_file=build_file
+            )
         
         return {
             "analysis_result": analysis_result,
@@ -156,11 +238,12 @@ class DependencyManager:
         # 从分析结果中提取健康信息
         comparison_results = analysis_result["comparison_results"]
         
-        # 统计信息
+        # 统计信息（一次遍历按状态计数）
         total_requirements = len(comparison_results)
-        missing_count = len([c for c in comparison_results if c.status == "missing"])
-        outdated_count = len([c for c in comparison_results if c.status == "outdated"])
-        deprecated_count = len([c for c in comparison_results if c.status == "deprecated"])
+        status_counts = Counter(c.status for c in comparison_results)
+        missing_count = status_counts["missing"]
+        outdated_count = status_counts["outdated"]
+        deprecated_count = status_counts["deprecated"]
         exists_count = total_requirements - missing_count - outdated_count - deprecated_count
         
         # 计算健康分数
@@ -201,6 +284,22 @@ class DependencyManager:
         
         return report
     
+    def analyze_many(self, project_roots: List[str]) -> List[Dict[str, Any]]:
+        """
+        并发生成多个项目（如多模块项目的各模块）的依赖健康报告
+        
+        Args:
+            project_roots: 项目根目录列表
+            
+        Returns:
+            与 project_roots 顺序一致的依赖健康报告列表
+        """
+        if not project_roots:
+            return []
+        max_workers = min(8, os.cpu_count() or 1, len(project_roots))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.get_dependency_health_report, project_roots))
+    
     def generate_migration_guide(self, project_root: str) -> Dict[str, Any]:
         """
         生成依赖迁移指南
@@ -221,20 +320,11 @@ class DependencyManager:
             }
         
         # 获取现有依赖
-        detected_deps = {}
+        existing_deps = []
         if build_tool == "maven":
             pom_file = project_path / "pom.xml"
             if pom_file.exists():
-                existing_deps = self.analyzer._parse_pom_file(pom_file)
-                # 转换为字典格式
-                for dep in existing_deps:
-                    key = f"{dep.group_id}:{dep.artifact_id}"
-                    detected_deps[key] = {
-                        "group_id": dep.group_id,
-                        "artifact_id": dep.artifact_id,
-                        "version": dep.version or "未指定",
-                        "scope": dep.scope
-                    }
+                existing_deps = self._cached_parse(pom_file, "maven")
             else:
                 return {
                     "success": False,
@@ -245,16 +335,7 @@ class DependencyManager:
             if not gradle_file.exists():
                 gradle_file = project_path / "build.gradle.kts"
             if gradle_file.exists():
-                existing_deps = self.analyzer._parse_gradle_file(gradle_file)
-                # 转换为字典格式
-                for dep in existing_deps:
-                    key = f"{dep.group_id}:{dep.artifact_id}"
-                    detected_deps[key] = {
-                        "group_id": dep.group_id,
-                        "artifact_id": dep.artifact_id,
-                        "version": dep.version or "未指定",
-                        "scope": dep.scope
-                    }
+                existing_deps = self._cached_parse(gradle_file, "gradle")
             else:
                 return {
                     "success": False,
@@ -267,7 +348,7 @@ class DependencyManager:
             }
         
         # 验证依赖并生成迁移建议
-        validation_result = self._validate_user_dependencies(detected_deps)
+        validation_result = self._validate_user_dependencies(existing_deps)
         migration_suggestions = validation_result["deprecated"]
         
         return {
@@ -277,6 +358,32 @@ class DependencyManager:
             "total_suggestions": len(migration_suggestions)
         }
     
+    def _build_file_stamp(self, project_path: Path) -> Optional[Tuple[int, int, int]]:
+        """返回项目构建文件的(修改时间, 大小, inode)，没有构建文件时返回None"""
+        for name in ("pom.xml", "build.gradle", "build.gradle.kts"):
+            try:
+                return _file_stamp((project_path / name).stat())
+            except OSError:
+                continue
+        return None
+    
+    def _cached_parse(self, build_file: Path, build_tool: str) -> List[ExistingDependency]:
+        """解析构建文件中的现有依赖，按 (路径, 文件状态) 缓存"""
+        key = (str(build_file), build_tool)
+        stamp = _file_stamp(build_file.stat())
+        cached = self._parse_cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        
+        if build_tool == "maven":
+            existing_deps = self.analyzer._parse_pom_file(build_file)
+        else:
+            existing_deps = self.analyzer._parse_gradle_file(build_file)
+        
+        # 坐标字符串已由 PomAnalyzer 解析时驻留，缓存长期保留也不会产生大量重复字符串
+        self._parse_cache[key] = (stamp, existing_deps)
+        return existing_deps
+    
     def _detect_build_tool(self, project_root: Path) -> Optional[str]:
         """检测构建工具类型"""
         if (project_root / "pom.xml").exists():
@@ -285,12 +392,14 @@ class DependencyManager:
             return "gradle"
         return None
     
-    def _validate_user_dependencies(self, detected_deps: Dict[str, Dict[str, str]]) -> Dict[str, List[str]]:
+    def _validate_user_dependencies(self, existing_deps: Iterable[ExistingDependency]) -> Dict[str, List[str]]:
         """
         验证用户已定义的依赖是否合适
         
+        直接遍历解析结果，同一 groupId:artifactId 只按第一次声明检查一次
+        
         Args:
-            detected_deps: 用户已定义的依赖
+            existing_deps: 用户已定义的依赖
             
         Returns:
             验证结果，包括过时依赖、版本不兼容等警告
@@ -302,61 +411,43 @@ class DependencyManager:
             "suggestions": []      # 建议
         }
         
-        # 过时依赖映射
-        DEPRECATED_MAPPINGS = {
-            "javax.annotation:javax.annotation-api": "jakarta.annotation:jakarta.annotation-api",
-            "javax.validation:validation-api": "jakarta.validation:jakarta.validation-api",
-            "io.swagger:swagger-annotations": "org.springdoc:springdoc-openapi-starter-webmvc-ui"
-        }
-        
-        for key, dep in detected_deps.items():
-            # 检查是否为过时依赖
-            if key in DEPRECATED_MAPPINGS:
-                validation_results["deprecated"].append({
-                    "dependency": f"{dep['group_id']}:{dep['artifact_id']}:{dep['version']}",
-                    "recommendation": f"建议迁移到 {DEPRECATED_MAPPINGS[key]}"
-                })
-            
-            # 检查javax到jakarta的迁移问题
-            if "javax.annotation" in key:
-                validation_results["deprecated"].append({
-                    "dependency": f"{dep['group_id']}:{dep['artifact_id']}:{dep['version']}",
-                    "recommendation": "建议迁移到 jakarta.annotation:jakarta.annotation-api"
-                })
+        seen = set()
+        for dep in existing_deps:
+            key = f"{dep.group_id}:{dep.artifact_id}"
+            if key in seen:
+                continue
+            seen.add(key)
             
-            if "javax.validation" in key:
+            # 检查是否为过时依赖：先精确匹配依赖，再按groupId匹配，每个依赖最多报告一次
+            replacement = _DEPRECATED_MAPPINGS.get(key) or _DEPRECATED_BY_GROUP.get(dep.group_id)
+            if replacement:
                 validation_results["deprecated"].append({
-                    "dependency": f"{dep['group_id']}:{dep['artifact_id']}:{dep['version']}",
-                    "recommendation": "建议迁移到 jakarta.validation:jakarta.validation-api"
-                })
-            
-            # 检查Swagger 2.x到OpenAPI 3.0的迁移
-            if "io.swagger" in key:
-                validation_results["deprecated"].append({
-                    "dependency": f"{dep['group_id']}:{dep['artifact_id']}:{dep['version']}",
-                    "recommendation": "建议迁移到 org.springdoc:springdoc-openapi-starter-webmvc-ui"
+                    "dependency": f"{key}:{dep.version or '未指定'}",
+                    "recommendation": f"建议迁移到 {replacement}"
                 })
         
         return validation_results
     
-    def _auto_fix_deprecated_dependencies(self, project_root: str, pom_content: str = None, 
-                                       gradle_content: str = None) -> Dict[str, any]:
+    def _auto_fix_deprecated_dependencies(self, project_root: str, build_tool: str,
+                                          build_file: Path) -> Dict[str, any]:
         """
         自动修复过时依赖
         
         Args:
             project_root: 项目路径
-            pom_content: pom.xml内容
-            gradle_content: build.gradle内容
+            build_tool: 构建工具类型
+            build_file: 构建文件路径，修复时才读取内容
             
         Returns:
             修复结果
         """
         try:
-            if pom_content:
-                return self._fix_maven_deprecated_deps(project_root, pom_content)
-            elif gradle_content:
-                return self._fix_gradle_deprecated_deps(project_root, gradle_content)
+            content = build_file.read_text(encoding='utf-8')
+            
+            if content and build_tool == "maven":
+                return self._fix_maven_deprecated_deps(project_root, content)
+            elif content and build_tool == "gradle":
+                return self._fix_gradle_deprecated_deps(project_root, content)
             else:
                 return {
                     "success": False,
@@ -370,96 +461,108 @@ class DependencyManager:
     
     def _fix_maven_deprecated_deps(self, project_root: str, pom_content: str) -> Dict[str, any]:
         """修复Maven过时依赖"""
-        updated_content = pom_content
-        
-        # 过时依赖映射
-        DEPRECATED_MAPPINGS = {
-            "javax.annotation:javax.annotation-api": "jakarta.annotation:jakarta.annotation-api",
-            "javax.validation:validation-api": "jakarta.validation:jakarta.validation-api",
-            "io.swagger:swagger-annotations": "org.springdoc:springdoc-openapi-starter-webmvc-ui"
-        }
-        
-        # 替换过时依赖
-        for old_dep, new_dep in DEPRECATED_MAPPINGS.items():
-            old_group, old_artifact = old_dep.split(":")
-            new_group, new_artifact = new_dep.split(":")
-            
-            # 查找并替换groupId和artifactId
-            updated_content = re.sub(
-                f'<groupId>{re.escape(old_group)}</groupId>\s*<artifactId>{re.escape(old_artifact)}</artifactId>',
-                f'<groupId>{new_group}</groupId>\n            <artifactId>{new_artifact}</artifactId>',
-                updated_content,
-                flags=re.MULTILINE
+        # 替换过时依赖（javax到jakarta的迁移已包含在映射中）
+        fixed = self._fix_maven_deprecated_deps_lxml(pom_content) if _lxml_etree is not None else None
+        if fixed is not None:
+            updated_content, count = fixed
+        else:
+            updated_content, count = _MAVEN_FIX_RE.subn(
+                lambda m: _MAVEN_FIX_REPLACEMENTS[m.lastindex - 1], pom_content
             )
         
-        # 特殊处理javax到jakarta的迁移
-        updated_content = re.sub(
-            r'<groupId>javax\.annotation</groupId>\s*<artifactId>javax\.annotation-api</artifactId>',
-            '<groupId>jakarta.annotation</groupId>\n            <artifactId>jakarta.annotation-api</artifactId>',
-            updated_content,
-            flags=re.MULTILINE
-        )
-        
-        updated_content = re.sub(
-            r'<groupId>javax\.validation</groupId>\s*<artifactId>validation-api</artifactId>',
-            '<groupId>jakarta.validation</groupId>\n            <artifactId>jakarta.validation-api</artifactId>',
-            updated_content,
-            flags=re.MULTILINE
-        )
+        # 没有任何替换时不写回，避免触发IDE/构建工具的缓存失效
+        if count == 0:
+            return {
+                "success": True,
+                "message": "无需修复"
+            }
         
         # 写回文件
         pom_file = Path(project_root) / "pom.xml"
-        with open(pom_file, 'w', encoding='utf-8') as f:
-            f.write(updated_content)
+        write_text_atomic(pom_file, updated_content)
         
         return {
             "success": True,
             "message": "成功修复过时依赖"
         }
     
-    def _fix_gradle_deprecated_deps(self, project_root: str, gradle_content: str) -> Dict[str, any]:
-        """修复Gradle过时依赖"""
-        updated_content = gradle_content
+    def _fix_maven_deprecated_deps_lxml(self, pom_content: str) -> Optional[Tuple[str, int]]:
+        """
+        使用 lxml 一次遍历所有 <dependency> 元素，找出需要修复的过时依赖坐标
         
-        # 过时依赖映射
-        DEPRECATED_MAPPINGS = {
-            "javax.annotation:javax.annotation-api": "jakarta.annotation:jakarta.annotation-api",
-            "javax.validation:validation-api": "jakarta.validation:jakarta.validation-api",
-            "io.swagger:swagger-annotations": "org.springdoc:springdoc-openapi-starter-webmvc-ui"
-        }
+        lxml 只负责按元素判断，修改直接作用于原文中 groupId/artifactId 的文本片段，
+        其余内容（标签布局、引号、注释、实体等）一字不改。
         
-        # 替换过时依赖
-        for old_dep, new_dep in DEPRECATED_MAPPINGS.items():
-            old_group, old_artifact = old_dep.split(":")
-            new_group, new_artifact = new_dep.split(":")
-            
-            # 查找并替换依赖声明
-            updated_content = re.sub(
-                f"['\"]{re.escape(old_group)}:{re.escape(old_artifact)}:",
-                f"'{new_group}:{new_artifact}:",
-                updated_content
+        Returns:
+            (修复后的内容, 替换数量)，POM无法解析或无法定位文本时返回None
+        """
+        parser = _lxml_etree.XMLParser(remove_blank_text=False, resolve_entities=False, strip_cdata=False)
+        try:
+            root = _lxml_etree.fromstring(pom_content.encode('utf-8'), parser)
+        except _lxml_etree.XMLSyntaxError:
+            return None
+        
+        # 按文档顺序逐个判断，记录需要替换的坐标元素
+        replacements = []
+        for dep in root.iter('{*}dependency'):
+            group_elem = dep.find('{*}groupId')
+            artifact_elem = dep.find('{*}artifactId')
+            if group_elem is None or artifact_elem is None:
+                continue
+            replacement = _DEPRECATED_PAIRS.get(
+                ((group_elem.text or '').strip(), (artifact_elem.text or '').strip())
             )
-        
-        # 特殊处理javax到jakarta的迁移
-        updated_content = re.sub(
-            r"['\"]javax\.annotation:javax\.annotation-api:",
-            "'jakarta.annotation:jakarta.annotation-api:",
-            updated_content
+            if replacement:
+                replacements.append((replacement, (group_elem, artifact_elem)))
+        
+        if not replacements:
+            return pom_content, 0
+        
+        # 原文中的元素与 lxml 元素按文档顺序一一对应
+        locations = locate_elements(pom_content)
+        element_index = {elem: index for index, elem in enumerate(root.iter(_lxml_etree.Element))}
+        if len(locations) != len(element_index):
+            return None
+        edits = []
+        for new_coords, elems in replacements:
+            for elem, new_text in zip(elems, new_coords):
+                location = locations[element_index[elem]]
+                start, end = location.start_tag[1], location.text_end
+                # 原文片段必须与 lxml 解析出的文本一致（含实体或CDATA时交给正则处理）
+                if pom_content[start:end] != elem.text:
+                    return None
+                edits.append(((start, end), new_text))
+        
+        # 从后往前拼接，只替换坐标文本
+        parts = []
+        last = len(pom_content)
+        for (start, end), text in sorted(edits, reverse=True):
+            parts.append(pom_content[end:last])
+            parts.append(text)
+            last = start
+        parts.append(pom_content[:last])
+        return "".join(reversed(parts)), len(replacements)
+    
+    def _fix_gradle_deprecated_deps(self, project_root: str, gradle_content: str) -> Dict[str, any]:
+        """修复Gradle过时依赖"""
+        # 替换过时依赖声明（javax到jakarta的迁移已包含在映射中）
+        updated_content, count = _GRADLE_FIX_RE.subn(
+            lambda m: f"{m.group(1)}{_GRADLE_FIX_REPLACEMENTS[m.lastindex - 2]}:", gradle_content
         )
         
-        updated_content = re.sub(
-            r"['\"]javax\.validation:validation-api:",
-            "'jakarta.validation:jakarta.validation-api:",
-            updated_content
-        )
+        # 没有任何替换时不写回
+        if count == 0:
+            return {
+                "success": True,
+                "message": "无需修复"
+            }
         
         # 写回文件
         gradle_file = Path(project_root) / "build.gradle"
         if not gradle_file.exists():
             gradle_file = Path(project_root) / "build.gradle.kts"
         
-        with open(gradle_file, 'w', encoding='utf-8') as f:
-            f.write(updated_content)
+        write_text_atomic(gradle_file, updated_content)
         
         return {
             "success": True,
@@ -6,10 +6,18 @@
 根据代码生成选项和模板类型，分析项目所需的依赖
 """
 
-from typing import Dict, List, Optional, Set, Tuple
-from dataclasses import dataclass
+import json
+import sys
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Set, Tuple
+from dataclasses import dataclass, field, replace
+from functools import cached_property, lru_cache
 from enum import Enum
 
+from .dataclass_slots import with_slots
+
 
 class DependencyStatus(Enum):
     REQUIRED = "required"          # 必需依赖
@@ -18,9 +26,10 @@ class DependencyStatus(Enum):
     RECOMMENDED = "recommended"    # 推荐依赖
 
 
-@dataclass
+@with_slots
+@dataclass(frozen=True)
 class DependencyInfo:
-    """依赖信息"""
+    """依赖信息（不可变，目录中的实例可在实例/线程间安全共享）"""
     group_id: str
     artifact_id: str
     version: str
@@ -29,178 +38,282 @@ class DependencyInfo:
     description: str = ""
     migration_target: Optional['DependencyInfo'] = None  # 迁移目标
     reason: str = ""  # 需要此依赖的原因
+    # "group_id:artifact_id:version" 坐标，构造时预先生成（replace 时会重新生成）
+    coord: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, "coord", f"{self.group_id}:{self.artifact_id}:{self.version}")
 
 
-class DependencyRequirements:
-    """依赖需求分析器"""
-    
-    def __init__(self):
-        self._initialize_dependency_catalog()
+# 依赖目录以 JSON 资源随包发布，首次使用时才加载并构建派生查找表
+_CATALOG_PATH = Path(__file__).with_name("dependency_catalog.json")
+
+
+def _load_category(entries: Dict[str, Dict[str, Any]]) -> Dict[str, DependencyInfo]:
+    """将一个分类的 JSON 条目构建为 DependencyInfo 字典并连接迁移目标"""
+    intern = sys.intern
+    # 坐标字符串统一驻留，各 DependencyInfo 共享同一对象
+    deps = {
+        intern(key): DependencyInfo(
+            intern(entry["group_id"]),
+            intern(entry["artifact_id"]),
+            intern(entry["version"]),
+            scope=intern(entry["scope"]),
+            status=DependencyStatus(entry["status"]),
+            description=entry["description"],
+            reason=entry["reason"]
+        )
+        for key, entry in entries.items()
+    }
+    # 设置迁移关系（DependencyInfo 不可变，因此用 replace 生成带迁移目标的新实例）
+    for key, entry in entries.items():
+        target_key = entry.get("migration_target")
+        if target_key:
+            deps[key] = replace(deps[key], migration_target=deps[target_key])
+    return deps
+
+
+# Spring Boot版本兼容性信息：默认值对应最新版本（3.4/3.5），其余版本只覆盖差异字段
+_SB_DEFAULT = MappingProxyType({
+    "java_version": "17+",
+    "jakarta_ee": True,
+    "javax_ee": False,
+    "recommended_dependencies": MappingProxyType({}),
+    "mybatis_version": "3.5.16",
+    "mybatis_plus_version": "3.5.7",
+    "mysql_connector_version": "8.4.0"
+})
+
+
+def _sb_compat(**overrides) -> Mapping[str, Any]:
+    """基于默认兼容信息生成只读的版本兼容信息"""
+    return MappingProxyType({**_SB_DEFAULT, **overrides})
+
+
+_SB_2_COMPAT = _sb_compat(
+    java_version="8+",
+    jakarta_ee=False,
+    javax_ee=True,
+    mybatis_version="3.4.6",  # 兼容Spring Boot 2.x
+    mybatis_plus_version="3.4.3",
+    mysql_connector_version="8.0.33"
+)
+_SB_3_0_COMPAT = _sb_compat(
+    mybatis_version="3.5.10",
+    mybatis_plus_version="3.5.3",
+    mysql_connector_version="8.3.0"
+)
+_SB_3_2_COMPAT = _sb_compat(
+    mybatis_version="3.5.14",
+    mybatis_plus_version="3.5.5",
+    mysql_connector_version="8.3.0"
+)
+
+# 按版本前缀（"2." 或 "3.x"）索引的兼容信息表
+_SB_COMPAT = MappingProxyType({
+    "2.": _SB_2_COMPAT,
+    "3.0": _SB_3_0_COMPAT,
+    "3.1": _SB_3_0_COMPAT,
+    "3.2": _SB_3_2_COMPAT,
+    "3.3": _SB_3_2_COMPAT,
+    # 最新版本，使用最新的兼容依赖
+    "3.4": _SB_DEFAULT,
+    "3.5": _SB_DEFAULT,
+})
+
+
+def _spring_boot_compatibility(version: str) -> Mapping[str, Any]:
+    """按版本前缀查表获取Spring Boot版本兼容性信息（只读）"""
+    key = version[:3] if version[:3] in _SB_COMPAT else version[:2]
+    return _SB_COMPAT.get(key, _SB_DEFAULT)
+
+
+class _CatalogSnapshot(NamedTuple):
+    """某个Spring Boot版本下的依赖目录快照"""
+    spring: Dict[str, DependencyInfo]
+    db: Dict[str, DependencyInfo]
+    mybatis: Dict[str, DependencyInfo]
+    tool: Dict[str, DependencyInfo]
+    mybatis_bundles: Mapping[str, Tuple[DependencyInfo, ...]]
+    required_by_db: Mapping[str, Tuple[DependencyInfo, ...]]
+
+
+def _mybatis_bundles(mybatis_deps: Dict[str, DependencyInfo]) -> Mapping[str, Tuple[DependencyInfo, ...]]:
+    """按模板类别预先组合MyBatis相关的必需依赖"""
+    # MyBatis-Plus - 已包含MyBatis核心，不需要单独的MyBatis依赖；
+    # 也不添加代码生成器相关依赖（mybatis-plus-generator, velocity-engine, freemarker），
+    # 因为我们本身就是代码生成器。各模板均不需要JPA
+    mybatis_plus = (mybatis_deps["mybatis-plus"],)
+    return MappingProxyType({
+        # 传统MyBatis - 需要核心MyBatis和Spring Boot集成
+        "Default": (mybatis_deps["mybatis"], mybatis_deps["mybatis-spring-boot"]),
+        "MybatisPlus": mybatis_plus,
+        "MybatisPlus-Mixed": mybatis_plus,
+    })
+
+
+def _migration_recommendation(dep: DependencyInfo) -> Mapping[str, Any]:
+    """为带迁移目标的过时依赖生成只读的迁移建议"""
+    target = dep.migration_target
+    return MappingProxyType({
+        "type": "migration",
+        "from": dep.coord,
+        "to": target.coord,
+        "reason": f"迁移原因: {dep.description} -> {target.description}",
+        "impact": "需要更新import语句",
+        "priority": "high" if "javax" in dep.group_id else "medium"
+    })
+
+
+class _Catalog:
+    """依赖目录及由其派生的全部查找表，由 _catalog() 在首次使用时构建一次"""
     
-    def _initialize_dependency_catalog(self):
-        """初始化依赖目录"""
+    def __init__(self, data: Dict[str, Any]):
+        self.spring = _load_category(data["spring_boot"])
+        self.db = _load_category(data["database"])
+        self.mybatis = _load_category(data["mybatis"])
+        self.tool = _load_category(data["tool"])
         
-        # Spring Boot 基础依赖 - 更新到最新稳定版本
-        self.SPRING_BOOT_DEPENDENCIES = {
-            # 核心依赖
-            "spring-boot-starter": DependencyInfo(
-                "org.springframework.boot", "spring-boot-starter", "3.5.5",
-                description="Spring Boot核心启动器",
-                reason="Spring Boot应用的基础依赖"
-            ),
-            "spring-boot-starter-web": DependencyInfo(
-                "org.springframework.boot", "spring-boot-starter-web", "3.5.5", 
-                description="Spring Boot Web启动器",
-                reason="构建Web应用和REST API"
-            ),
-            "spring-boot-starter-data-jpa": DependencyInfo(
-                "org.springframework.boot", "spring-boot-starter-data-jpa", "3.5.5",
-                description="Spring Data JPA启动器", 
-                reason="JPA数据访问支持"
-            ),
-            "spring-boot-starter-validation": DependencyInfo(
-                "org.springframework.boot", "spring-boot-starter-validation", "3.5.5",
-                description="Bean验证启动器",
-                reason="支持@Valid注解和参数验证"
-            )
-        }
+        # 合并后的扁平目录：按依赖键一次查找，无需知道其所在类别
+        self.all_deps = all_deps = {**self.spring, **self.db, **self.mybatis, **self.tool}
+        assert len(all_deps) == (len(self.spring) + len(self.db)
+                                 + len(self.mybatis) + len(self.tool)), "依赖目录键冲突"
         
-        # 数据库驱动依赖
-        self.DATABASE_DEPENDENCIES = {
-            "mysql": DependencyInfo(
-                "com.mysql", "mysql-connector-j", "8.4.0",
-                description="MySQL 8.0+ JDBC驱动",
-                reason="连接MySQL数据库"
-            ),
-            "mysql-legacy": DependencyInfo(
-                "mysql", "mysql-connector-java", "8.0.33",
-                status=DependencyStatus.DEPRECATED,
-                description="MySQL旧版JDBC驱动",
-                reason="连接MySQL数据库（已过时）"
-            ),
-            "postgresql": DependencyInfo(
-                "org.postgresql", "postgresql", "42.7.4",
-                description="PostgreSQL JDBC驱动",
-                reason="连接PostgreSQL数据库"
-            ),
-            "sqlite": DependencyInfo(
-                "org.xerial", "sqlite-jdbc", "3.46.1.3", 
-                description="SQLite JDBC驱动",
-                reason="连接SQLite数据库"
-            )
-        }
+        # 与版本无关、按生成选项整体加入的依赖组合
+        self.spring_boot_required = (
+            all_deps["spring-boot-starter"],
+            all_deps["spring-boot-starter-web"],
+            all_deps["spring-boot-starter-validation"],
+        )
+        self.lombok_optional = (all_deps["lombok"],)
+        self.mapstruct_optional = (all_deps["mapstruct"], all_deps["mapstruct-processor"])
+        self.swagger_recommended = (all_deps["springdoc-openapi"],)
+        self.swagger_deprecated = (all_deps["swagger-annotations-deprecated"],)
+        self.jakarta_recommended = (all_deps["jakarta-annotation"], all_deps["jakarta-validation"])
+        self.javax_deprecated = (all_deps["javax-annotation-deprecated"], all_deps["javax-validation-deprecated"])
         
-        # MyBatis相关依赖 - 更新版本并添加核心MyBatis依赖
-        self.MYBATIS_DEPENDENCIES = {
-            "mybatis": DependencyInfo(
-                "org.mybatis", "mybatis", "3.5.16",
-                description="MyBatis核心持久层框架",
-                reason="MyBatis ORM框架的核心依赖"
-            ),
-            "mybatis-spring-boot": DependencyInfo(
-                "org.mybatis.spring.boot", "mybatis-spring-boot-starter", "3.0.4",
-                description="MyBatis Spring Boot启动器",
-                reason="MyBatis集成Spring Boot支持"
-            ),
-            "mybatis-plus": DependencyInfo(
-                "com.baomidou", "mybatis-plus-spring-boot3-starter", "3.5.7",
-                description="MyBatis-Plus Spring Boot 3启动器", 
-                reason="MyBatis-Plus增强功能，包含MyBatis核心"
-            ),
-            "mybatis-plus-generator": DependencyInfo(
-                "com.baomidou", "mybatis-plus-generator", "3.5.7",
-                status=DependencyStatus.OPTIONAL,
-                description="MyBatis-Plus代码生成器",
-                reason="支持MyBatis-Plus代码生成"
-            ),
-            "velocity-engine": DependencyInfo(
-                "org.apache.velocity", "velocity-engine-core", "2.4.1",
-                status=DependencyStatus.OPTIONAL,
-                description="Velocity模板引擎",
-                reason="MyBatis-Plus代码生成器的模板引擎"
-            ),
-            "freemarker": DependencyInfo(
-                "org.freemarker", "freemarker", "2.3.33",
-                status=DependencyStatus.OPTIONAL,
-                description="FreeMarker模板引擎",
-                reason="MyBatis-Plus代码生成器的替代模板引擎"
-            )
-        }
+        # 数据库类型的常见写法 -> 目录键
+        self.db_alias = MappingProxyType({
+            **{spelling: key for key in self.db for spelling in (key, key.upper())},
+            "MySQL": "mysql",
+            "PostgreSQL": "postgresql",
+            "Postgres": "postgresql",
+            "postgres": "postgresql",
+            "SQLite": "sqlite",
+        })
         
-        # 工具依赖 - 更新版本到最新稳定版
-        self.TOOL_DEPENDENCIES = {
-            # Lombok
-            "lombok": DependencyInfo(
-                "org.projectlombok", "lombok", "1.18.36",
-                status=DependencyStatus.OPTIONAL,
-                description="Lombok代码生成工具",
-                reason="减少样板代码，支持@Data等注解"
-            ),
-            
-            # MapStruct
-            "mapstruct": DependencyInfo(
-                "org.mapstruct", "mapstruct", "1.6.3",
-                status=DependencyStatus.OPTIONAL,
-                description="MapStruct对象映射框架",
-                reason="自动生成对象映射代码"
-            ),
-            "mapstruct-processor": DependencyInfo(
-                "org.mapstruct", "mapstruct-processor", "1.6.3",
-                scope="provided",
-                status=DependencyStatus.OPTIONAL,
-                description="MapStruct注解处理器",
-                reason="编译时生成映射实现"
-            ),
-            
-            # Swagger/OpenAPI 3.0 (推荐)
-            "springdoc-openapi": DependencyInfo(
-                "org.springdoc", "springdoc-openapi-starter-webmvc-ui", "2.7.0",
-                status=DependencyStatus.RECOMMENDED,
-                description="SpringDoc OpenAPI 3.0支持",
-                reason="生成现代化的API文档"
-            ),
-            
-            # Swagger 2.x (已过时)
-            "swagger-annotations-deprecated": DependencyInfo(
-                "io.swagger", "swagger-annotations", "1.6.14",
-                status=DependencyStatus.DEPRECATED,
-                description="Swagger 2.x注解 (已过时)",
-                reason="Swagger API文档注解 (建议迁移到OpenAPI 3.0)"
-            ),
-            
-            # Jakarta EE 注解 (推荐)
-            "jakarta-annotation": DependencyInfo(
-                "jakarta.annotation", "jakarta.annotation-api", "2.1.1",
-                status=DependencyStatus.RECOMMENDED,
-                description="Jakarta EE注解API",
-                reason="现代化的Java EE注解支持"
-            ),
-            "jakarta-validation": DependencyInfo(
-                "jakarta.validation", "jakarta.validation-api", "3.0.2",
-                status=DependencyStatus.RECOMMENDED,
-                description="Jakarta Bean Validation API", 
-                reason="现代化的Bean验证支持"
-            ),
-            
-            # Javax 注解 (已过时)
-            "javax-annotation-deprecated": DependencyInfo(
-                "javax.annotation", "javax.annotation-api", "1.3.2",
-                status=DependencyStatus.DEPRECATED,
-                description="Javax注解API (已过时)",
-                reason="Java EE注解支持 (建议迁移到jakarta)"
-            ),
-            "javax-validation-deprecated": DependencyInfo(
-                "javax.validation", "validation-api", "2.0.1.Final",
-                status=DependencyStatus.DEPRECATED,
-                description="Javax Bean Validation API (已过时)",
-                reason="Bean验证支持 (建议迁移到jakarta)"
-            )
+        # 目录中过时依赖的迁移建议只生成一次；按对象 id 索引，
+        # 同时保存依赖对象本身，查找时校验身份以免误用他处对象的 id
+        self.migration_recs = {
+            id(dep): (dep, _migration_recommendation(dep))
+            for dep in all_deps.values()
+            if dep.status is DependencyStatus.DEPRECATED and dep.migration_target
         }
         
-        # 设置迁移关系
-        self.TOOL_DEPENDENCIES["javax-annotation-deprecated"].migration_target = self.TOOL_DEPENDENCIES["jakarta-annotation"]
-        self.TOOL_DEPENDENCIES["javax-validation-deprecated"].migration_target = self.TOOL_DEPENDENCIES["jakarta-validation"]
-        self.TOOL_DEPENDENCIES["swagger-annotations-deprecated"].migration_target = self.TOOL_DEPENDENCIES["springdoc-openapi"]
+        # 未指定版本时使用原始目录；已知版本前缀各预先构建一份快照；未知版本按默认兼容信息调整
+        self.default_snapshot = self._snapshot(self.db, self.mybatis)
+        self.snapshots_by_prefix = {prefix: self._build_snapshot(prefix) for prefix in _SB_COMPAT}
+        self.fallback_snapshot = self._build_snapshot("")
+    
+    def _snapshot(self, database_deps: Dict[str, DependencyInfo],
+                  mybatis_deps: Dict[str, DependencyInfo]) -> _CatalogSnapshot:
+        """组装目录快照及其预先组合的依赖元组"""
+        required = self.spring_boot_required
+        return _CatalogSnapshot(
+            self.spring, database_deps, mybatis_deps, self.tool,
+            _mybatis_bundles(mybatis_deps),
+            # 按数据库类型预先组合Spring Boot基础依赖与数据库驱动依赖
+            MappingProxyType({key: required + (dep,) for key, dep in database_deps.items()})
+        )
+    
+    def _build_snapshot(self, spring_boot_version: str) -> _CatalogSnapshot:
+        """按Spring Boot版本调整MyBatis与数据库驱动的版本，生成新的目录快照"""
+        compat = _spring_boot_compatibility(spring_boot_version)
+        
+        # 更新MyBatis依赖版本
+        mybatis_deps = dict(self.mybatis)
+        mybatis_deps["mybatis"] = replace(mybatis_deps["mybatis"], version=sys.intern(compat["mybatis_version"]))
+        # Spring Boot 2.x 使用 mybatis-plus-boot-starter；Boot 3.x 使用 mybatis-plus-spring-boot3-starter
+        if spring_boot_version.startswith("2."):
+            artifact_id = "mybatis-plus-boot-starter"
+        else:
+            artifact_id = "mybatis-plus-spring-boot3-starter"
+        mybatis_deps["mybatis-plus"] = replace(
+            mybatis_deps["mybatis-plus"],
+            artifact_id=sys.intern(artifact_id),
+            version=sys.intern(compat["mybatis_plus_version"])
+        )
+        
+        # 更新数据库驱动版本
+        if compat["mysql_connector_version"].startswith("8.4"):
+            # 使用新版MySQL Connector/J
+            group_id, artifact_id = "com.mysql", "mysql-connector-j"
+        else:
+            # 使用旧版MySQL Connector
+            group_id, artifact_id = "mysql", "mysql-connector-java"
+        database_deps = dict(self.db)
+        database_deps["mysql"] = replace(
+            database_deps["mysql"],
+            group_id=sys.intern(group_id),
+            artifact_id=sys.intern(artifact_id),
+            version=sys.intern(compat["mysql_connector_version"])
+        )
+        
+        return self._snapshot(database_deps, mybatis_deps)
+    
+    def snapshot_for(self, spring_boot_version: Optional[str]) -> _CatalogSnapshot:
+        """按版本前缀查找预先构建的目录快照"""
+        if not spring_boot_version:
+            return self.default_snapshot
+        snapshots = self.snapshots_by_prefix
+        return (snapshots.get(spring_boot_version[:3])
+                or snapshots.get(spring_boot_version[:2])
+                or self.fallback_snapshot)
+
+
+_catalog_instance: Optional[_Catalog] = None
+_catalog_lock = threading.Lock()
+
+
+def _catalog() -> _Catalog:
+    """首次调用时加载 JSON 依赖目录并构建查找表，之后始终返回同一对象"""
+    global _catalog_instance
+    catalog = _catalog_instance
+    if catalog is None:
+        with _catalog_lock:
+            catalog = _catalog_instance
+            if catalog is None:
+                catalog = _catalog_instance = _Catalog(json.loads(_CATALOG_PATH.read_bytes()))
+    return catalog
+
+
+def get_dep(name: str) -> DependencyInfo:
+    """按依赖键获取目录中的依赖信息（未按Spring Boot版本调整）"""
+    return _catalog().all_deps[name]
+
+
+class DependencyRequirements:
+    """依赖需求分析器"""
+    
+    # 目录只构建一次并在实例间共享；以下属性在首次访问时才绑定引用（不做复制），
+    # 因此实例化本身不会触发目录加载。adjust_versions_for_spring_boot 会在实例上
+    # 重新绑定调整后的字典
+    
+    @cached_property
+    def SPRING_BOOT_DEPENDENCIES(self) -> Dict[str, DependencyInfo]:
+        return _catalog().spring
+    
+    @cached_property
+    def DATABASE_DEPENDENCIES(self) -> Dict[str, DependencyInfo]:
+        return _catalog().db
+    
+    @cached_property
+    def MYBATIS_DEPENDENCIES(self) -> Dict[str, DependencyInfo]:
+        return _catalog().mybatis
+    
+    @cached_property
+    def TOOL_DEPENDENCIES(self) -> Dict[str, DependencyInfo]:
+        return _catalog().tool
     
     def analyze_requirements(self, 
                            template_category: str,
@@ -208,7 +321,7 @@ class DependencyRequirements:
                            include_swagger: bool = True,
                            include_lombok: bool = True, 
                            include_mapstruct: bool = True,
-                           spring_boot_version: Optional[str] = None) -> Dict[str, List[DependencyInfo]]:
+                           spring_boot_version: Optional[str] = None) -> Mapping[str, Tuple[DependencyInfo, ...]]:
         """
         分析代码生成需求的依赖 - 增强版本兼容性检查
         
@@ -221,175 +334,86 @@ class DependencyRequirements:
             spring_boot_version: Spring Boot版本
             
         Returns:
-            按类别分组的依赖需求字典
-        """
-        
-        # 根据Spring Boot版本调整依赖版本
-        if spring_boot_version:
-            self.adjust_versions_for_spring_boot(spring_boot_version)
-        
-        requirements = {
-            "required": [],      # 必需依赖
-            "optional": [],      # 可选依赖
-            "recommended": [],   # 推荐依赖
-            "deprecated": []     # 需要迁移的过时依赖
-        }
-        
-        # 1. Spring Boot基础依赖 (必需)
-        requirements["required"].extend([
-            self.SPRING_BOOT_DEPENDENCIES["spring-boot-starter"],
-            self.SPRING_BOOT_DEPENDENCIES["spring-boot-starter-web"],
-            self.SPRING_BOOT_DEPENDENCIES["spring-boot-starter-validation"]
-        ])
-        
-        # 2. 数据库驱动依赖 (必需)
-        db_key = database_type.lower()
-        if db_key in self.DATABASE_DEPENDENCIES:
-            requirements["required"].append(self.DATABASE_DEPENDENCIES[db_key])
-        
-        # 3. MyBatis相关依赖
-        if template_category == "Default":
-            # 传统MyBatis - 需要核心MyBatis和Spring Boot集成
-            requirements["required"].extend([
-                # JPA not required for MyBatis-based Default template
-                self.MYBATIS_DEPENDENCIES["mybatis"],
-                self.MYBATIS_DEPENDENCIES["mybatis-spring-boot"]
-            ])
-        elif template_category in ["MybatisPlus", "MybatisPlus-Mixed"]:
-            # MyBatis-Plus - 已包含MyBatis核心，不需要单独的MyBatis依赖
-            requirements["required"].extend([
-                # JPA not required for MyBatis-Plus templates
-                self.MYBATIS_DEPENDENCIES["mybatis-plus"]
-            ])
-            # 注意：不添加代码生成器相关依赖，因为我们本身就是代码生成器
-            # 不添加：mybatis-plus-generator, velocity-engine, freemarker
-            # 也不添加单独的 mybatis 核心包，MyBatis-Plus starter 已包含
-        
-        # 4. 工具依赖
-        if include_lombok:
-            requirements["optional"].append(self.TOOL_DEPENDENCIES["lombok"])
-        
-        if include_mapstruct:
-            requirements["optional"].extend([
-                self.TOOL_DEPENDENCIES["mapstruct"],
-                self.TOOL_DEPENDENCIES["mapstruct-processor"]
-            ])
-        
-        if include_swagger:
-            # 推荐现代化的OpenAPI 3.0
-            requirements["recommended"].append(self.TOOL_DEPENDENCIES["springdoc-openapi"])
-            # 标记过时的Swagger 2.x
-            requirements["deprecated"].append(self.TOOL_DEPENDENCIES["swagger-annotations-deprecated"])
-        
-        # 5. Jakarta EE迁移 (推荐)
-        requirements["recommended"].extend([
-            self.TOOL_DEPENDENCIES["jakarta-annotation"],
-            self.TOOL_DEPENDENCIES["jakarta-validation"]
-        ])
+            按类别分组的依赖需求只读映射，值为元组；结果按参数组合缓存并在调用间共享，
+            需要修改时请使用 dict(result) 及 list(result[category]) 复制
         
-        # 6. 标记过时的javax依赖
-        requirements["deprecated"].extend([
-            self.TOOL_DEPENDENCIES["javax-annotation-deprecated"],
-            self.TOOL_DEPENDENCIES["javax-validation-deprecated"]
-        ])
-        
-        return requirements
+        Note:
+            分析不再修改当前实例的依赖目录，版本调整只作用于返回结果。
+        """
+        return _analyze_requirements(
+            template_category, database_type, include_swagger,
+            include_lombok, include_mapstruct, spring_boot_version
+        )
     
-    def get_spring_boot_version_compatibility(self, version: str) -> Dict[str, str]:
-        """获取Spring Boot版本兼容性信息 - 增强版"""
-        compatibility = {
-            "java_version": "17+",
-            "jakarta_ee": True,
-            "javax_ee": False,
-            "recommended_dependencies": {},
-            "mybatis_version": "3.5.16",
-            "mybatis_plus_version": "3.5.7",
-            "mysql_connector_version": "8.4.0"
-        }
+    def get_spring_boot_version_compatibility(self, version: str) -> Mapping[str, Any]:
+        """获取Spring Boot版本兼容性信息 - 增强版
         
-        if version.startswith("2."):
-            compatibility.update({
-                "java_version": "8+", 
-                "jakarta_ee": False,
-                "javax_ee": True,
-                "mybatis_version": "3.4.6",  # 兼容Spring Boot 2.x
-                "mybatis_plus_version": "3.4.3",
-                "mysql_connector_version": "8.0.33"
-            })
-        elif version.startswith("3.0") or version.startswith("3.1"):
-            compatibility.update({
-                "java_version": "17+",
-                "jakarta_ee": True, 
-                "javax_ee": False,
-                "mybatis_version": "3.5.10",
-                "mybatis_plus_version": "3.5.3",
-                "mysql_connector_version": "8.3.0"
-            })
-        elif version.startswith("3.2") or version.startswith("3.3"):
-            compatibility.update({
-                "java_version": "17+",
-                "jakarta_ee": True, 
-                "javax_ee": False,
-                "mybatis_version": "3.5.14",
-                "mybatis_plus_version": "3.5.5",
-                "mysql_connector_version": "8.3.0"
-            })
-        elif version.startswith("3.4") or version.startswith("3.5"):
-            # 最新版本，使用最新的兼容依赖
-            compatibility.update({
-                "java_version": "17+",
-                "jakarta_ee": True, 
-                "javax_ee": False,
-                "mybatis_version": "3.5.16",
-                "mybatis_plus_version": "3.5.7",
-                "mysql_connector_version": "8.4.0"
-            })
-        
-        return compatibility
+        返回共享的只读映射，需要修改时请使用 dict(result) 复制。
+        """
+        return _spring_boot_compatibility(version)
     
     def adjust_versions_for_spring_boot(self, spring_boot_version: str) -> None:
-        """根据Spring Boot版本调整依赖版本"""
-        compat = self.get_spring_boot_version_compatibility(spring_boot_version)
+        """根据Spring Boot版本调整依赖版本
         
-        # 更新MyBatis依赖版本
-        if "mybatis" in self.MYBATIS_DEPENDENCIES:
-            self.MYBATIS_DEPENDENCIES["mybatis"].version = compat["mybatis_version"]
-        
-        if "mybatis-plus" in self.MYBATIS_DEPENDENCIES:
-            # 版本
-            self.MYBATIS_DEPENDENCIES["mybatis-plus"].version = compat["mybatis_plus_version"]
-            # Spring Boot 2.x 使用 mybatis-plus-boot-starter；Boot 3.x 使用 mybatis-plus-spring-boot3-starter
-            if spring_boot_version.startswith("2."):
-                self.MYBATIS_DEPENDENCIES["mybatis-plus"].artifact_id = "mybatis-plus-boot-starter"
-            else:
-                self.MYBATIS_DEPENDENCIES["mybatis-plus"].artifact_id = "mybatis-plus-spring-boot3-starter"
-        
-        # 更新数据库驱动版本
-        if "mysql" in self.DATABASE_DEPENDENCIES:
-            if compat["mysql_connector_version"].startswith("8.4"):
-                # 使用新版MySQL Connector/J
-                self.DATABASE_DEPENDENCIES["mysql"].group_id = "com.mysql"
-                self.DATABASE_DEPENDENCIES["mysql"].artifact_id = "mysql-connector-j"
-            else:
-                # 使用旧版MySQL Connector
-                self.DATABASE_DEPENDENCIES["mysql"].group_id = "mysql"
-                self.DATABASE_DEPENDENCIES["mysql"].artifact_id = "mysql-connector-java"
-            
-            self.DATABASE_DEPENDENCIES["mysql"].version = compat["mysql_connector_version"]
+        目录对象在所有实例间共享，这里不原地修改，而是从预先构建的
+        版本快照复制字典并重新绑定到当前实例。
+        """
+        snapshot = _catalog().snapshot_for(spring_boot_version)
+        self.MYBATIS_DEPENDENCIES = dict(snapshot.mybatis)
+        self.DATABASE_DEPENDENCIES = dict(snapshot.db)
     
-    def generate_migration_recommendations(self, current_dependencies: List[DependencyInfo]) -> List[Dict[str, any]]:
-        """生成迁移建议"""
+    def generate_migration_recommendations(self, current_dependencies: List[DependencyInfo]) -> List[Mapping[str, Any]]:
+        """生成迁移建议
+        
+        目录中的过时依赖直接返回预先生成的只读建议，其余依赖按需生成。
+        """
         recommendations = []
+        migration_recs = _catalog().migration_recs
         
         for dep in current_dependencies:
-            if dep.status == DependencyStatus.DEPRECATED and dep.migration_target:
-                recommendations.append({
-                    "type": "migration",
-                    "from": f"{dep.group_id}:{dep.artifact_id}:{dep.version}",
-                    "to": f"{dep.migration_target.group_id}:{dep.migration_target.artifact_id}:{dep.migration_target.version}",
-                    "reason": f"迁移原因: {dep.description} -> {dep.migration_target.description}",
-                    "impact": "需要更新import语句",
-                    "priority": "high" if "javax" in dep.group_id else "medium"
-                })
+            cached = migration_recs.get(id(dep))
+            if cached is not None and cached[0] is dep:
+                recommendations.append(cached[1])
+            elif dep.status is DependencyStatus.DEPRECATED and dep.migration_target:
+                recommendations.append(_migration_recommendation(dep))
         
         return recommendations
+
+
+@lru_cache(maxsize=128)
+def _analyze_requirements(template_category: str,
+                          database_type: str,
+                          include_swagger: bool,
+                          include_lombok: bool,
+                          include_mapstruct: bool,
+                          spring_boot_version: Optional[str]) -> Mapping[str, Tuple[DependencyInfo, ...]]:
+    """按参数组合缓存的依赖需求分析，见 DependencyRequirements.analyze_requirements"""
+    
+    catalog = _catalog()
+    # 根据Spring Boot版本选择预先构建的目录快照
+    snapshot = catalog.snapshot_for(spring_boot_version)
+    
+    # 1. Spring Boot基础依赖 + 2. 数据库驱动依赖 (必需)
+    # 常见写法直接命中别名表，其余写法再按小写匹配；未知数据库不添加驱动
+    db_alias = catalog.db_alias
+    db_key = db_alias.get(database_type) or db_alias.get(database_type.lower())
+    # 3. MyBatis相关依赖（按模板类别预先组合，未知模板不添加）
+    required = (snapshot.required_by_db.get(db_key, catalog.spring_boot_required)
+                + snapshot.mybatis_bundles.get(template_category, ()))
+    
+    # 4. 工具依赖
+    optional = ((catalog.lombok_optional if include_lombok else ())
+                + (catalog.mapstruct_optional if include_mapstruct else ()))
+    
+    # 推荐现代化的OpenAPI 3.0并标记过时的Swagger 2.x；5. Jakarta EE迁移 (推荐)
+    recommended = (catalog.swagger_recommended if include_swagger else ()) + catalog.jakarta_recommended
+    
+    # 6. 标记过时的javax依赖
+    deprecated = (catalog.swagger_deprecated if include_swagger else ()) + catalog.javax_deprecated
+    
+    return MappingProxyType({
+        "required": required,        # 必需依赖
+        "optional": optional,        # 可选依赖
+        "recommended": recommended,  # 推荐依赖
+        "deprecated": deprecated     # 需要迁移的过时依赖
+    })
@@ -6,15 +6,149 @@ POM文件分析和智能建议生成器
 分析现有pom.xml，与需求对比，生成详细的依赖管理建议
 """
 
+import copy
+import os
+import sys
+import threading
 import xml.etree.ElementTree as ET
-from typing import Dict, List, Optional, Set, Tuple
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor
+from io import BytesIO
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 import re
 
+# 优先使用 lxml 流式解析 pom.xml，未安装时回退到标准库 xml.etree
+try:
+    from lxml import etree as _lxml_etree
+except ImportError:
+    _lxml_etree = None
+
+# 使用 packaging 做 PEP 440 版本比较（核心依赖，保证比较结果与环境无关）
+from packaging.version import InvalidVersion as _InvalidVersion, Version as _Version
+
 from .dependency_requirements import DependencyRequirements, DependencyInfo, DependencyStatus
+from .build_files import locate_elements, write_text_atomic
+from .dataclass_slots import with_slots
+
+
+# pom.xml 根元素不带命名空间时使用的默认 Maven 命名空间
+_MAVEN_NS = 'http://maven.apache.org/POM/4.0.0'
+
+# analyze_project_dependencies 结果缓存的最大条目数
+_ANALYSIS_CACHE_SIZE = 64
+# analyze_many 自动启用进程池的最少项目数。单个项目分析约1ms，而创建工作进程、
+# 导入模块和回传结果的开销在项目数较少时远大于并行收益（9个模块: 并行33ms / 串行9ms）
+_PARALLEL_ANALYZE_MIN_PROJECTS = 128
+
+# _generate_recommendations 规则：(对比状态, 依赖状态) -> (建议类别, 格式模板)
+_REC_RULES = {
+    ("missing", DependencyStatus.REQUIRED): ("critical", "❌ 缺少必需依赖: {dep.group_id}:{dep.artifact_id} - {dep.reason}"),
+    ("missing", DependencyStatus.RECOMMENDED): ("important", "⚠️ 建议添加: {dep.group_id}:{dep.artifact_id} - {dep.reason}"),
+}
+# 未命中上表时按对比状态取默认规则
+_REC_DEFAULTS = {
+    "missing": ("optional", "💡 可选依赖: {dep.group_id}:{dep.artifact_id} - {dep.reason}"),
+    "deprecated": ("migration", "🔄 {dep.group_id}:{dep.artifact_id} 已过时"),
+    "outdated": ("important", "📦 版本升级: {dep.group_id}:{dep.artifact_id} 当前版本过旧，建议升级到 {dep.version}"),
+}
+# 已过时且有迁移目标的依赖
+_REC_MIGRATE = (
+    "migration",
+    "🔄 迁移建议: {dep.group_id}:{dep.artifact_id} 已过时，"
+    "建议迁移到 {dep.migration_target.group_id}:{dep.migration_target.artifact_id}"
+)
+
+# _generate_maven_xml 返回的代码块分类
+_MAVEN_XML_KEYS = ("missing_dependencies", "upgrade_dependencies", "migration_dependencies")
+
+# MyBatis 系列模板下不应建议的依赖坐标（JPA starter、裸 mybatis）
+_MYBATIS_EXCLUDE = frozenset({
+    "org.springframework.boot:spring-boot-starter-data-jpa",
+    "org.mybatis:mybatis",
+})
+
+# 技术栈识别表：命中的依赖需要设置的 TechnologyStack 标记
+# 注解API按 (groupId, artifactId) 精确匹配，数据访问/API文档按 groupId 匹配
+_TECH_DETECT: Dict[Tuple[str, str], Tuple[Tuple[str, bool], ...]] = {
+    ("javax.annotation", "javax.annotation-api"): (("has_javax", True), ("is_modern_stack", False)),
+    ("jakarta.annotation", "jakarta.annotation-api"): (("has_jakarta", True),),
+}
+_TECH_DETECT_GROUP: Dict[str, Tuple[Tuple[str, bool], ...]] = {
+    "org.springframework.data": (("has_spring_data", True), ("is_modern_stack", False)),
+    "org.mybatis": (("has_mybatis", True),),
+    "org.mybatis.spring.boot": (("has_mybatis", True),),
+    "io.swagger": (("has_swagger2", True), ("is_modern_stack", False)),
+    "org.springdoc": (("has_springdoc", True),),
+}
+
+# 预编译的扫描正则，避免每次调用都经过 re 模块的缓存查找
+# Gradle依赖格式（一次扫描）: implementation 'group:artifact[:version]' 或 group: '..', name: '..', version: '..'
+_GRADLE_DEP_RE = re.compile(
+    r"(?:implementation|api|compile|testImplementation)\s+(?:"
+    r"['\"](?P<g1>[^:'\"]+):(?P<a1>[^:'\"]+)(?::(?P<v1>[^'\"]+))?['\"]"
+    r"|group:\s*['\"](?P<g2>[^'\"]+)['\"],\s*name:\s*['\"](?P<a2>[^'\"]+)['\"],\s*version:\s*['\"](?P<v2>[^'\"]+)['\"]"
+    r")"
+)
+# Spring Boot parent版本 / property版本
+_BOOT_PARENT_RE = re.compile(
+    r'<parent>.*?<groupId>org\.springframework\.boot</groupId>.*?<version>([^<]+)</version>.*?</parent>',
+    re.DOTALL
+)
+_BOOT_PROP_RE = re.compile(r'<spring\.boot\.version>([^<]+)</spring\.boot\.version>')
+# Gradle中的Spring Boot plugin版本
+_GRADLE_BOOT_RES = tuple(re.compile(pattern) for pattern in (
+    r'org\.springframework\.boot[\'\"]\s*version\s*[\'\"]([\d\.]+)',
+    r'spring-boot[\'\"]\s*version\s*[\'\"]([\d\.]+)',
+    r'springBootVersion\s*=\s*[\'\"]([\d\.]+)',
+))
+# 构建文件中的dependencies块
+_DEPS_BLOCK_RE = re.compile(r'(<dependencies>)(.*?)(</dependencies>)', re.DOTALL)
+_GRADLE_DEPS_BLOCK_RE = re.compile(r'(dependencies\s*\{.*?\})', re.DOTALL)
+# 依赖片段模板：每个依赖整体格式化一次
+_MAVEN_DEP_TMPL = (
+    "    <!-- {description}: {reason} -->\n"
+    "    <dependency>\n"
+    "        <groupId>{gid}</groupId>\n"
+    "        <artifactId>{aid}</artifactId>\n"
+    "        <version>{ver}</version>{scope_line}\n"
+    "    </dependency>"
+)
+_SCOPE_LINE = "\n        <scope>{scope}</scope>"
+_GRADLE_DEP_TMPL = "    // {description}: {reason}\n    {scope} '{gid}:{aid}:{ver}'"
+_GRADLE_SCOPES = frozenset({"implementation", "api", "compileOnly", "runtimeOnly", "testImplementation"})
 
+@lru_cache(maxsize=1024)
+def _pep440_version(version: str):
+    """解析为packaging Version，无法解析（如 5.3.31.RELEASE、1.0-SNAPSHOT）时返回None"""
+    try:
+        return _Version(version)
+    except (_InvalidVersion, TypeError):
+        return None
 
+
+@lru_cache(maxsize=1024)
+def _numeric_version(version: str) -> Tuple[int, ...]:
+    """只取纯数字段的版本元组，去掉末尾的0，等价于补齐长度后再比较"""
+    parts = [int(x) for x in version.split('.') if x.isdigit()]
+    while parts and parts[-1] == 0:
+        parts.pop()
+    return tuple(parts)
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """驻留坐标字符串（如反复出现的 org.springframework.boot），空元素的None原样返回"""
+    return sys.intern(value) if type(value) is str else value
+
+
+def _decode_text(data: bytes) -> str:
+    """按UTF-8解码并统一换行符，与以文本模式 open(..., encoding='utf-8') 读取的结果一致"""
+    return data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
+
+@with_slots
 @dataclass
 class ExistingDependency:
     """现有依赖信息"""
@@ -25,6 +159,7 @@ class ExistingDependency:
     source_line: Optional[int] = None  # 在pom.xml中的行号
 
 
+@with_slots
 @dataclass
 class DependencyComparison:
     """依赖对比结果"""
@@ -35,6 +170,7 @@ class DependencyComparison:
     maven_xml: str = ""  # 建议添加的Maven XML
 
 
+@with_slots
 @dataclass
 class TechnologyStack:
     """技术栈信息"""
@@ -47,11 +183,19 @@ class TechnologyStack:
     is_modern_stack: bool = True  # 默认使用现代化技术栈
 
 
+def _analyze_worker(project_root: str, kwargs: Dict[str, Any]) -> Dict:
+    """子进程入口：用新的分析器分析单个项目"""
+    return PomAnalyzer().analyze_project_dependencies(project_root, **kwargs)
+
+
 class PomAnalyzer:
     """POM文件分析器"""
     
     def __init__(self):
         self.requirements_analyzer = DependencyRequirements()
+        # analyze_project_dependencies 结果缓存，键包含构建文件的状态（修改时间、大小、inode），文件变化后自动失效
+        self._analysis_cache: Dict[tuple, Dict[str, Any]] = {}
+        self._analysis_cache_lock = threading.Lock()
         
     def analyze_project_dependencies(self, 
                                    project_root: str,
@@ -73,21 +217,76 @@ class PomAnalyzer:
             
         Returns:
             完整的分析报告和建议
-        """
         
-        # 1. 解析现有依赖文件
+        构建文件未变化时直接返回上次结果的副本，不再重复解析和对比
+        """
         project_path = Path(project_root)
-        build_tool = self._detect_build_tool(project_path)
+        try:
+            key = (project_root, template_category, database_type,
+                   include_swagger, include_lombok, include_mapstruct,
+                   self._build_file_stamp(project_path))
+            hash(key)
+        except TypeError:
+            # 参数不可哈希时不使用缓存
+            return self._analyze_project_dependencies(project_path, template_category, database_type,
+                                                      include_swagger, include_lombok, include_mapstruct)
+        
+        with self._analysis_cache_lock:
+            cached = self._analysis_cache.get(key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        
+        result = self._analyze_project_dependencies(project_path, template_category, database_type,
+                                                    include_swagger, include_lombok, include_mapstruct)
+        with self._analysis_cache_lock:
+            if len(self._analysis_cache) >= _ANALYSIS_CACHE_SIZE:
+                # 淘汰最早写入的条目
+                self._analysis_cache.pop(next(iter(self._analysis_cache)))
+            self._analysis_cache[key] = copy.deepcopy(result)
+        return result
+    
+    @classmethod
+    def analyze_many(cls, project_roots: List[str], executor: Optional[Executor] = None,
+                     **kwargs) -> Dict[str, Dict]:
+        """
+        分析多个项目（如多模块项目的各模块）的依赖状况
+        
+        未传入 executor 时，只有项目数达到 _PARALLEL_ANALYZE_MIN_PROJECTS 且有多个CPU
+        才使用进程池，否则串行分析（进程启动开销通常大于分析本身）。
+        
+        Args:
+            project_roots: 项目根目录列表
+            executor: 调用方提供的执行器，传入时总是通过它分析，由调用方负责关闭
+            **kwargs: 传给 analyze_project_dependencies 的参数 (template_category, database_type等)
+            
+        Returns:
+            项目根目录 -> 分析报告
+        """
+        if executor is not None:
+            futures = {root: executor.submit(_analyze_worker, root, kwargs) for root in project_roots}
+            return {root: future.result() for root, future in futures.items()}
+        
+        cpu_count = os.cpu_count() or 1
+        if cpu_count <= 1 or len(project_roots) < _PARALLEL_ANALYZE_MIN_PROJECTS:
+            analyzer = cls()
+            return {root: analyzer.analyze_project_dependencies(root, **kwargs) for root in project_roots}
+        
+        with ProcessPoolExecutor(max_workers=min(cpu_count, len(project_roots))) as executor:
+            return cls.analyze_many(project_roots, executor=executor, **kwargs)
+    
+    def _analyze_project_dependencies(self, project_path: Path, template_category: str, database_type: str,
+                                      include_swagger: bool, include_lombok: bool,
+                                      include_mapstruct: bool) -> Dict:
+        """分析项目依赖状况并生成建议（不使用缓存）"""
+        
+        # 1. 解析现有依赖文件（构建文件路径只拼接一次，以字符串传给各解析函数）
+        build_tool, build_file_name = self._detect_build_file(project_path)
         
         existing_deps = []
         if build_tool == "maven":
-            pom_path = project_path / "pom.xml"
-            existing_deps = self._parse_pom_file(pom_path)
-            spring_boot_version = self._extract_spring_boot_version(pom_path)
+            existing_deps, spring_boot_version = self._parse_pom_full(os.path.join(project_path, build_file_name))
         elif build_tool == "gradle":
-            gradle_path = project_path / "build.gradle"
-            if not gradle_path.exists():
-                gradle_path = project_path / "build.gradle.kts"
+            gradle_path = os.path.join(project_path, build_file_name)
             existing_deps = self._parse_gradle_file(gradle_path)
             spring_boot_version = self._extract_gradle_spring_boot_version(gradle_path)
         else:
@@ -111,10 +310,7 @@ class PomAnalyzer:
             if template_category in ("Default", "MybatisPlus", "MybatisPlus-Mixed"):
                 comparison_results = [
                     comp for comp in comparison_results
-                    if f"{comp.requirement.group_id}:{comp.requirement.artifact_id}" not in {
-                        "org.springframework.boot:spring-boot-starter-data-jpa",
-                        "org.mybatis:mybatis"
-                    }
+                    if f"{comp.requirement.group_id}:{comp.requirement.artifact_id}" not in _MYBATIS_EXCLUDE
                 ]
         except Exception:
             pass
@@ -134,7 +330,8 @@ class PomAnalyzer:
             "config_file_path": str(project_path / ("pom.xml" if build_tool == "maven" else "build.gradle")) if build_tool else None,
             "spring_boot_version": spring_boot_version,
             "existing_dependencies": len(existing_deps),
-            "requirements": requirements,
+            # analyze_requirements 返回共享的只读映射，这里复制一份以便结果可被深拷贝/修改
+            "requirements": dict(requirements),
             "comparison_results": comparison_results,
             "recommendations": recommendations,
             "maven_xml": maven_xml_blocks,  # 注意：Gradle项目仍然提供Maven格式的参考
@@ -155,26 +352,11 @@ class PomAnalyzer:
         tech_stack = TechnologyStack()
         
         for dep in existing_deps:
-            # 检测注解API类型
-            if dep.group_id == "javax.annotation" and dep.artifact_id == "javax.annotation-api":
-                tech_stack.has_javax = True
-                tech_stack.is_modern_stack = False
-            elif dep.group_id == "jakarta.annotation" and dep.artifact_id == "jakarta.annotation-api":
-                tech_stack.has_jakarta = True
-                
-            # 检测数据访问技术
-            if dep.group_id == "org.springframework.data":
-                tech_stack.has_spring_data = True
-                tech_stack.is_modern_stack = False
-            elif dep.group_id == "org.mybatis" or dep.group_id == "org.mybatis.spring.boot":
-                tech_stack.has_mybatis = True
-                
-            # 检测API文档技术
-            if dep.group_id == "io.swagger":
-                tech_stack.has_swagger2 = True
-                tech_stack.is_modern_stack = False
-            elif dep.group_id == "org.springdoc":
-                tech_stack.has_springdoc = True
+            # 检测注解API、数据访问、API文档技术（各规则的groupId互不重叠，每个依赖至多命中一条）
+            flags = _TECH_DETECT.get((dep.group_id, dep.artifact_id)) or _TECH_DETECT_GROUP.get(dep.group_id)
+            if flags:
+                for attr, value in flags:
+                    setattr(tech_stack, attr, value)
         
         # 如果没有明确指定技术栈，默认使用现代化技术栈
         if not any([tech_stack.has_javax, tech_stack.has_jakarta, 
@@ -187,133 +369,250 @@ class PomAnalyzer:
             
         return tech_stack
     
-    def _parse_pom_file(self, pom_path: Path) -> List[ExistingDependency]:
+    def _parse_pom_file(self, pom_path: Union[str, Path]) -> List[ExistingDependency]:
         """解析pom.xml文件"""
-        if not pom_path.exists():
+        data = self._read_pom_bytes(pom_path)
+        if data is None:
             return []
         
+        return self._parse_pom_bytes(data)[0]
+    
+    def _read_pom_bytes(self, pom_path: Union[str, Path]) -> Optional[bytes]:
+        """读取pom.xml原始内容，文件不存在或读取失败时返回None"""
         try:
-            tree = ET.parse(pom_path)
-            root = tree.getroot()
-            
-            # 处理命名空间
-            namespace = {'maven': 'http://maven.apache.org/POM/4.0.0'}
-            if root.tag.startswith('{'):
-                namespace_uri = root.tag[1:root.tag.find('}')]
-                namespace = {'maven': namespace_uri}
+            with open(pom_path, 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Warning: Failed to parse pom.xml: {e}")
+            return None
+    
+    def _parse_pom_full(self, pom_path: Union[str, Path],
+                        data: Optional[bytes] = None) -> Tuple[List[ExistingDependency], Optional[str]]:
+        """
+        一次读取、一次解析pom.xml，同时得到现有依赖和Spring Boot版本
+        
+        Args:
+            pom_path: pom.xml路径
+            data: 调用方已读取的pom.xml内容，传入时不再重复读取
+        """
+        if data is None:
+            data = self._read_pom_bytes(pom_path)
+            if data is None:
+                return [], None
+        
+        dependencies, spring_boot_version = self._parse_pom_bytes(data)
+        if spring_boot_version is None:
+            # parent不是Spring Boot或解析失败时，按原有正则规则查找（含spring.boot.version属性）
+            try:
+                content = _decode_text(data)
+            except UnicodeDecodeError:
+                return dependencies, None
+            spring_boot_version = self._extract_spring_boot_version_from_text(content)
+        
+        return dependencies, spring_boot_version
+    
+    def _parse_pom_bytes(self, data: bytes) -> Tuple[List[ExistingDependency], Optional[str]]:
+        """解析pom.xml内容，返回依赖列表及Spring Boot parent版本（parent不是Spring Boot时为None）"""
+        try:
+            if _lxml_etree is not None:
+                return self._parse_pom_lxml(data)
+            return self._parse_pom_etree(data)
             
-            dependencies = []
+        except Exception as e:
+            print(f"Warning: Failed to parse pom.xml: {e}")
+            return [], None
+    
+    def _parse_pom_etree(self, data: bytes) -> Tuple[List[ExistingDependency], Optional[str]]:
+        """未安装lxml时使用标准库 iterparse 流式解析pom.xml，处理完的dependency元素立即清空"""
+        dependencies = []
+        spring_boot_version = None
+        parent_found = False
+        ns = None
+        dependency_tag = None
+        parent_tag = None
+        depth = 0
+        
+        for event, elem in ET.iterparse(BytesIO(data), events=('start', 'end')):
+            if event == 'start':
+                if ns is None:
+                    # 处理命名空间：只接受与根元素同一命名空间的元素
+                    namespace_uri = elem.tag[1:elem.tag.find('}')] if elem.tag.startswith('{') else _MAVEN_NS
+                    ns = '{' + namespace_uri + '}'
+                    dependency_tag = ns + 'dependency'
+                    parent_tag = ns + 'parent'
+                depth += 1
+                continue
             
-            # 查找所有dependency元素
-            for dep in root.findall('.//maven:dependency', namespace):
-                group_id = dep.find('maven:groupId', namespace)
-                artifact_id = dep.find('maven:artifactId', namespace)
-                version = dep.find('maven:version', namespace)
-                scope = dep.find('maven:scope', namespace)
+            depth -= 1
+            if elem.tag == dependency_tag:
+                group_id = elem.find(ns + 'groupId')
+                artifact_id = elem.find(ns + 'artifactId')
+                version = elem.find(ns + 'version')
+                scope = elem.find(ns + 'scope')
                 
                 if group_id is not None and artifact_id is not None:
                     dependencies.append(ExistingDependency(
-                        group_id=group_id.text,
-                        artifact_id=artifact_id.text,
+                        group_id=_intern(group_id.text),
+                        artifact_id=_intern(artifact_id.text),
                         version=version.text if version is not None else None,
-                        scope=scope.text if scope is not None else "compile"
+                        scope=_intern(scope.text) if scope is not None else "compile"
                     ))
+                elem.clear()
+            elif elem.tag == parent_tag and depth == 1 and not parent_found:
+                # 只认项目级parent（根元素的第一个parent子元素）
+                parent_found = True
+                if elem.findtext(ns + 'groupId') == 'org.springframework.boot':
+                    spring_boot_version = elem.findtext(ns + 'version') or None
+        
+        return dependencies, spring_boot_version
+    
+    def _parse_pom_lxml(self, data: bytes) -> Tuple[List[ExistingDependency], Optional[str]]:
+        """使用 lxml iterparse 流式解析pom.xml，顺带记录Spring Boot parent版本，处理完的元素立即释放以控制内存"""
+        dependencies = []
+        spring_boot_version = None
+        root = None
+        ns = None
+        dependency_tag = None
+        parent_tag = None
+        
+        context = _lxml_etree.iterparse(BytesIO(data), events=('end',), tag=('{*}dependency', '{*}parent'),
+                                        resolve_entities=False)
+        for _, elem in context:
+            if ns is None:
+                # 与整树解析保持一致：只接受与根元素同一命名空间的元素
+                root = elem.getroottree().getroot()
+                root_tag = root.tag
+                namespace_uri = root_tag[1:root_tag.find('}')] if root_tag.startswith('{') else _MAVEN_NS
+                ns = '{' + namespace_uri + '}'
+                dependency_tag = ns + 'dependency'
+                parent_tag = ns + 'parent'
             
-            return dependencies
+            if elem.tag == parent_tag:
+                # 只认项目级parent（根元素的直接子元素）
+                if (spring_boot_version is None and elem.getparent() is root
+                        and elem.findtext(ns + 'groupId') == 'org.springframework.boot'):
+                    spring_boot_version = elem.findtext(ns + 'version') or None
+                continue
             
-        except Exception as e:
-            print(f"Warning: Failed to parse pom.xml: {e}")
-            return []
+            if elem.tag == dependency_tag:
+                group_id = elem.find(ns + 'groupId')
+                artifact_id = elem.find(ns + 'artifactId')
+                version = elem.find(ns + 'version')
+                scope = elem.find(ns + 'scope')
+                
+                if group_id is not None and artifact_id is not None:
+                    dependencies.append(ExistingDependency(
+                        group_id=_intern(group_id.text),
+                        artifact_id=_intern(artifact_id.text),
+                        version=version.text if version is not None else None,
+                        scope=_intern(scope.text) if scope is not None else "compile"
+                    ))
+                
+                # 释放已处理的元素及其之前的兄弟节点
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+        
+        return dependencies, spring_boot_version
     
-    def _parse_gradle_file(self, gradle_path: Path) -> List[ExistingDependency]:
+    def _parse_gradle_file(self, gradle_path: Union[str, Path]) -> List[ExistingDependency]:
         """解析build.gradle文件 - 新增Gradle支持"""
-        if not gradle_path.exists():
-            return []
-        
         try:
             with open(gradle_path, 'r', encoding='utf-8') as f:
                 content = f.read()
             
             dependencies = []
             
-            # 匹配Gradle依赖格式: implementation 'group:artifact:version'
-            patterns = [
-                r"(?:implementation|api|compile|testImplementation)\s+['\"]([^:]+):([^:]+):([^'\"]+)['\"]",
-                r"(?:implementation|api|compile|testImplementation)\s+['\"]([^:]+):([^:]+)['\"]",  # 无版本号
-                r"(?:implementation|api|compile|testImplementation)\s+group:\s*['\"]([^'\"]+)['\"],\s*name:\s*['\"]([^'\"]+)['\"],\s*version:\s*['\"]([^'\"]+)['\"]"
-            ]
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, content)
-                for match in matches:
-                    if len(match) == 3:
-                        group_id, artifact_id, version = match
-                    elif len(match) == 2:
-                        group_id, artifact_id = match
-                        version = None
-                    else:
-                        continue
-                        
-                    dependencies.append(ExistingDependency(
-                        group_id=group_id,
-                        artifact_id=artifact_id,
-                        version=version,
-                        scope="compile"  # Gradle默认scope
-                    ))
+            # 匹配Gradle依赖格式: implementation 'group:artifact:version'（按出现顺序）
+            for match in _GRADLE_DEP_RE.finditer(content):
+                if match.group('g1') is not None:
+                    group_id, artifact_id, version = match.group('g1', 'a1', 'v1')
+                else:
+                    group_id, artifact_id, version = match.group('g2', 'a2', 'v2')
+                
+                dependencies.append(ExistingDependency(
+                    group_id=sys.intern(group_id),
+                    artifact_id=sys.intern(artifact_id),
+                    version=version,
+                    scope="compile"  # Gradle默认scope
+                ))
             
             return dependencies
             
+        except FileNotFoundError:
+            return []
         except Exception as e:
             print(f"Warning: Failed to parse build.gradle: {e}")
             return []
     
+    def _build_file_stamp(self, project_path: Path) -> Optional[Tuple[int, int, int]]:
+        """返回项目构建文件的(修改时间, 大小, inode)，没有构建文件时返回None"""
+        for name in ("pom.xml", "build.gradle", "build.gradle.kts"):
+            try:
+                stat = os.stat(os.path.join(project_path, name))
+            except OSError:
+                continue
+            # 构建文件会被原子替换（新inode），同一时间戳粒度内的改写也能识别
+            return stat.st_mtime_ns, stat.st_size, stat.st_ino
+        return None
+    
     def _detect_build_tool(self, project_root: Path) -> Optional[str]:
         """检测构建工具类型"""
-        if (project_root / "pom.xml").exists():
-            return "maven"
-        elif (project_root / "build.gradle").exists() or (project_root / "build.gradle.kts").exists():
-            return "gradle"
+        return self._detect_build_file(project_root)[0]
+    
+    def _detect_build_file(self, project_root: Union[str, Path]) -> Tuple[Optional[str], Optional[str]]:
+        """检测构建工具类型及构建文件名（一次目录扫描代替多次stat）"""
+        try:
+            with os.scandir(project_root) as it:
+                entries = {entry.name for entry in it}
+        except OSError:
+            return None, None
+        
+        if "pom.xml" in entries:
+            return "maven", "pom.xml"
+        elif "build.gradle" in entries:
+            return "gradle", "build.gradle"
+        elif "build.gradle.kts" in entries:
+            return "gradle", "build.gradle.kts"
         else:
-            return None
+            return None, None
     
-    def _extract_spring_boot_version(self, pom_path: Path) -> Optional[str]:
+    def _extract_spring_boot_version(self, pom_path: Union[str, Path]) -> Optional[str]:
         """提取Spring Boot版本"""
         try:
             with open(pom_path, 'r', encoding='utf-8') as f:
                 content = f.read()
             
-            # 查找Spring Boot parent版本
-            parent_pattern = r'<parent>.*?<groupId>org\.springframework\.boot</groupId>.*?<version>([^<]+)</version>.*?</parent>'
-            match = re.search(parent_pattern, content, re.DOTALL)
-            if match:
-                return match.group(1)
-            
-            # 查找Spring Boot property版本
-            property_pattern = r'<spring\.boot\.version>([^<]+)</spring\.boot\.version>'
-            match = re.search(property_pattern, content)
-            if match:
-                return match.group(1)
-            
-            return None
+            return self._extract_spring_boot_version_from_text(content)
             
         except Exception:
             return None
     
-    def _extract_gradle_spring_boot_version(self, gradle_path: Path) -> Optional[str]:
+    def _extract_spring_boot_version_from_text(self, content: str) -> Optional[str]:
+        """从pom.xml文本中提取Spring Boot版本"""
+        # 查找Spring Boot parent版本
+        match = _BOOT_PARENT_RE.search(content)
+        if match:
+            return match.group(1)
+        
+        # 查找Spring Boot property版本
+        match = _BOOT_PROP_RE.search(content)
+        if match:
+            return match.group(1)
+        
+        return None
+    
+    def _extract_gradle_spring_boot_version(self, gradle_path: Union[str, Path]) -> Optional[str]:
         """提取Gradle中的Spring Boot版本"""
         try:
             with open(gradle_path, 'r', encoding='utf-8') as f:
                 content = f.read()
             
             # 查找Spring Boot plugin版本
-            patterns = [
-                r'org\.springframework\.boot[\'\"]\s*version\s*[\'\"]([\d\.]+)',
-                r'spring-boot[\'\"]\s*version\s*[\'\"]([\d\.]+)',
-                r'springBootVersion\s*=\s*[\'\"]([\d\.]+)',
-            ]
-            
-            for pattern in patterns:
-                match = re.search(pattern, content)
+            for pattern in _GRADLE_BOOT_RES:
+                match = pattern.search(content)
                 if match:
                     return match.group(1)
             
@@ -328,74 +627,60 @@ class PomAnalyzer:
         """对比需求与现有依赖"""
         comparisons = []
         
-        # 创建现有依赖的快速查找字典
-        existing_dict = {}
-        for dep in existing_deps:
-            key = f"{dep.group_id}:{dep.artifact_id}"
-            existing_dict[key] = dep
+        # 创建现有依赖的快速查找字典（键为驻留字符串组成的元组，无需拼接坐标字符串）
+        existing_dict = {(dep.group_id, dep.artifact_id): dep for dep in existing_deps}
         
-        # 检查所有需求类别
-        for category, deps in requirements.items():
+        # 汇总所有需求类别，同一坐标出现在多个类别时只按首次出现的需求对比一次
+        flat_requirements: Dict[Tuple[str, str], DependencyInfo] = {}
+        for deps in requirements.values():
             for req_dep in deps:
-                key = f"{req_dep.group_id}:{req_dep.artifact_id}"
-                existing = existing_dict.get(key)
-                
-                comparison = DependencyComparison(requirement=req_dep, existing=existing)
-                
-                if existing is None:
-                    comparison.status = "missing"
-                    comparison.recommendation = f"添加{req_dep.description}"
+                flat_requirements.setdefault((req_dep.group_id, req_dep.artifact_id), req_dep)
+        
+        for coord, req_dep in flat_requirements.items():
+            existing = existing_dict.get(coord)
+            
+            comparison = DependencyComparison(requirement=req_dep, existing=existing)
+            
+            if existing is None:
+                comparison.status = "missing"
+                comparison.recommendation = f"添加{req_dep.description}"
+                comparison.maven_xml = self._format_maven_dependency(req_dep)
+            else:
+                if req_dep.status is DependencyStatus.DEPRECATED:
+                    comparison.status = "deprecated"
+                    comparison.recommendation = f"建议迁移到新版本: {req_dep.migration_target.group_id}:{req_dep.migration_target.artifact_id}" if req_dep.migration_target else "依赖已过时"
+                elif existing.version and self._is_version_outdated(existing.version, req_dep.version):
+                    comparison.status = "outdated"
+                    comparison.recommendation = f"建议升级版本: {existing.version} -> {req_dep.version}"
                     comparison.maven_xml = self._format_maven_dependency(req_dep)
                 else:
-                    if req_dep.status == DependencyStatus.DEPRECATED:
-                        comparison.status = "deprecated"
-                        comparison.recommendation = f"建议迁移到新版本: {req_dep.migration_target.group_id}:{req_dep.migration_target.artifact_id}" if req_dep.migration_target else "依赖已过时"
-                    elif existing.version and self._is_version_outdated(existing.version, req_dep.version):
-                        comparison.status = "outdated"
-                        comparison.recommendation = f"建议升级版本: {existing.version} -> {req_dep.version}"
-                        comparison.maven_xml = self._format_maven_dependency(req_dep)
-                    else:
-                        comparison.status = "exists"
-                        comparison.recommendation = "依赖已存在且版本合适"
-                
-                comparisons.append(comparison)
+                    comparison.status = "exists"
+                    comparison.recommendation = "依赖已存在且版本合适"
+            
+            comparisons.append(comparison)
         
         return comparisons
     
     def _is_version_outdated(self, current: str, required: str) -> bool:
-        """简单的版本比较（可以后续改进为更精确的语义版本比较）"""
+        """版本比较：两边都符合PEP 440时按语义版本比较，否则退回数字段比较"""
         try:
-            # 简单的数字版本比较
-            current_parts = [int(x) for x in current.split('.') if x.isdigit()]
-            required_parts = [int(x) for x in required.split('.') if x.isdigit()]
-            
-            # 补齐长度
-            max_len = max(len(current_parts), len(required_parts))
-            current_parts.extend([0] * (max_len - len(current_parts)))
-            required_parts.extend([0] * (max_len - len(required_parts)))
+            current_version = _pep440_version(current)
+            required_version = _pep440_version(required)
+            if current_version is not None and required_version is not None:
+                return current_version < required_version
             
-            return current_parts < required_parts
+            # 简单的数字版本比较
+            return _numeric_version(current) < _numeric_version(required)
         except:
             return False
     
     def _format_maven_dependency(self, dep: DependencyInfo) -> str:
-        """格式化Maven依赖XML"""
-        # 添加依赖描述注释
-        comment = f"    <!-- {dep.description}: {dep.reason} -->"
-        xml_lines = [
-            comment,
-            "    <dependency>",
-            f"        <groupId>{dep.group_id}</groupId>",
-            f"        <artifactId>{dep.artifact_id}</artifactId>",
-            f"        <version>{dep.version}</version>"
-        ]
-        
-        if dep.scope != "compile":
-            xml_lines.append(f"        <scope>{dep.scope}</scope>")
-        
-        xml_lines.append("    </dependency>")
-        
-        return "\n".join(xml_lines)
+        """格式化Maven依赖XML（含依赖描述注释）"""
+        return _MAVEN_DEP_TMPL.format(
+            description=dep.description, reason=dep.reason,
+            gid=dep.group_id, aid=dep.artifact_id, ver=dep.version,
+            scope_line=_SCOPE_LINE.format(scope=dep.scope) if dep.scope != "compile" else ""
+        )
     
     def _generate_recommendations(self, 
                                 comparisons: List[DependencyComparison],
@@ -411,29 +696,15 @@ class PomAnalyzer:
         for comp in comparisons:
             dep = comp.requirement
             
-            if comp.status == "missing":
-                if dep.status == DependencyStatus.REQUIRED:
-                    recommendations["critical"].append(
-                        f"❌ 缺少必需依赖: {dep.group_id}:{dep.artifact_id} - {dep.reason}"
-                    )
-                elif dep.status == DependencyStatus.RECOMMENDED:
-                    recommendations["important"].append(
-                        f"⚠️ 建议添加: {dep.group_id}:{dep.artifact_id} - {dep.reason}"
-                    )
-                else:
-                    recommendations["optional"].append(
-                        f"💡 可选依赖: {dep.group_id}:{dep.artifact_id} - {dep.reason}"
-                    )
-            
-            elif comp.status == "deprecated":
-                recommendations["migration"].append(
-                    f"🔄 迁移建议: {dep.group_id}:{dep.artifact_id} 已过时，建议迁移到 {dep.migration_target.group_id}:{dep.migration_target.artifact_id}" if dep.migration_target else f"🔄 {dep.group_id}:{dep.artifact_id} 已过时"
-                )
+            if comp.status == "deprecated" and dep.migration_target:
+                rule = _REC_MIGRATE
+            else:
+                rule = _REC_RULES.get((comp.status, dep.status)) or _REC_DEFAULTS.get(comp.status)
+                if rule is None:
+                    continue
             
-            elif comp.status == "outdated":
-                recommendations["important"].append(
-                    f"📦 版本升级: {dep.group_id}:{dep.artifact_id} 当前版本过旧，建议升级到 {dep.version}"
-                )
+            category, template = rule
+            recommendations[category].append(template.format(dep=dep))
         
         # 添加Spring Boot版本相关建议
         if spring_boot_version:
@@ -450,11 +721,7 @@ class PomAnalyzer:
     
     def _generate_maven_xml(self, comparisons: List[DependencyComparison]) -> Dict[str, str]:
         """生成Maven XML代码块"""
-        xml_blocks = {
-            "missing_dependencies": [],
-            "upgrade_dependencies": [],
-            "migration_dependencies": []
-        }
+        xml_blocks = {key: [] for key in _MAVEN_XML_KEYS}
         
         for comp in comparisons:
             if comp.status == "missing" and comp.maven_xml:
@@ -477,12 +744,14 @@ class PomAnalyzer:
     
     def _generate_summary(self, comparisons: List[DependencyComparison]) -> Dict[str, int]:
         """生成统计摘要"""
+        # 一次遍历统计各状态数量
+        status_counts = Counter(c.status for c in comparisons)
         summary = {
             "total_requirements": len(comparisons),
-            "missing": len([c for c in comparisons if c.status == "missing"]),
-            "exists": len([c for c in comparisons if c.status == "exists"]),
-            "outdated": len([c for c in comparisons if c.status == "outdated"]),
-            "deprecated": len([c for c in comparisons if c.status == "deprecated"])
+            "missing": status_counts["missing"],
+            "exists": status_counts["exists"],
+            "outdated": status_counts["outdated"],
+            "deprecated": status_counts["deprecated"]
         }
         
         summary["needs_attention"] = summary["missing"] + summary["outdated"] + summary["deprecated"]
@@ -513,14 +782,16 @@ class PomAnalyzer:
         # 收集需要添加的依赖
         missing_deps = []
         # Dynamically decide which missing deps to add based on the project's stack
-        pom_path = Path(project_root) / "pom.xml"
+        pom_path = os.path.join(project_path, "pom.xml")
         boot_version = None
-        existing_coords = set()
+        existing_coords = frozenset()
+        # pom.xml只读取一次，解析与后续写入共用
+        pom_data = None
         try:
-            if pom_path.exists():
-                boot_version = self._extract_spring_boot_version(pom_path)
-                existing = self._parse_pom_file(pom_path)
-                existing_coords = {f"{d.group_id}:{d.artifact_id}" for d in existing}
+            pom_data = self._read_pom_bytes(pom_path)
+            if pom_data is not None:
+                existing, boot_version = self._parse_pom_full(pom_path, pom_data)
+                existing_coords = frozenset(f"{d.group_id}:{d.artifact_id}" for d in existing)
         except Exception:
             pass
 
@@ -529,11 +800,9 @@ class PomAnalyzer:
 
         def is_allowed(comp) -> bool:
             coord = f"{comp.requirement.group_id}:{comp.requirement.artifact_id}"
-            # Never add JPA for MyBatis/MyBatis-Plus based templates
-            if coord == "org.springframework.boot:spring-boot-starter-data-jpa":
-                return False
-            # Never add bare MyBatis when using Spring Boot starters
-            if coord == "org.mybatis:mybatis":
+            # Never add JPA for MyBatis/MyBatis-Plus based templates,
+            # nor bare MyBatis when using Spring Boot starters
+            if coord in _MYBATIS_EXCLUDE:
                 return False
             # Prefer stack consistency for Swagger/OpenAPI
             if is_boot2 or uses_legacy_swagger:
@@ -565,7 +834,7 @@ class PomAnalyzer:
         # 根据构建工具类型添加依赖
         try:
             if build_tool == "maven":
-                added_count = self._add_maven_dependencies(project_path, missing_deps)
+                added_count = self._add_maven_dependencies(project_path, missing_deps, pom_data)
             elif build_tool == "gradle":
                 added_count = self._add_gradle_dependencies(project_path, missing_deps)
             else:
@@ -585,21 +854,100 @@ class PomAnalyzer:
                 "message": f"添加依赖失败: {str(e)}"
             }
     
-    def _add_maven_dependencies(self, project_path: Path, dependencies: List[DependencyInfo]) -> int:
-        """添加Maven依赖 - 修复版"""
+    def _add_maven_dependencies(self, project_path: Path, dependencies: List[DependencyInfo],
+                                pom_data: Optional[bytes] = None) -> int:
+        """添加Maven依赖 - 修复版（pom_data为调用方已读取的pom.xml内容，传入时不再重复读取）"""
         pom_file = project_path / "pom.xml"
-        if not pom_file.exists():
-            raise Exception("pom.xml文件不存在")
         
         # 读取pom.xml内容
-        with open(pom_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        if pom_data is None:
+            try:
+                pom_data = pom_file.read_bytes()
+            except FileNotFoundError:
+                raise Exception("pom.xml文件不存在")
+        content = _decode_text(pom_data)
         
-        # 查找dependencies标签
-        dependencies_pattern = r'(<dependencies>)(.*?)(</dependencies>)'
-        dependencies_match = re.search(dependencies_pattern, content, re.DOTALL)
+        # 准备新依赖（每个依赖一个带注释说明的XML片段）
+        dep_blocks = [self._format_maven_dependency(dep) for dep in dependencies]
+        added_count = len(dependencies)
         
-        added_count = 0
+        updated = None
+        if _lxml_etree is not None:
+            updated = self._insert_maven_dependencies_lxml(content, dep_blocks)
+        
+        if updated is None:
+            updated = self._insert_maven_dependencies_text(content, dep_blocks)
+        
+        # 写回文件
+        self._write_build_file(pom_file, updated)
+        
+        return added_count
+    
+    def _insert_maven_dependencies_lxml(self, content: str, dep_blocks: List[str]) -> Optional[str]:
+        """
+        使用 lxml 在项目级 project/dependencies 中追加依赖（不会误改 dependencyManagement 等嵌套块）
+        
+        lxml 只用于确定目标元素及其在原文中的位置，新依赖直接拼接进原文，
+        其余内容（标签布局、引号、实体等）一字不改；无法解析或定位时返回None，由文本方式兜底
+        """
+        try:
+            parser = _lxml_etree.XMLParser(encoding='utf-8', resolve_entities=False,
+                                           strip_cdata=False, remove_blank_text=False)
+            root = _lxml_etree.fromstring(content.encode('utf-8'), parser)
+            if _lxml_etree.QName(root).localname != 'project':
+                return None
+            
+            ns = root.tag[:root.tag.find('}') + 1] if root.tag.startswith('{') else ''
+            dependencies_el = root.find(ns + 'dependencies')
+            
+            if dependencies_el is not None:
+                new_deps = []
+                # 添加注释说明（只添加一次）
+                if "DBJavaGenix 自动添加的依赖" not in content:  # 避免重复添加注释
+                    new_deps.append("    <!-- DBJavaGenix 自动添加的依赖 -->")
+                new_deps.extend(dep_blocks)
+                
+                has_content = len(dependencies_el) or (dependencies_el.text or '').strip()
+                fragment = ("\n" if has_content else "") + "\n".join(new_deps) + "\n    "
+                target = dependencies_el
+            else:
+                # 创建新的dependencies标签，插入到</project>之前
+                new_deps_section = ["<dependencies>", "    <!-- DBJavaGenix 自动添加的依赖 -->"]
+                new_deps_section.extend(dep_blocks)
+                new_deps_section.append("</dependencies>")
+                # 整段再缩进一级
+                fragment = "    " + "\n".join(new_deps_section).replace("\n", "\n    ") + "\n\n"
+                target = root
+            
+            # 片段本身必须是合法的XML，否则交给文本方式处理
+            wrapper_ns = f' xmlns="{ns[1:-1]}"' if ns else ''
+            _lxml_etree.fromstring(f"<wrapper{wrapper_ns}>{fragment}</wrapper>")
+            
+            # 原文中的元素与 lxml 元素按文档顺序一一对应
+            locations = locate_elements(content)
+            elements = list(root.iter(_lxml_etree.Element))
+            if len(locations) != len(elements):
+                return None
+            location = locations[elements.index(target)]
+            if location.name.rpartition(':')[2] != _lxml_etree.QName(target).localname:
+                return None
+            
+            self_closing = location.end_tag is None
+            end_start, end_stop = location.start_tag if self_closing else location.end_tag
+            if self_closing:
+                # <dependencies/> 展开为成对标签
+                start_tag = content[end_start:end_stop - 2].rstrip()
+                return "".join([content[:end_start], start_tag, ">", fragment,
+                                "</", start_tag[1:].split(None, 1)[0], ">", content[end_stop:]])
+            return content[:end_start] + fragment + content[end_start:]
+            
+        except Exception:
+            return None
+    
+    def _insert_maven_dependencies_text(self, content: str, dep_blocks: List[str]) -> str:
+        """基于文本替换添加依赖（未安装lxml或pom.xml无法解析时使用）"""
+        # 查找dependencies标签
+        dependencies_match = _DEPS_BLOCK_RE.search(content)
         
         if dependencies_match:
             # 在现有dependencies标签中添加依赖
@@ -607,23 +955,11 @@ class PomAnalyzer:
             existing_content = dependencies_match.group(2)
             end_tag = dependencies_match.group(3)
             
-            # 准备新依赖
             new_deps = []
             # 添加注释说明（只添加一次）
             if "DBJavaGenix 自动添加的依赖" not in content:  # 避免重复添加注释
                 new_deps.append("    <!-- DBJavaGenix 自动添加的依赖 -->")
-            
-            for dep in dependencies:
-                # 为每个依赖添加注释说明
-                new_deps.append(f"    <!-- {dep.description}: {dep.reason} -->")
-                new_deps.append(f"    <dependency>")
-                new_deps.append(f"        <groupId>{dep.group_id}</groupId>")
-                new_deps.append(f"        <artifactId>{dep.artifact_id}</artifactId>")
-                new_deps.append(f"        <version>{dep.version}</version>")
-                if dep.scope != "compile":
-                    new_deps.append(f"        <scope>{dep.scope}</scope>")
-                new_deps.append(f"    </dependency>")
-                added_count += 1
+            new_deps.extend(dep_blocks)
             
             # 正确地重新组装dependencies块
             updated_deps_block = start_tag + existing_content
@@ -634,39 +970,23 @@ class PomAnalyzer:
             updated_deps_block += end_tag
             
             # 替换原来的dependencies块
-            content = content.replace(dependencies_match.group(0), updated_deps_block)
-        else:
-            # 创建新的dependencies标签
-            new_deps_section = ["<dependencies>"]
-            # 添加注释说明
-            new_deps_section.append("    <!-- DBJavaGenix 自动添加的依赖 -->")
-            for dep in dependencies:
-                # 为每个依赖添加注释说明
-                new_deps_section.append(f"    <!-- {dep.description}: {dep.reason} -->")
-                new_deps_section.append(f"    <dependency>")
-                new_deps_section.append(f"        <groupId>{dep.group_id}</groupId>")
-                new_deps_section.append(f"        <artifactId>{dep.artifact_id}</artifactId>")
-                new_deps_section.append(f"        <version>{dep.version}</version>")
-                if dep.scope != "compile":
-                    new_deps_section.append(f"        <scope>{dep.scope}</scope>")
-                new_deps_section.append(f"    </dependency>")
-                added_count += 1
-            new_deps_section.append("</dependencies>")
-            
-            # 查找插入位置（在</project>标签前插入）
-            insert_position = content.rfind("</project>")
-            if insert_position != -1:
-                # 在</project>标签前插入dependencies块
-                content = content[:insert_position] + "    " + "\n    ".join(new_deps_section) + "\n\n" + content[insert_position:]
-            else:
-                # 如果找不到</project>标签，添加到文件末尾
-                content = content.rstrip() + "\n\n" + "\n".join(new_deps_section) + "\n"
+            return content.replace(dependencies_match.group(0), updated_deps_block)
         
-        # 写回文件
-        with open(pom_file, 'w', encoding='utf-8') as f:
-            f.write(content)
+        # 创建新的dependencies标签
+        new_deps_section = ["<dependencies>"]
+        # 添加注释说明
+        new_deps_section.append("    <!-- DBJavaGenix 自动添加的依赖 -->")
+        new_deps_section.extend(dep_blocks)
+        new_deps_section.append("</dependencies>")
         
-        return added_count
+        # 查找插入位置（在</project>标签前插入）
+        insert_position = content.rfind("</project>")
+        if insert_position != -1:
+            # 在</project>标签前插入dependencies块（整段再缩进一级）
+            indented = "\n".join(new_deps_section).replace("\n", "\n    ")
+            return content[:insert_position] + "    " + indented + "\n\n" + content[insert_position:]
+        # 如果找不到</project>标签，添加到文件末尾
+        return content.rstrip() + "\n\n" + "\n".join(new_deps_section) + "\n"
     
     def _add_gradle_dependencies(self, project_path: Path, dependencies: List[DependencyInfo]) -> int:
         """添加Gradle依赖"""
@@ -681,39 +1001,38 @@ class PomAnalyzer:
             content = f.read()
         
         # 查找dependencies块
-        dependencies_pattern = r'(dependencies\s*\{.*?\})'
-        dependencies_match = re.search(dependencies_pattern, content, re.DOTALL)
+        dependencies_match = _GRADLE_DEPS_BLOCK_RE.search(content)
         
-        added_count = 0
+        # 准备新依赖（每个依赖一个带注释说明的片段）
+        dep_blocks = [
+            _GRADLE_DEP_TMPL.format(
+                description=dep.description, reason=dep.reason,
+                scope=dep.scope if dep.scope in _GRADLE_SCOPES else "implementation",
+                gid=dep.group_id, aid=dep.artifact_id, ver=dep.version
+            )
+            for dep in dependencies
+        ]
+        added_count = len(dependencies)
         
         if dependencies_match:
             # 在现有dependencies块中添加依赖
             existing_deps = dependencies_match.group(1)
-            new_deps = []
-            for dep in dependencies:
-                scope = dep.scope if dep.scope in ["implementation", "api", "compileOnly", "runtimeOnly", "testImplementation"] else "implementation"
-                new_deps.append(f"    // {dep.description}: {dep.reason}")
-                new_deps.append(f"    {scope} '{dep.group_id}:{dep.artifact_id}:{dep.version}'")
-                added_count += 1
             
             # 插入新依赖
-            updated_deps = existing_deps[:-1] + "\n" + "\n".join(new_deps) + "\n}"
+            updated_deps = existing_deps[:-1] + "\n" + "\n".join(dep_blocks) + "\n}"
             content = content.replace(existing_deps, updated_deps)
         else:
             # 创建新的dependencies块
-            new_deps_section = ["dependencies {"]
-            for dep in dependencies:
-                scope = dep.scope if dep.scope in ["implementation", "api", "compileOnly", "runtimeOnly", "testImplementation"] else "implementation"
-                new_deps_section.append(f"    // {dep.description}: {dep.reason}")
-                new_deps_section.append(f"    {scope} '{dep.group_id}:{dep.artifact_id}:{dep.version}'")
-                added_count += 1
-            new_deps_section.append("}")
-            
             # 添加到文件末尾
-            content = content.rstrip() + "\n\n" + "\n".join(new_deps_section) + "\n"
+            content = content.rstrip() + "\n\ndependencies {\n" + "\n".join(dep_blocks) + "\n}\n"
         
         # 写回文件
-        with open(gradle_file, 'w', encoding='utf-8') as f:
-            f.write(content)
+        self._write_build_file(gradle_file, content)
         
         return added_count
+    
+    def _write_build_file(self, file_path: Path, content: str) -> None:
+        """
+        一次编码、一次写入构建文件：先写临时文件再 os.replace，中途失败不会留下半截文件
+        """
+        write_text_atomic(file_path, content)
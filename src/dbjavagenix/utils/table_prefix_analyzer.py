@@ -6,58 +6,82 @@
 用于分析表名前缀并生成相应的包结构
 """
 
+import io
 import re
-from typing import Dict, List, Optional, Set, Tuple
+import sys
+import threading
+from collections import defaultdict
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Set, Tuple
 from dataclasses import dataclass
 
 
-@dataclass
+# 前缀分析结果缓存的最大条目数
+_ANALYSIS_CACHE_SIZE = 32
+
+# 预定义的前缀映射表，模块级保存；类属性 COMMON_PREFIX_MAPPINGS 引用同一对象
+_COMMON_PREFIX_MAPPINGS: Dict[str, str] = {
+    'sys': 'system',
+    'auth': 'authentication', 
+    'user': 'user',
+    'admin': 'administration',
+    'log': 'logging',
+    'config': 'configuration',
+    'dict': 'dictionary',
+    'file': 'file',
+    'msg': 'message',
+    'pay': 'payment',
+    'order': 'order',
+    'product': 'product',
+    'shop': 'shop',
+    'cart': 'cart',
+    'member': 'member',
+    'org': 'organization',
+    'dept': 'department',
+    'role': 'role',
+    'perm': 'permission',
+    'menu': 'menu',
+    'api': 'api',
+    'data': 'data',
+    'report': 'report',
+    'workflow': 'workflow',
+    'task': 'task',
+    'job': 'job',
+    'notice': 'notice',
+    'news': 'news',
+    'article': 'article',
+    'content': 'content',
+    'media': 'media',
+    'attachment': 'attachment'
+}
+
+
+@dataclass(frozen=True)
 class PrefixGroup:
-    """前缀分组信息"""
+    """前缀分组信息 (不可变，可安全地在缓存中共享)"""
+    # 本模块可作为脚本单独运行，不使用包内的 with_slots；字段均无默认值，可直接声明__slots__去掉实例__dict__
+    __slots__ = ('prefix', 'full_name', 'package_name', 'tables')
+    
     prefix: str              # 原始前缀 (如: sys)
     full_name: str           # 完整名称 (如: system)
     package_name: str        # 包名 (如: system)
-    tables: List[str]        # 属于该前缀的表名列表
+    tables: Tuple[str, ...]  # 属于该前缀的表名 (未排序，需要有序时自行排序)
+    
+    def __reduce__(self):
+        # frozen的__setattr__会拒绝copy/pickle按slot逐个回填，改为通过构造函数重建
+        return (self.__class__, (self.prefix, self.full_name, self.package_name, self.tables))
     
 
 class TablePrefixAnalyzer:
     """表名前缀分析器"""
     
-    # 预定义的前缀映射表 (可扩展)
-    COMMON_PREFIX_MAPPINGS = {
-        'sys': 'system',
-        'auth': 'authentication', 
-        'user': 'user',
-        'admin': 'administration',
-        'log': 'logging',
-        'config': 'configuration',
-        'dict': 'dictionary',
-        'file': 'file',
-        'msg': 'message',
-        'pay': 'payment',
-        'order': 'order',
-        'product': 'product',
-        'shop': 'shop',
-        'cart': 'cart',
-        'member': 'member',
-        'org': 'organization',
-        'dept': 'department',
-        'role': 'role',
-        'perm': 'permission',
-        'menu': 'menu',
-        'api': 'api',
-        'data': 'data',
-        'report': 'report',
-        'workflow': 'workflow',
-        'task': 'task',
-        'job': 'job',
-        'notice': 'notice',
-        'news': 'news',
-        'article': 'article',
-        'content': 'content',
-        'media': 'media',
-        'attachment': 'attachment'
-    }
+    # 预定义的前缀映射表 (可扩展，子类可覆盖)
+    COMMON_PREFIX_MAPPINGS = _COMMON_PREFIX_MAPPINGS
+    
+    # 包名中不允许出现的字符 (非字母数字)
+    _PKG_SANITIZE_RE = re.compile(r'[^a-zA-Z0-9]')
+    # ASCII 范围内非字母数字字符的删除表，供 str.translate 使用
+    _PKG_DELETE = {c: None for c in range(128) if not chr(c).isalnum()}
     
     def __init__(self, min_tables_per_prefix: int = 2, min_prefix_length: int = 2):
         """
@@ -69,6 +93,9 @@ class TablePrefixAnalyzer:
         """
         self.min_tables_per_prefix = min_tables_per_prefix
         self.min_prefix_length = min_prefix_length
+        # 前缀分析结果缓存 (LRU): (参数, 表名元组) -> (前缀分组, 表名到包名的索引)
+        self._analysis_cache: Dict[tuple, Tuple[Mapping[str, PrefixGroup], Mapping[str, str]]] = {}
+        self._analysis_cache_lock = threading.Lock()
         
     def extract_prefix(self, table_name: str) -> Optional[str]:
         """
@@ -80,24 +107,99 @@ class TablePrefixAnalyzer:
         Returns:
             提取的前缀，如果没有则返回None
         """
-        # 移除常见的表前缀符号
-        cleaned_name = table_name.lower()
-        
-        # 通过下划线分割提取前缀
-        if '_' in cleaned_name:
-            parts = cleaned_name.split('_')
-            if len(parts) >= 2:
-                prefix = parts[0]
-                # 检查前缀长度
-                if len(prefix) >= self.min_prefix_length:
-                    return prefix
-        
-        return None
+        # 没有下划线的表名直接返回，不进入后续处理
+        if '_' not in table_name:
+            return None
+        
+        # 只截取第一个下划线之前的部分并转小写，不复制之后的部分
+        prefix = table_name[:table_name.index('_')].lower()
+        # 检查前缀长度
+        if len(prefix) < self.min_prefix_length:
+            return None
+        
+        # 前缀高度重复，驻留后字典查找可走指针比较
+        return sys.intern(prefix)
     
-    def analyze_table_prefixes(self, table_names: List[str]) -> Dict[str, PrefixGroup]:
+    def analyze_table_prefixes(self, table_names: List[str]) -> Mapping[str, PrefixGroup]:
         """
         分析表名列表的前缀分组
         
+        同一表名列表重复分析时返回同一个只读映射及相同的PrefixGroup实例
+        
+        Args:
+            table_names: 表名列表
+            
+        Returns:
+            前缀分组的只读映射，key为前缀，value为PrefixGroup对象
+        """
+        return self._analyze_cached(table_names)
+    
+    def _analyze_cached(self, table_names: List[str]) -> Mapping[str, PrefixGroup]:
+        """
+        带缓存的前缀分析，同一表名列表只分析一次
+        
+        Args:
+            table_names: 表名列表
+            
+        Returns:
+            前缀分组的只读映射
+        """
+        return self._cached_analysis(table_names)[0]
+    
+    def _build_table_to_package(self, table_names: List[str]) -> Mapping[str, str]:
+        """
+        获取表名到分组包名的索引，与前缀分组一同缓存
+        
+        Args:
+            table_names: 表名列表
+            
+        Returns:
+            表名到包名的映射
+        """
+        return self._cached_analysis(table_names)[1]
+    
+    def _cached_analysis(self, table_names: List[str]) -> Tuple[Mapping[str, PrefixGroup], Mapping[str, str]]:
+        """
+        读取或计算缓存条目
+        
+        Args:
+            table_names: 表名列表
+            
+        Returns:
+            (前缀分组, 表名到包名的索引)
+        """
+        # 分析参数可在实例创建后修改，因此一并放入缓存键
+        key = (self.min_tables_per_prefix, self.min_prefix_length, tuple(table_names))
+        with self._analysis_cache_lock:
+            cached = self._analysis_cache.pop(key, None)
+            if cached is not None:
+                # 重新插入到末尾，标记为最近使用
+                self._analysis_cache[key] = cached
+                return cached
+        
+        prefix_groups = self._analyze_table_prefixes(table_names)
+        table_to_package: Dict[str, str] = {}
+        for group in prefix_groups.values():
+            for table in group.tables:
+                # 先匹配到的分组优先，与逐组查找一致
+                table_to_package.setdefault(table, group.package_name)
+        # 以只读映射缓存，各调用方共享同一份结果
+        result = (MappingProxyType(prefix_groups), MappingProxyType(table_to_package))
+        with self._analysis_cache_lock:
+            existing = self._analysis_cache.get(key)
+            if existing is not None:
+                # 其他线程已写入相同的分析结果，复用它以保证返回同一实例
+                return existing
+            if len(self._analysis_cache) >= _ANALYSIS_CACHE_SIZE:
+                # 淘汰最久未使用的条目
+                self._analysis_cache.pop(next(iter(self._analysis_cache)))
+            self._analysis_cache[key] = result
+        return result
+    
+    def _analyze_table_prefixes(self, table_names: List[str]) -> Dict[str, PrefixGroup]:
+        """
+        执行前缀分析 (不使用缓存)
+        
         Args:
             table_names: 表名列表
             
@@ -105,52 +207,48 @@ class TablePrefixAnalyzer:
             前缀分组字典，key为前缀，value为PrefixGroup对象
         """
         # Step 1: 提取所有表的前缀
-        prefix_tables: Dict[str, List[str]] = {}
+        prefix_tables: Dict[str, List[str]] = defaultdict(list)
         no_prefix_tables: List[str] = []
+        # 循环中用到的方法和属性先绑定为局部变量，避免逐次属性查找
+        extract_prefix = self.extract_prefix
         
         for table_name in table_names:
-            prefix = self.extract_prefix(table_name)
+            prefix = extract_prefix(table_name)
             if prefix:
-                if prefix not in prefix_tables:
-                    prefix_tables[prefix] = []
                 prefix_tables[prefix].append(table_name)
             else:
                 no_prefix_tables.append(table_name)
         
-        # Step 2: 过滤出有效的前缀组 (表数量 >= min_tables_per_prefix)
-        valid_prefixes = {
-            prefix: tables 
-            for prefix, tables in prefix_tables.items() 
-            if len(tables) >= self.min_tables_per_prefix
-        }
-        
-        # Step 3: 构建前缀分组
+        # Step 2: 一次遍历完成分组: 表数量 >= min_tables_per_prefix 的前缀构建分组,
+        # 其余前缀的表与无前缀的表一起归入未分组列表
         prefix_groups = {}
+        all_ungrouped = no_prefix_tables
+        min_tables = self.min_tables_per_prefix
+        get_full_name = self._get_full_name
+        generate_package_name = self._generate_package_name
         
-        for prefix, tables in valid_prefixes.items():
-            full_name = self._get_full_name(prefix, tables)
-            package_name = self._generate_package_name(full_name)
+        for prefix, tables in prefix_tables.items():
+            if len(tables) < min_tables:
+                all_ungrouped.extend(tables)
+                continue
+            
+            full_name = get_full_name(prefix, tables)
+            package_name = generate_package_name(full_name)
             
             prefix_groups[prefix] = PrefixGroup(
                 prefix=prefix,
                 full_name=full_name,
                 package_name=package_name,
-                tables=sorted(tables)
+                tables=tuple(tables)
             )
         
-        # Step 4: 处理无前缀的表 (如果有的话，归入common分组)
-        invalid_prefix_tables = []
-        for prefix, tables in prefix_tables.items():
-            if len(tables) < self.min_tables_per_prefix:
-                invalid_prefix_tables.extend(tables)
-        
-        all_ungrouped = no_prefix_tables + invalid_prefix_tables
+        # Step 3: 处理未分组的表 (如果有的话，归入common分组)
         if all_ungrouped:
             prefix_groups['common'] = PrefixGroup(
                 prefix='common',
                 full_name='common',
                 package_name='common',
-                tables=sorted(all_ungrouped)
+                tables=tuple(all_ungrouped)
             )
         
         return prefix_groups
@@ -166,13 +264,9 @@ class TablePrefixAnalyzer:
         Returns:
             完整名称
         """
-        # 首先检查预定义映射
-        if prefix in self.COMMON_PREFIX_MAPPINGS:
-            return self.COMMON_PREFIX_MAPPINGS[prefix]
-        
+        # 优先使用预定义映射，未命中时返回前缀本身
         # TODO: 未来可以通过表注释分析得到更准确的名称
-        # 这里暂时返回前缀本身
-        return prefix
+        return self.COMMON_PREFIX_MAPPINGS.get(prefix, prefix)
     
     def _generate_package_name(self, full_name: str) -> str:
         """
@@ -185,7 +279,12 @@ class TablePrefixAnalyzer:
             包名 (小写，符合Java包命名规范)
         """
         # 将名称转换为合法的Java包名
-        package_name = re.sub(r'[^a-zA-Z0-9]', '', full_name.lower())
+        lowered = full_name.lower()
+        if lowered.isascii():
+            package_name = lowered.translate(self._PKG_DELETE)
+        else:
+            # 含非ASCII字符时回退到正则，一并剔除非ASCII字符
+            package_name = self._PKG_SANITIZE_RE.sub('', lowered)
         
         # 确保包名不以数字开头
         if package_name and package_name[0].isdigit():
@@ -203,12 +302,10 @@ class TablePrefixAnalyzer:
         Returns:
             True如果应该使用前缀分组，False否则
         """
-        prefix_groups = self.analyze_table_prefixes(table_names)
+        prefix_groups = self._analyze_cached(table_names)
         
         # 如果有有效的前缀组(除了common)，则使用前缀分组
-        valid_groups = [group for prefix, group in prefix_groups.items() if prefix != 'common']
-        
-        return len(valid_groups) > 0
+        return any(prefix != 'common' for prefix in prefix_groups)
     
     def get_table_package_suffix(self, table_name: str, table_names: List[str]) -> str:
         """
@@ -221,17 +318,34 @@ class TablePrefixAnalyzer:
         Returns:
             包后缀，如果不使用前缀分组则返回空字符串
         """
-        if not self.should_use_prefix_grouping(table_names):
+        # 只取一次分析结果，同时用于判断是否分组和查找包名
+        prefix_groups, table_to_package = self._cached_analysis(table_names)
+        
+        # 没有有效前缀组(除了common)时不使用前缀分组
+        if not any(prefix != 'common' for prefix in prefix_groups):
             return ""
         
-        prefix_groups = self.analyze_table_prefixes(table_names)
+        # 通过索引直接查找表所属的分组
+        return table_to_package.get(table_name, "common")
+    
+    def get_table_package_suffixes(self, table_names: List[str]) -> Dict[str, str]:
+        """
+        批量获取所有表对应的包后缀，只进行一次前缀分析
+        
+        Args:
+            table_names: 所有表名列表
+            
+        Returns:
+            表名到包后缀的映射，结果与逐表调用 get_table_package_suffix 一致
+        """
+        prefix_groups, table_to_package = self._cached_analysis(table_names)
         
-        # 查找表所属的分组
-        for prefix, group in prefix_groups.items():
-            if table_name in group.tables:
-                return group.package_name
+        # 没有有效前缀组(除了common)时不使用前缀分组
+        if not any(prefix != 'common' for prefix in prefix_groups):
+            return {table_name: "" for table_name in table_names}
         
-        return "common"
+        # 复用缓存中的表名索引，与逐表查找保持一致
+        return {table_name: table_to_package.get(table_name, "common") for table_name in table_names}
     
     def generate_analysis_report(self, table_names: List[str]) -> str:
         """
@@ -243,31 +357,31 @@ class TablePrefixAnalyzer:
         Returns:
             分析报告文本
         """
-        prefix_groups = self.analyze_table_prefixes(table_names)
+        prefix_groups = self._analyze_cached(table_names)
         
-        report = []
-        report.append("# 表名前缀分析报告")
-        report.append("")
-        report.append(f"## 基本信息")
-        report.append(f"- **总表数**: {len(table_names)}")
-        report.append(f"- **前缀组数**: {len(prefix_groups)}")
-        report.append(f"- **使用前缀分组**: {'是' if self.should_use_prefix_grouping(table_names) else '否'}")
-        report.append("")
+        buf = io.StringIO()
+        w = buf.write
+        w("# 表名前缀分析报告\n")
+        w("\n")
+        w("## 基本信息\n")
+        w(f"- **总表数**: {len(table_names)}\n")
+        w(f"- **前缀组数**: {len(prefix_groups)}\n")
+        w(f"- **使用前缀分组**: {'是' if self.should_use_prefix_grouping(table_names) else '否'}\n")
         
+        # 段落间的空行写在每段开头，使报告末尾只保留一个换行
         if prefix_groups:
-            report.append("## 前缀分组详情")
-            report.append("")
+            w("\n")
+            w("## 前缀分组详情\n")
             
             for prefix, group in sorted(prefix_groups.items()):
-                report.append(f"### {group.full_name} ({prefix})")
-                report.append(f"- **包名**: `{group.package_name}`")
-                report.append(f"- **表数量**: {len(group.tables)}")
-                report.append(f"- **表列表**:")
-                for table in group.tables:
-                    report.append(f"  - {table}")
-                report.append("")
-        
-        return "\n".join(report)
+                w("\n")
+                w(f"### {group.full_name} ({prefix})\n")
+                w(f"- **包名**: `{group.package_name}`\n")
+                w(f"- **表数量**: {len(group.tables)}\n")
+                w("- **表列表**:\n")
+                buf.writelines(f"  - {table}\n" for table in sorted(group.tables))
+        
+        return buf.getvalue()
 
 
 if __name__ == "__main__":
@@ -291,6 +405,6 @@ if __name__ == "__main__":
     print(analyzer.generate_analysis_report(test_tables))
     
     print("\n=== 包后缀测试 ===")
+    suffixes = analyzer.get_table_package_suffixes(test_tables)
     for table in test_tables:
-        suffix = analyzer.get_table_package_suffix(table, test_tables)
-        print(f"{table} -> {suffix}")
\ No newline at end of file
+        print(f"{table} -> {suffixes[table]}")
\ No newline at end of file
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""AutoDependencyManager 的回归测试"""
+
+import xml.etree.ElementTree as StdET
+
+import pytest
+
+from dbjavagenix.utils.auto_dependency_manager import AutoDependencyManager
+from dbjavagenix.utils.dependency_requirements import DependencyInfo
+
+
+POM_HEAD = """<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0">
+    <modelVersion>4.0.0</modelVersion>
+    <description>中文描述</description>
+    <dependencies>
+        <dependency>
+            <groupId>org.example</groupId>
+            <artifactId>existing</artifactId>
+            <version>1.0</version>
+        </dependency>
+"""
+POM_TAIL = """    </dependencies>
+</project>
+"""
+
+NEW_DEP = DependencyInfo('com.mysql', 'mysql-connector-j', '8.4.0', description='MySQL', reason='db')
+
+
+def _pom_with_padding(padding: int) -> str:
+    """在 </dependencies> 前插入指定长度的注释，使结束标签落在不同的块位置"""
+    return POM_HEAD + "        <!-- " + "é" * padding + " -->\n" + POM_TAIL
+
+
+@pytest.mark.parametrize("padding", range(0, 40, 7))
+def test_locate_dependencies_end(padding):
+    pom = _pom_with_padding(padding)
+
+    located = AutoDependencyManager()._locate_dependencies_end(pom)
+
+    tag_pos = pom.find("</dependencies>")
+    assert located == (tag_pos - 5, "\n    ")
+
+
+def test_locate_dependencies_end_skips_commented_tags():
+    pom = POM_HEAD.replace("<dependencies>", "<!-- </dependencies> --><dependencies><!---->", 1) \
+        + "        <!-- 旧依赖\n    </dependencies>\n        -->\n" + POM_TAIL
+
+    located = AutoDependencyManager()._locate_dependencies_end(pom)
+
+    tag_pos = pom.rfind("</dependencies>")
+    assert located == (tag_pos - 5, "\n    ")
+
+
+def test_locate_dependencies_end_only_in_comments():
+    pom = "<project><!-- </dependencies> --></project>"
+
+    assert AutoDependencyManager()._locate_dependencies_end(pom) is None
+
+
+def test_insert_skips_commented_dependencies_end():
+    pom = POM_HEAD + "        <!-- </dependencies> -->\n" + POM_TAIL
+    manager = AutoDependencyManager()
+
+    updated = manager._insert_dependencies_string_based(pom, [NEW_DEP])
+
+    root = StdET.fromstring(updated.encode("utf-8"))
+    ns = {"m": "http://maven.apache.org/POM/4.0.0"}
+    artifacts = [e.text for e in root.findall("m:dependencies/m:dependency/m:artifactId", ns)]
+    assert artifacts == ["existing", "mysql-connector-j"]
+    assert updated.endswith(POM_TAIL)
+
+
+def _make_projects(root, count):
+    paths = []
+    for i in range(count):
+        project = root / f"p{i}"
+        project.mkdir()
+        (project / "pom.xml").write_text(_pom_with_padding(i), encoding="utf-8")
+        paths.append(str(project))
+    return paths
+
+
+@pytest.mark.parametrize("create_backup", [True, False])
+def test_add_dependencies_to_projects_concurrently(tmp_path, create_backup):
+    paths = _make_projects(tmp_path, 48)
+    manager = AutoDependencyManager()
+
+    results = manager.add_dependencies_to_projects(paths, [NEW_DEP], create_backup=create_backup, max_workers=16)
+
+    assert [r.errors for r in results] == [[]] * len(paths)
+    assert all(r.success and [d.artifact_id for d in r.added_dependencies] == ["mysql-connector-j"]
+               for r in results)
+    for path in paths:
+        project = tmp_path / path
+        assert "mysql-connector-j" in (project / "pom.xml").read_text(encoding="utf-8")
+        assert not list(project.glob("*.tmp"))
+
+
+def test_deferred_writes_flush_every_project(tmp_path):
+    paths = _make_projects(tmp_path, 12)
+    manager = AutoDependencyManager(defer_writes=True)
+
+    results = manager.add_dependencies_to_projects(paths, [NEW_DEP], create_backup=False, max_workers=6)
+    assert all(r.success for r in results)
+    assert all("mysql-connector-j" not in (tmp_path / p / "pom.xml").read_text(encoding="utf-8") for p in paths)
+
+    written = manager.flush()
+
+    assert sorted(written) == sorted(str(tmp_path / p / "pom.xml") for p in paths)
+    assert manager.flush() == []
+    assert all("mysql-connector-j" in (tmp_path / p / "pom.xml").read_text(encoding="utf-8") for p in paths)
+
+
+def test_write_through_symlinked_pom(tmp_path):
+    real = tmp_path / "real-pom.xml"
+    real.write_text(_pom_with_padding(0), encoding="utf-8")
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "pom.xml").symlink_to(real)
+
+    result = AutoDependencyManager().add_dependencies_to_project(str(project), [NEW_DEP], create_backup=False)
+
+    assert result.success, result.errors
+    assert (project / "pom.xml").is_symlink()
+    assert "mysql-connector-j" in real.read_text(encoding="utf-8")
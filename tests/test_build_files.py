@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""build_files 的回归测试"""
+
+import os
+import stat
+
+import pytest
+
+from dbjavagenix.utils.build_files import locate_elements, write_text_atomic
+
+
+POM = """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE project [<!ENTITY v "1.0">]>
+<m:project xmlns:m="http://maven.apache.org/POM/4.0.0"
+    a='x>y' b="/>z">
+    <!-- <dependencies><dependency></dependency></dependencies> -->
+    <m:name>caf&#233;</m:name>
+    <m:url/>
+    <m:description><![CDATA[<dependencies>]]></m:description>
+    <m:dependencies>
+        <m:dependency><m:groupId>g</m:groupId><?pi </m:dependency>?><m:artifactId>a</m:artifactId></m:dependency>
+        <m:dependency />
+    </m:dependencies>
+</m:project>
+"""
+
+
+def test_locate_elements_matches_lxml_document_order():
+    etree = pytest.importorskip("lxml.etree")
+    root = etree.fromstring(POM.encode("utf-8"), etree.XMLParser(resolve_entities=False))
+
+    locations = locate_elements(POM)
+    elements = list(root.iter(etree.Element))
+
+    assert len(locations) == len(elements)
+    for location, element in zip(locations, elements):
+        assert location.name == f"{element.prefix}:{etree.QName(element).localname}"
+        start, end = location.start_tag
+        assert POM[start:end].startswith("<" + location.name)
+        if location.end_tag is None:
+            assert POM[start:end].endswith("/>")
+        else:
+            assert POM[location.end_tag[0]:location.end_tag[1]] == f"</{location.name}>"
+
+
+def test_locate_elements_text_spans():
+    by_name = {}
+    for location in locate_elements(POM):
+        by_name.setdefault(location.name, location)
+
+    def text(name):
+        location = by_name[name]
+        return POM[location.start_tag[1]:location.text_end]
+
+    assert text("m:groupId") == "g"
+    assert text("m:artifactId") == "a"
+    assert text("m:name") == "caf&#233;"
+    assert text("m:url") == ""
+    assert text("m:description") == ""  # text 在 CDATA 记号前结束
+
+
+def test_write_text_atomic_replaces_file(tmp_path):
+    target = tmp_path / "pom.xml"
+    target.write_text("old", encoding="utf-8")
+    target.chmod(0o640)
+    backup = tmp_path / "pom.xml.bak"
+    os.link(target, backup)
+
+    write_text_atomic(target, "新内容\n")
+
+    assert target.read_text(encoding="utf-8") == "新内容\n"
+    assert stat.S_IMODE(target.stat().st_mode) == 0o640
+    # 硬链接备份仍指向旧内容，且不留下临时文件
+    assert backup.read_text(encoding="utf-8") == "old"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["pom.xml", "pom.xml.bak"]
+
+
+def test_write_text_atomic_follows_symlink(tmp_path):
+    real = tmp_path / "real.xml"
+    real.write_text("old", encoding="utf-8")
+    link = tmp_path / "pom.xml"
+    link.symlink_to(real)
+
+    write_text_atomic(str(link), "new")
+
+    assert link.is_symlink()
+    assert real.read_text(encoding="utf-8") == "new"
+
+
+def test_write_text_atomic_creates_missing_file(tmp_path):
+    write_text_atomic(tmp_path / "build.gradle", "dependencies {}\n")
+
+    assert (tmp_path / "build.gradle").read_text(encoding="utf-8") == "dependencies {}\n"
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""with_slots 的回归测试"""
+
+import copy
+import pickle
+from dataclasses import FrozenInstanceError, replace
+
+import pytest
+
+from dbjavagenix.utils.dependency_requirements import DependencyInfo
+from dbjavagenix.utils.pom_analyzer import DependencyComparison, ExistingDependency
+
+
+def test_dependency_info_has_slots_including_coord():
+    dep = DependencyInfo("org.example", "demo", "1.0")
+
+    assert not hasattr(dep, "__dict__")
+    assert "coord" in DependencyInfo.__slots__
+    assert dep.coord == "org.example:demo:1.0"
+    assert replace(dep, version="2.0").coord == "org.example:demo:2.0"
+    with pytest.raises(FrozenInstanceError):
+        dep.version = "2.0"
+
+
+@pytest.mark.parametrize("clone", [copy.copy, copy.deepcopy, lambda obj: pickle.loads(pickle.dumps(obj))])
+def test_slotted_instances_copy_and_pickle(clone):
+    target = DependencyInfo("jakarta.annotation", "jakarta.annotation-api", "2.1.1")
+    dep = DependencyInfo("javax.annotation", "javax.annotation-api", "1.3.2", migration_target=target)
+    comparison = DependencyComparison(requirement=dep, existing=ExistingDependency("g", "a", "1"))
+
+    cloned = clone(comparison)
+
+    assert cloned == comparison
+    assert cloned.requirement.coord == dep.coord
+    assert cloned.requirement.migration_target.coord == target.coord
+    assert not hasattr(cloned, "__dict__")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""DependencyManager 的回归测试"""
+
+import pytest
+
+from dbjavagenix.utils.dependency_manager import DependencyManager
+
+
+POM = """<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+\txsi:schemaLocation="http://maven.apache.org/POM/4.0.0 https://maven.apache.org/xsd/maven-4.0.0.xsd">
+\t<name attr='single'>caf&#233;</name>
+\t<url></url>
+\t<dependencies>
+\t\t<dependency>
+\t\t\t<groupId>javax.annotation</groupId>
+\t\t\t<!-- 注释 -->
+\t\t\t<artifactId>javax.annotation-api</artifactId>
+\t\t</dependency>
+\t\t<dependency><groupId> javax.validation </groupId><artifactId>validation-api</artifactId></dependency>
+\t\t<dependency><groupId>org.example</groupId><artifactId>keep</artifactId></dependency>
+\t</dependencies>
+</project>
+"""
+
+
+def test_lxml_fix_only_rewrites_coordinates():
+    pytest.importorskip("lxml")
+    manager = DependencyManager()
+
+    fixed, count = manager._fix_maven_deprecated_deps_lxml(POM)
+
+    assert count == 2
+    expected = (POM.replace("<groupId>javax.annotation</groupId>", "<groupId>jakarta.annotation</groupId>")
+                .replace("<artifactId>javax.annotation-api</artifactId>",
+                         "<artifactId>jakarta.annotation-api</artifactId>")
+                .replace("<groupId> javax.validation </groupId>", "<groupId>jakarta.validation</groupId>")
+                .replace("<artifactId>validation-api</artifactId>",
+                         "<artifactId>jakarta.validation-api</artifactId>"))
+    assert fixed == expected
+
+
+def test_lxml_fix_falls_back_when_text_is_not_literal():
+    pytest.importorskip("lxml")
+    pom = POM.replace("<groupId>javax.annotation</groupId>", "<groupId><![CDATA[javax.annotation]]></groupId>")
+
+    assert DependencyManager()._fix_maven_deprecated_deps_lxml(pom) is None
+
+
+def test_fix_writes_build_file_atomically(tmp_path):
+    pom = tmp_path / "pom.xml"
+    pom.write_text(POM, encoding="utf-8")
+    inode = pom.stat().st_ino
+
+    result = DependencyManager()._fix_maven_deprecated_deps(str(tmp_path), POM)
+
+    assert result["success"]
+    content = pom.read_text(encoding="utf-8")
+    assert "jakarta.annotation-api" in content and "javax.annotation-api" not in content
+    # 通过临时文件 + os.replace 写入：inode 改变且不留下临时文件
+    assert pom.stat().st_ino != inode
+    assert [p.name for p in tmp_path.iterdir()] == ["pom.xml"]
+
+
+def test_gradle_fix_writes_through_symlink(tmp_path):
+    real = tmp_path / "real.gradle"
+    real.write_text("dependencies {\n    implementation 'javax.validation:validation-api:2.0.1.Final'\n}\n",
+                    encoding="utf-8")
+    (tmp_path / "build.gradle").symlink_to(real)
+
+    result = DependencyManager()._fix_gradle_deprecated_deps(str(tmp_path), real.read_text(encoding="utf-8"))
+
+    assert result["success"]
+    assert (tmp_path / "build.gradle").is_symlink()
+    assert "jakarta.validation:jakarta.validation-api:" in real.read_text(encoding="utf-8")
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""PomAnalyzer 的回归测试"""
+
+import pickle
+import xml.etree.ElementTree as StdET
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from dbjavagenix.utils.pom_analyzer import PomAnalyzer
+from dbjavagenix.utils.dependency_requirements import DependencyInfo
+
+
+MAVEN_NS = {"m": "http://maven.apache.org/POM/4.0.0"}
+
+# Spring Initializr 风格的 pom：多行根标签、单引号属性、字符引用、空元素
+INITIALIZR_POM = """<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+\txsi:schemaLocation="http://maven.apache.org/POM/4.0.0 https://maven.apache.org/xsd/maven-4.0.0.xsd">
+\t<modelVersion>4.0.0</modelVersion>
+\t<groupId>com.example</groupId>
+\t<artifactId>demo</artifactId>
+\t<name attr='single'>caf&#233;</name>
+\t<url></url>
+\t<dependencyManagement>
+\t\t<dependencies>
+\t\t\t<dependency><groupId>m</groupId><artifactId>managed</artifactId><version>1</version></dependency>
+\t\t</dependencies>
+\t</dependencyManagement>
+\t<dependencies>
+\t\t<dependency>
+\t\t\t<groupId>org.springframework.boot</groupId>
+\t\t\t<artifactId>spring-boot-starter</artifactId>
+\t\t</dependency>
+\t\t<!-- </dependencies> -->
+\t</dependencies>
+</project>
+"""
+
+NEW_DEP = DependencyInfo('com.mysql', 'mysql-connector-j', '8.4.0', description='MySQL', reason='db')
+
+
+def _is_single_insertion(original, updated):
+    """updated 是否只是在 original 的某一处插入了一段文本（其余内容逐字保留）"""
+    prefix = 0
+    while prefix < len(original) and original[prefix] == updated[prefix]:
+        prefix += 1
+    return updated.endswith(original[prefix:])
+
+
+def _artifacts(content, path):
+    root = StdET.fromstring(content.encode("utf-8"))
+    return [e.text for e in root.findall(path, MAVEN_NS)]
+
+
+@pytest.mark.parametrize("pom, expected_top_level", [
+    (INITIALIZR_POM, ["spring-boot-starter", "mysql-connector-j"]),
+    (INITIALIZR_POM.replace(INITIALIZR_POM[INITIALIZR_POM.index("\t<dependencies>\n\t\t<dependency>\n"):
+                                           INITIALIZR_POM.index("</project>")], ""),
+     ["mysql-connector-j"]),
+])
+def test_lxml_insertion_keeps_original_text(pom, expected_top_level):
+    pytest.importorskip("lxml")
+    analyzer = PomAnalyzer()
+    block = analyzer._format_maven_dependency(NEW_DEP)
+
+    updated = analyzer._insert_maven_dependencies_lxml(pom, [block])
+
+    assert updated is not None
+    assert _is_single_insertion(pom, updated)
+    assert _artifacts(updated, "m:dependencies/m:dependency/m:artifactId") == expected_top_level
+    assert _artifacts(updated, "m:dependencyManagement/m:dependencies/m:dependency/m:artifactId") == ["managed"]
+    for untouched in ("xmlns:xsi=\"http://www.w3.org/2001/XMLSchema-instance\"\n\txsi:schemaLocation",
+                      "<name attr='single'>caf&#233;</name>", "<url></url>"):
+        assert untouched in updated
+
+
+def test_lxml_insertion_expands_self_closing_dependencies():
+    pytest.importorskip("lxml")
+    pom = '<project xmlns="http://maven.apache.org/POM/4.0.0">\n  <url></url>\n  <dependencies />\n</project>\n'
+    analyzer = PomAnalyzer()
+
+    updated = analyzer._insert_maven_dependencies_lxml(pom, [analyzer._format_maven_dependency(NEW_DEP)])
+
+    assert updated.startswith('<project xmlns="http://maven.apache.org/POM/4.0.0">\n  <url></url>\n  <dependencies>')
+    assert updated.endswith('</dependencies>\n</project>\n')
+    assert _artifacts(updated, "m:dependencies/m:dependency/m:artifactId") == ["mysql-connector-j"]
+
+
+@pytest.mark.parametrize("pom", [
+    # 单行 pom：dependencyManagement 中的同名块在前
+    '<project xmlns="http://maven.apache.org/POM/4.0.0"><dependencyManagement><dependencies>'
+    '<dependency><groupId>m</groupId><artifactId>managed</artifactId></dependency></dependencies>'
+    '</dependencyManagement><!-- <dependencies></dependencies> --><dependencies></dependencies></project>',
+    # 带前缀的根元素
+    '<pom:project xmlns:pom="http://maven.apache.org/POM/4.0.0" xmlns="http://maven.apache.org/POM/4.0.0">\n'
+    '  <pom:dependencyManagement><pom:dependencies/></pom:dependencyManagement>\n'
+    '  <pom:dependencies>\n  </pom:dependencies>\n</pom:project>\n',
+])
+def test_lxml_insertion_targets_top_level_dependencies(pom):
+    pytest.importorskip("lxml")
+    analyzer = PomAnalyzer()
+
+    updated = analyzer._insert_maven_dependencies_lxml(pom, [analyzer._format_maven_dependency(NEW_DEP)])
+
+    assert _is_single_insertion(pom, updated)
+    assert _artifacts(updated, "m:dependencies/m:dependency/m:artifactId") == ["mysql-connector-j"]
+
+
+def test_identical_analyses_compare_equal(tmp_path):
+    (tmp_path / "pom.xml").write_text(INITIALIZR_POM, encoding="utf-8")
+    analyzer = PomAnalyzer()
+
+    first = analyzer.analyze_project_dependencies(str(tmp_path), "MybatisPlus", "mysql")
+    second = analyzer.analyze_project_dependencies(str(tmp_path), "MybatisPlus", "mysql")
+
+    assert type(first["maven_xml"]) is dict
+    assert first["maven_xml"] == second["maven_xml"]
+    assert first == second
+    assert first["maven_xml"]["missing_dependencies"]
+
+
+def test_write_build_file_follows_symlink(tmp_path):
+    real = tmp_path / "real-pom.xml"
+    real.write_text(INITIALIZR_POM, encoding="utf-8")
+    link = tmp_path / "pom.xml"
+    link.symlink_to(real)
+
+    PomAnalyzer()._write_build_file(link, "<project/>\n")
+
+    assert link.is_symlink()
+    assert real.read_text(encoding="utf-8") == "<project/>\n"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["pom.xml", "real-pom.xml"]
+
+
+def test_concurrent_build_file_writes(tmp_path):
+    pom = tmp_path / "pom.xml"
+    pom.write_text(INITIALIZR_POM, encoding="utf-8")
+    analyzer = PomAnalyzer()
+    contents = [f"<project><!-- {i} --></project>\n" for i in range(64)]
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(lambda content: analyzer._write_build_file(pom, content), contents))
+
+    assert pom.read_text(encoding="utf-8") in contents
+    assert [p.name for p in tmp_path.iterdir()] == ["pom.xml"]
+
+
+def _module_roots(tmp_path, count):
+    roots = []
+    for i in range(count):
+        module = tmp_path / f"module{i}"
+        module.mkdir()
+        (module / "pom.xml").write_text(INITIALIZR_POM.replace("<artifactId>demo</artifactId>",
+                                                               f"<artifactId>demo{i}</artifactId>"),
+                                        encoding="utf-8")
+        roots.append(str(module))
+    return roots
+
+
+def test_analyze_many_serial_matches_single_analysis(tmp_path):
+    roots = _module_roots(tmp_path, 3)
+
+    results = PomAnalyzer.analyze_many(roots, template_category="MybatisPlus", database_type="mysql")
+
+    assert list(results) == roots
+    for root in roots:
+        assert results[root] == PomAnalyzer().analyze_project_dependencies(root, "MybatisPlus", "mysql")
+        assert pickle.loads(pickle.dumps(results[root])) == results[root]
+
+
+def test_analyze_many_with_process_pool(tmp_path):
+    roots = _module_roots(tmp_path, 3)
+    expected = PomAnalyzer.analyze_many(roots, template_category="Default", database_type="postgresql")
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        results = PomAnalyzer.analyze_many(roots, executor=executor,
+                                           template_category="Default", database_type="postgresql")
+
+    assert results == expected
+
+
+@pytest.mark.parametrize("current, required, outdated", [
+    ("3.0.0-RC1", "3.0.0", True),
+    ("3.0.0", "3.0.0-RC1", False),
+    ("5.3.31.RELEASE", "5.3.32", True),
+    ("1.18.30", "1.18.30", False),
+])
+def test_is_version_outdated(current, required, outdated):
+    assert PomAnalyzer()._is_version_outdated(current, required) is outdated
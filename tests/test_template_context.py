@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""TemplateContextBuilder 的回归测试"""
+
+import pytest
+
+from dbjavagenix.core.models import ColumnInfo, TableInfo
+from dbjavagenix.generator.template_context import TemplateContextBuilder
+
+
+def _build(*data_types):
+    columns = [ColumnInfo(name=f"col_{i}", data_type=data_type, java_type="")
+               for i, data_type in enumerate(data_types)]
+    return TemplateContextBuilder().build_context(TableInfo(name="sys_user", schema="demo", columns=columns))
+
+
+@pytest.mark.parametrize("data_type, java_type, jdbc_type, is_string", [
+    ("varchar", "String", "VARCHAR", True),
+    ("VARCHAR(255)", "String", "VARCHAR", False),
+    ("tinyint(1)", "Byte", "TINYINT", False),
+    ("DECIMAL(10,2)", "BigDecimal", "DECIMAL", False),
+    ("DATETIME(6)", "LocalDateTime", "TIMESTAMP", False),
+    ("geometry", "String", "VARCHAR", False),
+])
+def test_column_type_info(data_type, java_type, jdbc_type, is_string):
+    column = _build(data_type)["columns"][0]
+
+    assert (column["javaType"], column["jdbcType"]) == (java_type, jdbc_type)
+    assert column["isString"] is column["stringType"] is column["isStringType"] is is_string
+
+
+@pytest.mark.parametrize("data_types, has_date, has_decimal", [
+    (("bigint", "datetime"), True, False),
+    (("bigint", "decimal"), False, True),
+    (("money",), False, True),
+    # 带长度/精度的类型只影响 Java/JDBC 类型映射，不设置日期/BigDecimal标志
+    (("DATETIME(6)", "DECIMAL(10,2)"), False, False),
+])
+def test_date_and_decimal_flags(data_types, has_date, has_decimal):
+    context = _build(*data_types)
+
+    assert context["hasDateField"] is has_date
+    assert context["hasBigDecimalField"] is has_decimal